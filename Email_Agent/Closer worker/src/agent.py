@@ -1,13 +1,16 @@
+import json
 import os
 from .models import Lead, Proposal, LeadStatus, ProposalOption
 from .generators import ProposalGenerator, PDFGenerator, SchedulingHelper
 
 class CloserAgent:
-    def __init__(self, template_dir: str = "src/templates", escalation_threshold: float = 10000.0):
+    def __init__(self, template_dir: str = "src/templates", escalation_threshold: float = 10000.0,
+                 quote_manifest: str = "quote_manifest.jsonl"):
         self.proposal_gen = ProposalGenerator(template_dir)
         self.pdf_gen = PDFGenerator()
         self.scheduler = SchedulingHelper()
         self.escalation_threshold = escalation_threshold
+        self.quote_manifest = quote_manifest
         
     def process_lead(self, lead: Lead, product_name: str = "Premium Service"):
         print(f"Processing lead: {lead.email} (ACV: ${lead.acv})")
@@ -32,6 +35,7 @@ class CloserAgent:
         # 4. Generate PDF
         pdf_filename = f"quote_{lead.email.split('@')[0]}.pdf"
         self.pdf_gen.create_quote_pdf(quote_text, pdf_filename)
+        self._register_quote(lead.email, pdf_filename)
         
         lead.status = LeadStatus.NEGOTIATING
         
@@ -41,6 +45,12 @@ class CloserAgent:
             "pdf_path": pdf_filename
         }
         
+    def _register_quote(self, email: str, path: str):
+        # The file name only has the local part; the manifest lets the Compliance Agent find it for a DSAR
+        if self.quote_manifest:
+            with open(self.quote_manifest, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"email": email, "path": os.path.abspath(path)}) + "\n")
+
     def check_escalation(self, lead: Lead) -> bool:
         return lead.acv > self.escalation_threshold
 
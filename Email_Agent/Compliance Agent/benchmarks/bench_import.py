@@ -0,0 +1,94 @@
+"""
+Bulk suppression import and export at 1M rows.
+
+Writes an ESP-style CSV export (email, reason; a share of the rows are
+case/whitespace variants of earlier rows) and imports it with
+ComplianceManager.import_suppressions into JsonStorage and SqliteStorage,
+then streams the list back out. For comparison, a sample of rows goes
+through add_to_suppression_list one at a time.
+
+Run from the Compliance Agent directory:
+    python -m benchmarks.bench_import --rows 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from src.bulk import export_file, import_file
+from src.manager import ComplianceManager
+from src.models import SuppressionReason
+from src.sqlite_storage import SqliteStorage
+from src.storage import JsonStorage
+
+REASONS = ["hard_bounce", "complaint", "unsubscribe", ""]
+
+
+def write_export(path, rows, duplicate_rate):
+    unique = int(rows * (1 - duplicate_rate))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Email,Reason\n")
+        for i in range(rows):
+            if i < unique:
+                f.write(f"user{i}@domain{i % 997}.example.com,{REASONS[i % 4]}\n")
+            else:
+                j = i % unique
+                f.write(f" USER{j}@Domain{j % 997}.example.com,{REASONS[j % 4]}\n")
+    return unique
+
+
+def rate(label, count, elapsed, unit="rows"):
+    print(f"{label:44} {elapsed:8.3f} s  {count / elapsed:12,.0f} {unit}/s")
+
+
+def bench(name, storage, args, export_path, temp_dir):
+    print(f"\n{name}")
+    manager = ComplianceManager(storage=storage)
+    try:
+        start = time.perf_counter()
+        counts = import_file(manager, export_path)
+        rate("bulk import", counts["read"], time.perf_counter() - start)
+        print(f"{'':44} imported {counts['imported']:,}, duplicates {counts['duplicates']:,}")
+
+        start = time.perf_counter()
+        exported = export_file(storage, os.path.join(temp_dir, "export.jsonl"))
+        rate("streaming export", exported, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(args.singles):
+                manager.add_to_suppression_list(f"single{i}@example.com", SuppressionReason.BOUNCED)
+        elapsed = time.perf_counter() - start
+        rate("add_to_suppression_list, one at a time", args.singles, elapsed)
+        print(f"{'':44} {args.rows / args.singles * elapsed:8.1f} s  projected for {args.rows:,} rows")
+    finally:
+        manager.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk suppression import benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in the import file")
+    parser.add_argument("--duplicates", type=float, default=0.1, help="Share of rows repeating an earlier address")
+    parser.add_argument("--singles", type=int, default=1000, help="Rows added one call at a time")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        export_path = os.path.join(temp_dir, "esp_export.csv")
+        unique = write_export(export_path, args.rows, args.duplicates)
+        print(f"{args.rows:,} rows, {unique:,} distinct addresses, "
+              f"{os.path.getsize(export_path) / 1e6:.1f} MB")
+        bench("JsonStorage (snapshot + journal)", JsonStorage(os.path.join(temp_dir, "json")),
+              args, export_path, temp_dir)
+        with SqliteStorage(os.path.join(temp_dir, "sqlite", "compliance.db")) as storage:
+            bench("SqliteStorage (WAL)", storage, args, export_path, temp_dir)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
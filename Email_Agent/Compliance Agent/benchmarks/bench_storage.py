@@ -0,0 +1,86 @@
+"""
+Compare JsonStorage and SqliteStorage at 1M suppression records.
+
+Measures bulk insert, single-record appends, startup (loading the list and
+building the in-memory index, which JsonStorage needs before the first
+lookup) and lookup throughput: in-memory SuppressionIndex vs indexed
+SQLite queries, one address at a time and in batches.
+
+Run from the Compliance Agent directory:
+    python -m benchmarks.bench_storage --records 1000000
+"""
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+
+from src.index import SuppressionIndex
+from src.sqlite_storage import SqliteStorage
+from src.storage import JsonStorage
+
+
+def records(count):
+    for i in range(count):
+        yield {"email": f"user{i}@domain{i % 997}.example.com", "reason": "unsubscribed",
+               "timestamp": "2025-01-01 00:00:00"}
+
+
+def rate(label, count, elapsed, unit="ops"):
+    print(f"{label:44} {elapsed:8.3f} s  {count / elapsed:12,.0f} {unit}/s")
+
+
+def bench(name, storage, args, probes):
+    print(f"\n{name}")
+    start = time.perf_counter()
+    storage.append_suppressions(records(args.records))
+    rate("bulk insert", args.records, time.perf_counter() - start, "records")
+
+    start = time.perf_counter()
+    for record in records(args.singles):
+        storage.append_suppression(record)
+    rate("single appends", args.singles, time.perf_counter() - start, "records")
+
+    start = time.perf_counter()
+    index = SuppressionIndex.from_records(storage.load_suppression_list())
+    rate("load + build in-memory index", args.records, time.perf_counter() - start, "records")
+
+    start = time.perf_counter()
+    hits = sum(email in index for email in probes)
+    rate("in-memory lookups", len(probes), time.perf_counter() - start, "lookups")
+    del index
+
+    if isinstance(storage, SqliteStorage):
+        start = time.perf_counter()
+        assert sum(storage.is_suppressed(email) for email in probes) == hits
+        rate("indexed lookups, one per query", len(probes), time.perf_counter() - start, "lookups")
+
+        start = time.perf_counter()
+        assert len(storage.suppressed_among(probes)) == hits
+        rate("indexed lookups, batched", len(probes), time.perf_counter() - start, "lookups")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compliance storage benchmark")
+    parser.add_argument("--records", type=int, default=1_000_000, help="Suppression records")
+    parser.add_argument("--singles", type=int, default=1000, help="Single-record appends")
+    parser.add_argument("--lookups", type=int, default=100_000, help="Lookups (half of them hits)")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    probes = [f"user{i}@domain{i % 997}.example.com"
+              for i in rng.sample(range(args.records), args.lookups // 2)]
+    probes += [f"nobody{i}@example.org" for i in range(args.lookups - len(probes))]
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        bench("JsonStorage (snapshot + journal)", JsonStorage(f"{temp_dir}/json"), args, probes)
+        with SqliteStorage(f"{temp_dir}/sqlite/compliance.db") as storage:
+            bench("SqliteStorage (WAL)", storage, args, probes)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,46 @@
+import os
+
+from src.dsar import DsarEngine
 from src.manager import ComplianceManager
 from src.models import SuppressionReason, ConsentType
+from src.storage import JsonStorage
 
 def main():
-    manager = ComplianceManager()
+    storage = JsonStorage()
+    # DSAR deletions also erase the subject from the other agents' data
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    dsar = DsarEngine.for_agents(root, os.path.join(storage.data_dir, "dsar_index.db"))
+    manager = ComplianceManager(storage=storage, dsar=dsar)
     
-    print("--- Compliance Agent Started ---")
+    try:
+        print("--- Compliance Agent Started ---")
     
-    email1 = "user1@example.com"
-    email2 = "user2@example.com"
+        email1 = "user1@example.com"
+        email2 = "user2@example.com"
     
-    # 1. Log Consent
-    print(f"\n--- Step 1: Logging Consent for {email1} ---")
-    manager.log_consent(email1, "Signup Form", ConsentType.MARKETING)
+        # 1. Log Consent
+        print(f"\n--- Step 1: Logging Consent for {email1} ---")
+        manager.log_consent(email1, "Signup Form", ConsentType.MARKETING)
     
-    # 2. Check Eligibility
-    is_eligible = manager.check_eligibility(email1)
-    print(f"Is {email1} eligible? {is_eligible}")
+        # 2. Check Eligibility
+        is_eligible = manager.check_eligibility(email1)
+        print(f"Is {email1} eligible? {is_eligible}")
     
-    # 3. Unsubscribe
-    print(f"\n--- Step 2: Unsubscribing {email1} ---")
-    manager.add_to_suppression_list(email1, SuppressionReason.UNSUBSCRIBED)
+        # 3. Unsubscribe
+        print(f"\n--- Step 2: Unsubscribing {email1} ---")
+        manager.add_to_suppression_list(email1, SuppressionReason.UNSUBSCRIBED)
     
-    is_eligible = manager.check_eligibility(email1)
-    print(f"Is {email1} eligible? {is_eligible}")
+        is_eligible = manager.check_eligibility(email1)
+        print(f"Is {email1} eligible? {is_eligible}")
     
-    # 4. DSAR Request
-    print(f"\n--- Step 3: DSAR Request for {email1} ---")
-    manager.process_dsar_delete(email1)
+        # 4. DSAR Request
+        print(f"\n--- Step 3: DSAR Request for {email1} ---")
+        manager.process_dsar_delete(email1)
     
-    # Verify Redaction (Manual check of logs would show REDACTED)
-    print("DSAR processing complete.")
+        # Verify Redaction (Manual check of logs would show REDACTED)
+        print("DSAR processing complete.")
+    finally:
+        manager.close()
 
 if __name__ == "__main__":
     main()
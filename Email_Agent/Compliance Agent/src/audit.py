@@ -0,0 +1,363 @@
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: single writer process only
+    fcntl = None
+
+from .index import hash_email
+
+GENESIS = "0" * 64
+_STOP = object()
+
+
+def entry_hash(entry: Dict) -> str:
+    """
+    Chain hash of an entry: SHA-256 over the canonical JSON of every field
+    except 'hash' (which includes 'prev', the previous entry's hash).
+    """
+    body = {key: value for key, value in entry.items() if key != "hash"}
+    return hashlib.sha256(json.dumps(body, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")).hexdigest()
+
+
+def _timestamp(value: Union[datetime, str, None]) -> Optional[str]:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _connect_index(index_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(index_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(AuditTrail.INDEX_SCHEMA)
+    return conn
+
+
+def _tail(f, end: int):
+    """
+    Returns (seq, hash) of the last complete entry before end, or (0, GENESIS).
+    """
+    position, data = end, b""
+    while position > 0:
+        step = min(65536, position)
+        position -= step
+        f.seek(position)
+        data = f.read(step) + data
+        # Only newline-terminated lines count; the first one may be cut short unless at the start
+        lines = data[:data.rfind(b"\n") + 1].split(b"\n")[:-1]
+        for line in reversed(lines[1:] if position else lines):
+            try:
+                entry = json.loads(line)
+                return entry["seq"], entry["hash"]
+            except (ValueError, KeyError, TypeError):
+                continue
+    return 0, GENESIS
+
+
+class _Writer:
+    """
+    The queue and background thread behind an AuditTrail. It holds no
+    reference to the trail, so a trail nobody uses any more can be
+    collected; its finalizer then stops the writer once the queued
+    entries are on disk.
+    """
+
+    def __init__(self, path: str, index_path: str, batch_size: int, flush_interval: float,
+                 fsync: bool, max_queued: int):
+        self.path = path
+        self.index_path = index_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.stats = {"entries": 0, "batches": 0}
+        self.queue = queue.Queue(maxsize=max(1, max_queued))
+        self.error = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                    self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self.queue.put(_STOP)
+            self._thread.join()
+
+    def _run(self):
+        index = _connect_index(self.index_path)
+        try:
+            while True:
+                item = self.queue.get()
+                batch, waiters, stop = [], [], False
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is _STOP:
+                        stop = True
+                        break
+                    if isinstance(item, threading.Event):
+                        waiters.append(item)
+                        break
+                    batch.append(item)
+                    remaining = deadline - time.monotonic()
+                    if len(batch) >= self.batch_size or remaining <= 0:
+                        break
+                    try:
+                        item = self.queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                if batch:
+                    try:
+                        self._write(batch, index)
+                    except Exception as e:
+                        print(f"Failed to write audit log {self.path}: {e}")
+                        self.error = self.error or e
+                for waiter in waiters:
+                    waiter.set()
+                if stop:
+                    return
+        finally:
+            index.close()
+
+    def _write(self, batch: List[Dict], index: sqlite3.Connection):
+        with open(self.path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                end = f.seek(0, os.SEEK_END)
+                seq, prev = _tail(f, end)
+                prefix = b""
+                if end:
+                    f.seek(end - 1)
+                    if f.read(1) != b"\n":
+                        # Terminate a line torn by a crash so it stays a single bad line
+                        prefix = b"\n"
+                offset = end + len(prefix)
+                lines, rows = [prefix], []
+                for entry in batch:
+                    seq += 1
+                    entry = {"seq": seq, **entry, "prev": prev}
+                    entry["hash"] = prev = entry_hash(entry)
+                    line = (json.dumps(entry, default=str) + "\n").encode("utf-8")
+                    rows.append((seq, entry["timestamp"], entry["target_hash"], entry["action"], offset))
+                    lines.append(line)
+                    offset += len(line)
+                f.write(b"".join(lines))
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        index.executemany("INSERT OR IGNORE INTO audit_index VALUES (?, ?, ?, ?, ?)", rows)
+        index.commit()
+        self.stats["entries"] += len(batch)
+        self.stats["batches"] += 1
+
+
+class AuditTrail:
+    """
+    Append-only, hash-chained audit log (JSON Lines) with a query index.
+
+    record() only queues the entry; a background thread writes queued
+    entries in batches (at most batch_size entries or flush_interval
+    seconds apart) with one fsync per batch. Every entry carries a
+    sequence number and the hash of the entry before it, so editing,
+    dropping or reordering lines breaks the chain (see verify()).
+
+    Targets are stored as hash_email(target), never as the address: the
+    trail can't be edited, and an address erased by a DSAR must not
+    survive in it. query() hashes the address it is given.
+
+    Batches are written under an exclusive flock and continue the chain
+    from the last line in the file, so several processes can share one
+    log. A SQLite index next to it (<path>.idx) maps target hash and
+    timestamp to line offsets for query(); lines written by other
+    processes are indexed on the next query.
+
+    Call close() when done. A trail that is never closed writes its
+    queued entries when it is garbage collected or at interpreter exit.
+    """
+
+    INDEX_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS audit_index (
+            seq INTEGER PRIMARY KEY,
+            timestamp TEXT NOT NULL,
+            target_hash TEXT,
+            action TEXT,
+            offset INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_audit_target ON audit_index (target_hash, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit_index (timestamp);
+    """
+
+    def __init__(self, path: str = "data/audit.log", batch_size: int = 1000,
+                 flush_interval: float = 0.5, fsync: bool = True, max_queued: int = 100000):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._writer = _Writer(path, self.index_path, max(1, batch_size), flush_interval, fsync, max_queued)
+        self._closed = False
+        # Runs the writer's stop() once: from close(), on collection or at exit
+        self._finalizer = weakref.finalize(self, self._writer.stop)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return self._writer.stats
+
+    # Writing
+
+    def record(self, action: str, actor: str, target: str, details: str = "",
+               timestamp: Optional[datetime] = None):
+        """
+        Queues one entry. Raises ValueError once the trail is closed.
+        """
+        if self._closed:
+            raise ValueError("Audit trail is closed")
+        entry = {"timestamp": _timestamp(timestamp or datetime.now()), "action": action,
+                 "actor": actor, "target_hash": hash_email(target), "details": details}
+        self._writer.start()
+        self._writer.queue.put(entry)
+
+    def flush(self):
+        """
+        Blocks until every entry recorded so far is on disk.
+        """
+        if self._writer.running and not self._closed:
+            done = threading.Event()
+            self._writer.queue.put(done)
+            done.wait()
+        self._raise_error()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._finalizer()
+        self._raise_error()
+
+    def _raise_error(self):
+        if self._writer.error is not None:
+            error, self._writer.error = self._writer.error, None
+            raise error
+
+    # Reading
+
+    def _catch_up(self, index: sqlite3.Connection):
+        # Index lines appended since the last indexed one (other processes, or a crash before indexing)
+        if not os.path.exists(self.path):
+            return
+        row = index.execute("SELECT offset FROM audit_index ORDER BY seq DESC LIMIT 1").fetchone()
+        rows = []
+        with open(self.path, "rb") as f:
+            offset = 0
+            if row:
+                f.seek(row[0])
+                offset = row[0] + len(f.readline())
+            for line in f:
+                if line.endswith(b"\n"):
+                    try:
+                        entry = json.loads(line)
+                        # Entries written before targets were hashed carry the address
+                        target_hash = entry.get("target_hash") or hash_email(entry["target_email"])
+                        rows.append((entry["seq"], entry["timestamp"], target_hash, entry["action"], offset))
+                    except (ValueError, KeyError, TypeError):
+                        pass
+                offset += len(line)
+        if rows:
+            index.executemany("INSERT OR IGNORE INTO audit_index VALUES (?, ?, ?, ?, ?)", rows)
+            index.commit()
+
+    def query(self, target: Optional[str] = None, start: Union[datetime, str, None] = None,
+              end: Union[datetime, str, None] = None, action: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict]:
+        """
+        Returns entries for a target address and/or a time range
+        (start inclusive, end exclusive), oldest first, from the index.
+        """
+        self.flush()
+        clauses, params = [], []
+        if target is not None:
+            clauses.append("target_hash = ?")
+            params.append(hash_email(target))
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(_timestamp(start))
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(_timestamp(end))
+        if action is not None:
+            clauses.append("action = ?")
+            params.append(action)
+        sql = "SELECT offset FROM audit_index"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY seq"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        index = _connect_index(self.index_path)
+        try:
+            self._catch_up(index)
+            offsets = [offset for (offset,) in index.execute(sql, params)]
+        finally:
+            index.close()
+        entries = []
+        with open(self.path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                entries.append(json.loads(f.readline()))
+        return entries
+
+    def entries(self) -> Iterator[Dict]:
+        """
+        Yields every entry in file order; torn or unparseable lines are skipped.
+        """
+        self.flush()
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def verify(self) -> Dict:
+        """
+        Walks the hash chain. Returns the number of entries, whether the
+        chain is intact and, if not, the seq of the first entry that
+        doesn't follow from the one before it.
+        """
+        prev, expected_seq, count = GENESIS, 1, 0
+        for entry in self.entries():
+            count += 1
+            if entry.get("seq") != expected_seq or entry.get("prev") != prev or \
+                    entry.get("hash") != entry_hash(entry):
+                return {"entries": count, "valid": False, "broken_at": entry.get("seq")}
+            prev, expected_seq = entry["hash"], expected_seq + 1
+        return {"entries": count, "valid": True, "broken_at": None}
+
+    def __enter__(self) -> "AuditTrail":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,155 @@
+import hashlib
+import math
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Iterable, Iterator, Optional
+
+from .index import normalize_email
+
+# File layout: a fixed 64-byte little-endian header followed by the bit array.
+#   magic (8s) | format version (H) | hash count k (H) | bit count m (Q)
+#   | item count (Q) | epoch in ms (Q) | target false-positive rate (d) | padding
+MAGIC = b"SUPBLOOM"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sHHQQQd20x")
+
+
+def email_digest(email: str) -> bytes:
+    """
+    SHA-256 digest of the normalized address; hash_email() is its hex form.
+    """
+    return hashlib.sha256(normalize_email(email).encode("utf-8")).digest()
+
+
+def _positions(digest: bytes, k: int, m: int) -> Iterator[int]:
+    # Kirsch-Mitzenmacher double hashing over two 64-bit halves of the digest
+    h1 = int.from_bytes(digest[0:8], "little")
+    h2 = int.from_bytes(digest[8:16], "little") | 1
+    for i in range(k):
+        yield (h1 + i * h2) % m
+
+
+def optimal_parameters(capacity: int, fp_rate: float):
+    """
+    Returns (bits, hashes) for a filter holding capacity items at fp_rate.
+    """
+    if not 0 < fp_rate < 1:
+        raise ValueError("fp_rate must be between 0 and 1")
+    capacity = max(1, capacity)
+    bits = max(8, math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class BloomFilter:
+    """
+    Bloom filter of suppressed addresses.
+
+    A negative answer is exact; a positive answer is wrong with probability
+    close to fp_rate (when at most capacity items were added) and must be
+    confirmed against the suppression index. Items are keyed by the SHA-256
+    digest of the normalized address, so pre-hashed suppression records can
+    be added too.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float = 0.001):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.bits, self.hashes = optimal_parameters(capacity, fp_rate)
+        self.count = 0
+        self.epoch = 0
+        self._array = bytearray((self.bits + 7) // 8)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], fp_rate: float = 0.001) -> "BloomFilter":
+        """
+        Builds a filter sized for the given suppression records ('email' or 'email_hash').
+        """
+        records = list(records)
+        bloom = cls(len(records), fp_rate)
+        for record in records:
+            if record.get("email_hash"):
+                bloom.add_digest(bytes.fromhex(record["email_hash"]))
+            elif record.get("email"):
+                bloom.add(record["email"])
+        return bloom
+
+    def add_digest(self, digest: bytes):
+        array = self._array
+        for position in _positions(digest, self.hashes, self.bits):
+            array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def add(self, email: str):
+        self.add_digest(email_digest(email))
+
+    def __contains__(self, email: str) -> bool:
+        array = self._array
+        return all(array[p >> 3] & (1 << (p & 7))
+                   for p in _positions(email_digest(email), self.hashes, self.bits))
+
+    def save(self, path: str, epoch: Optional[int] = None):
+        """
+        Writes the filter atomically (temp file + rename), so readers that
+        open the path always see a complete file. The epoch defaults to the
+        current time in milliseconds and tells readers which is newer.
+        """
+        self.epoch = int(time.time() * 1000) if epoch is None else epoch
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.hashes, self.bits,
+                                self.count, self.epoch, self.fp_rate))
+            f.write(self._array)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+class MappedBloomFilter:
+    """
+    Read-only, memory-mapped view of a published Bloom filter file.
+
+    Opening costs one mmap call however large the filter is; pages are read
+    lazily by the OS and shared between processes mapping the same file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < HEADER.size:
+                raise ValueError(f"{path} is too short to be a Bloom filter")
+            magic, version, self.hashes, self.bits, self.count, self.epoch, self.fp_rate = \
+                HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a suppression Bloom filter")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported Bloom filter format version {version}")
+            if len(self._map) < HEADER.size + (self.bits + 7) // 8:
+                raise ValueError(f"{path} is truncated")
+        except Exception:
+            self._map.close()
+            raise
+
+    def contains_digest(self, digest: bytes) -> bool:
+        data, offset = self._map, HEADER.size
+        return all(data[offset + (p >> 3)] & (1 << (p & 7))
+                   for p in _positions(digest, self.hashes, self.bits))
+
+    def __contains__(self, email: str) -> bool:
+        return self.contains_digest(email_digest(email))
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self) -> "MappedBloomFilter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,147 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import Dict, IO, Iterable, Iterator, Optional
+
+from .models import SuppressionReason
+
+# Reason spellings found in ESP bounce/complaint exports
+REASON_ALIASES = {
+    "bounce": SuppressionReason.BOUNCED,
+    "bounced": SuppressionReason.BOUNCED,
+    "hard_bounce": SuppressionReason.BOUNCED,
+    "hardbounce": SuppressionReason.BOUNCED,
+    "complaint": SuppressionReason.SPAM_COMPLAINT,
+    "spam": SuppressionReason.SPAM_COMPLAINT,
+    "spam_complaint": SuppressionReason.SPAM_COMPLAINT,
+    "spamreport": SuppressionReason.SPAM_COMPLAINT,
+    "unsubscribe": SuppressionReason.UNSUBSCRIBED,
+    "unsubscribed": SuppressionReason.UNSUBSCRIBED,
+    "dsar_deletion": SuppressionReason.DSAR_DELETION,
+    "manual_block": SuppressionReason.MANUAL_BLOCK,
+}
+
+
+def parse_reason(value: Optional[str], default: SuppressionReason) -> SuppressionReason:
+    """
+    Maps a reason from an import file to a SuppressionReason; unknown or empty values get default.
+    """
+    if not value:
+        return default
+    return REASON_ALIASES.get(value.strip().lower().replace("-", "_").replace(" ", "_"), default)
+
+
+def _format(path: str, format: Optional[str]) -> str:
+    if format:
+        return format
+    return "csv" if os.path.splitext(path)[1].lower() == ".csv" else "jsonl"
+
+
+def read_rows(f: IO[str], format: str = "csv") -> Iterator[Dict]:
+    """
+    Streams rows from an open CSV (with a header row) or JSON Lines file.
+    Rows need an 'email' field (CSV headers are matched case-insensitively)
+    and may carry 'reason' and 'timestamp'. Blank or unparseable JSON lines
+    are skipped.
+    """
+    if format == "csv":
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = [name.strip().lower() for name in header]
+        for row in reader:
+            yield dict(zip(columns, row))
+    elif format == "jsonl":
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                yield record
+    else:
+        raise ValueError(f"Unsupported format: {format}")
+
+
+def write_rows(records: Iterable[Dict], f: IO[str], format: str = "jsonl") -> int:
+    """
+    Streams suppression records to an open file as CSV or JSON Lines.
+    Returns the number of records written.
+    """
+    count = 0
+    if format == "csv":
+        writer = csv.writer(f)
+        writer.writerow(["email", "email_hash", "reason", "timestamp"])
+        for record in records:
+            writer.writerow([record.get("email") or "", record.get("email_hash") or "",
+                             record.get("reason") or "", record.get("timestamp") or ""])
+            count += 1
+    elif format == "jsonl":
+        for record in records:
+            f.write(json.dumps(record, default=str) + "\n")
+            count += 1
+    else:
+        raise ValueError(f"Unsupported format: {format}")
+    return count
+
+
+def import_file(manager, path: str, reason: SuppressionReason = SuppressionReason.MANUAL_BLOCK,
+                format: Optional[str] = None) -> Dict[str, int]:
+    """
+    Imports a CSV or JSON Lines file (format inferred from the extension) into the suppression list.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return manager.import_suppressions(read_rows(f, _format(path, format)), default_reason=reason)
+
+
+def export_file(storage, path: str, format: Optional[str] = None) -> int:
+    """
+    Streams the suppression list to a CSV or JSON Lines file ('-' for stdout).
+    """
+    if path == "-":
+        return write_rows(storage.iter_suppression_list(), sys.stdout, format or "jsonl")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        return write_rows(storage.iter_suppression_list(), f, _format(path, format))
+
+
+def main():
+    from .manager import ComplianceManager
+    from .sqlite_storage import SqliteStorage
+    from .storage import JsonStorage
+
+    parser = argparse.ArgumentParser(description="Bulk import and export of the suppression list")
+    parser.add_argument("--data-dir", default="data", help="JsonStorage directory")
+    parser.add_argument("--db", help="Use this SQLite database instead of the JSON files")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Default: from the file extension")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="Suppress every address in a CSV/JSONL file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--reason", default=SuppressionReason.MANUAL_BLOCK.value,
+                               choices=[reason.value for reason in SuppressionReason],
+                               help="Reason for rows that don't name one")
+    export_parser = commands.add_parser("export", help="Write the suppression list to a CSV/JSONL file")
+    export_parser.add_argument("path", help="Output file, or - for stdout (JSON Lines)")
+    args = parser.parse_args()
+
+    storage = SqliteStorage(args.db) if args.db else JsonStorage(data_dir=args.data_dir)
+    if args.command == "import":
+        manager = ComplianceManager(storage=storage)
+        try:
+            counts = import_file(manager, args.path, SuppressionReason(args.reason), args.format)
+        finally:
+            manager.close()
+        print(f"Imported {counts['imported']} of {counts['read']} rows "
+              f"({counts['duplicates']} duplicates, {counts['invalid']} invalid)")
+    else:
+        count = export_file(storage, args.path, args.format)
+        if args.path != "-":
+            print(f"Exported {count} suppression records to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,611 @@
+import argparse
+import fnmatch
+import gzip
+import json
+import math
+import os
+import re
+import sqlite3
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .index import hash_email, normalize_email
+
+REDACTED_LINE = b'{"redacted": true}'
+_SEPARATOR = re.compile(r"[\s,]*")
+
+
+class LocationIndex:
+    """
+    Persistent email -> locations index for DSAR erasure.
+
+    Each row says that store holds a record of the address at locator (a
+    list position, byte offset, row id or file path, depending on the
+    store). Rows are keyed by hash_email, so the index itself holds no
+    addresses. Stores also keep a cursor here: how far they have been
+    indexed, so sync() only reads what was written since.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS dsar_locations (
+            email_hash TEXT NOT NULL,
+            store TEXT NOT NULL,
+            locator TEXT NOT NULL,
+            PRIMARY KEY (email_hash, store, locator)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS dsar_cursors (
+            store TEXT PRIMARY KEY,
+            cursor TEXT
+        );
+    """
+
+    def __init__(self, db_path: str = "data/dsar_index.db"):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def record(self, email: str, store: str, locator: str):
+        self.record_many(store, [(email, locator)])
+
+    def record_many(self, store: str, entries: Iterable[Tuple[str, str]]):
+        """
+        Adds (email, locator) pairs for one store in a single transaction.
+        """
+        rows = [(hash_email(email), store, str(locator)) for email, locator in entries if email]
+        if rows:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO dsar_locations (email_hash, store, locator) VALUES (?, ?, ?)", rows)
+            self._conn.execute("COMMIT")
+
+    def lookup(self, email_hashes: Iterable[str]) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Returns {email_hash: [(store, locator), ...]} for the given hashes,
+        a few hundred per query. Hashes without locations are left out.
+        """
+        hashes = list(set(email_hashes))
+        found = defaultdict(list)
+        for start in range(0, len(hashes), 400):
+            chunk = hashes[start:start + 400]
+            placeholders = ",".join("?" * len(chunk))
+            for email_hash, store, locator in self._conn.execute(
+                    "SELECT email_hash, store, locator FROM dsar_locations "
+                    f"WHERE email_hash IN ({placeholders})", chunk):
+                found[email_hash].append((store, locator))
+        return dict(found)
+
+    def forget(self, email_hashes: Iterable[str]):
+        hashes = list(set(email_hashes))
+        self._conn.execute("BEGIN IMMEDIATE")
+        for start in range(0, len(hashes), 400):
+            chunk = hashes[start:start + 400]
+            placeholders = ",".join("?" * len(chunk))
+            self._conn.execute(f"DELETE FROM dsar_locations WHERE email_hash IN ({placeholders})", chunk)
+        self._conn.execute("COMMIT")
+
+    def drop_store(self, store: str):
+        """
+        Removes every location of a store (before it is indexed again from scratch).
+        """
+        self._conn.execute("DELETE FROM dsar_locations WHERE store = ?", (store,))
+
+    def drop_file(self, store: str, name: str):
+        """
+        Removes the locations of one file of a store ("<name>:<offset>" locators).
+        """
+        prefix = f"{name}:"
+        self._conn.execute("DELETE FROM dsar_locations WHERE store = ? AND substr(locator, 1, ?) = ?",
+                           (store, len(prefix), prefix))
+
+    def cursor(self, store: str) -> Optional[str]:
+        row = self._conn.execute("SELECT cursor FROM dsar_cursors WHERE store = ?", (store,)).fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, store: str, cursor: Optional[str]):
+        self._conn.execute("INSERT OR REPLACE INTO dsar_cursors (store, cursor) VALUES (?, ?)", (store, cursor))
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM dsar_locations").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self) -> "LocationIndex":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonListStore:
+    """
+    A JSON file holding a list of records, e.g. Lead-Gen's
+    data/ready_leads.json or an Outreach save_log file. Locators are
+    "<start>:<end>", the byte span of a record in the file.
+
+    The owning agent writes these files wholesale, so a file is indexed
+    once per write: sync() parses it again only when its signature
+    (inode, size, mtime) changed since the last sync. Erasure overwrites
+    each subject's record in place with {"redacted": true} padded to the
+    same length, so the other spans stay valid and nothing is reindexed.
+    """
+
+    def __init__(self, name: str, path: str, email_field: str = "email"):
+        self.name = name
+        self.path = path
+        self.email_field = email_field
+
+    def _signature(self) -> Optional[str]:
+        if not os.path.exists(self.path):
+            return None
+        stat = os.stat(self.path)
+        return f"{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _spans(self) -> Iterator[Tuple[int, int, object]]:
+        """
+        Yields (start, end, record) for each element of the file's array,
+        with byte offsets.
+        """
+        with open(self.path, "rb") as f:
+            data = f.read()
+        text = data.decode("utf-8")
+        # Character and byte positions only differ for non-ASCII files
+        ascii_only = len(text) == len(data)
+        decoder = json.JSONDecoder()
+        position = _SEPARATOR.match(text).end()
+        if text[position:position + 1] != "[":
+            raise ValueError(f"{self.path} does not hold a JSON list")
+        position += 1
+        offset = position if ascii_only else len(text[:position].encode("utf-8"))
+        while True:
+            start = _SEPARATOR.match(text, position).end()
+            if start >= len(text) or text[start] == "]":
+                return
+            record, end = decoder.raw_decode(text, start)
+            if ascii_only:
+                start_offset, offset = start, end
+            else:
+                start_offset = offset + len(text[position:start].encode("utf-8"))
+                offset = start_offset + len(text[start:end].encode("utf-8"))
+            yield start_offset, offset, record
+            position = end
+
+    def sync(self, index: LocationIndex) -> int:
+        signature = self._signature()
+        if signature == index.cursor(self.name):
+            return 0
+        index.drop_store(self.name)
+        entries = []
+        if signature is not None:
+            entries = [(record.get(self.email_field), f"{start}:{end}")
+                       for start, end, record in self._spans() if isinstance(record, dict)]
+            index.record_many(self.name, entries)
+        index.set_cursor(self.name, signature)
+        return len(entries)
+
+    def erase(self, index: LocationIndex, locations: List[Tuple[str, str]]) -> int:
+        """
+        Redacts the records at the given (email_hash, locator) locations.
+        A record whose address no longer matches (the file changed after it
+        was indexed) is left alone.
+        """
+        signature = self._signature()
+        if signature is None:
+            return 0
+        erased = 0
+        with open(self.path, "r+b") as f:
+            for email_hash, locator in locations:
+                start, _, end = locator.partition(":")
+                if not end:
+                    # A list position from an older version; sync() replaces these
+                    continue
+                start, end = int(start), int(end)
+                f.seek(start)
+                span = f.read(end - start)
+                try:
+                    record = json.loads(span)
+                except ValueError:
+                    continue
+                if not isinstance(record, dict) or hash_email(record.get(self.email_field)) != email_hash:
+                    continue
+                replacement = REDACTED_LINE if len(span) >= len(REDACTED_LINE) else b"{}"
+                f.seek(start)
+                f.write(replacement.ljust(len(span)))
+                erased += 1
+            f.flush()
+            os.fsync(f.fileno())
+        if erased and signature == index.cursor(self.name):
+            # Every span is where it was; only the mtime moved
+            index.set_cursor(self.name, self._signature())
+        return erased
+
+
+class JsonLinesStore:
+    """
+    An append-only JSON Lines file, e.g. an Outreach send log (recipient
+    field), together with the segments SendLog rotates it into: <path>.N,
+    or <path>.N.gz when compressed. The file name may be a glob pattern
+    such as logs/outreach_*.jsonl, since Outreach starts a new log per
+    run. Locators are "<file name>:<offset>", the byte offset of a line
+    (of the uncompressed data for .gz segments).
+
+    sync() only reads lines appended to active files since the last
+    call. A segment is indexed once, when it first appears; rotating the
+    active file shows up as a new segment plus a new active file. Erasure
+    replaces each subject's line with {"redacted": true} padded to the
+    same length, so offsets stay valid: in place for plain files, and by
+    rewriting the segment once per batch for .gz ones.
+    """
+
+    def __init__(self, name: str, path: str, email_field: str = "recipient"):
+        self.name = name
+        self.path = path
+        self.email_field = email_field
+
+    def _files(self) -> List[str]:
+        """
+        Names of each active file's rotated segments, oldest first,
+        followed by the active file itself.
+        """
+        directory = os.path.dirname(self.path) or "."
+        segment = re.compile(r"(.+)\.(\d+)(\.gz)?$")
+        files = defaultdict(list)
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                if self._is_active(name):
+                    files[name].append((math.inf, name))
+                    continue
+                match = segment.match(name)
+                if match and self._is_active(match.group(1)):
+                    files[match.group(1)].append((int(match.group(2)), name))
+        return [name for active in sorted(files) for _, name in sorted(files[active])]
+
+    def _is_active(self, name: str) -> bool:
+        return fnmatch.fnmatchcase(name, os.path.basename(self.path))
+
+    def _file_path(self, name: str) -> str:
+        return os.path.join(os.path.dirname(self.path), name)
+
+    def _open(self, name: str):
+        path = self._file_path(name)
+        return gzip.open(path, "rb") if name.endswith(".gz") else open(path, "rb")
+
+    def _cursors(self, index: LocationIndex) -> Dict[str, str]:
+        # {file name: "inode:offset"} for the active file, "inode:size" for segments
+        cursor = index.cursor(self.name)
+        try:
+            cursors = json.loads(cursor) if cursor else {}
+        except ValueError:
+            cursors = None
+        if not isinstance(cursors, dict):
+            # Indexed by an older version with bare offsets: start over
+            index.drop_store(self.name)
+            cursors = {}
+        return cursors
+
+    def sync(self, index: LocationIndex) -> int:
+        cursors = self._cursors(index)
+        names = self._files()
+        for name in set(cursors) - set(names):
+            # A segment was deleted (or compressed under a new name)
+            index.drop_file(self.name, name)
+            del cursors[name]
+        indexed = 0
+        for name in names:
+            stat = os.stat(self._file_path(name))
+            inode, mark = (int(part) for part in cursors[name].split(":")) if name in cursors else (None, 0)
+            active = self._is_active(name)
+            if active:
+                offset = mark
+                if inode != stat.st_ino or stat.st_size < offset:
+                    # Rotated or truncated: index the new file from the start
+                    index.drop_file(self.name, name)
+                    offset = 0
+            else:
+                if inode == stat.st_ino and mark == stat.st_size:
+                    continue
+                index.drop_file(self.name, name)
+                offset = 0
+            entries, offset = self._read_from(name, offset)
+            index.record_many(self.name, entries)
+            cursors[name] = f"{stat.st_ino}:{offset if active else stat.st_size}"
+            indexed += len(entries)
+        index.set_cursor(self.name, json.dumps(cursors))
+        return indexed
+
+    def _read_from(self, name: str, offset: int) -> Tuple[List[Tuple[str, str]], int]:
+        entries = []
+        with self._open(name) as f:
+            if offset:
+                f.seek(offset)
+            for line in f:
+                # A line without its newline is still being written; pick it up next time
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if isinstance(record, dict) and record.get(self.email_field):
+                    entries.append((record[self.email_field], f"{name}:{offset}"))
+                offset += len(line)
+        return entries, offset
+
+    def _redacted(self, line: bytes, email_hash: str) -> Optional[bytes]:
+        """
+        The replacement for a subject's line, or None if the line at that
+        offset isn't theirs (any more).
+        """
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(record, dict) or hash_email(record.get(self.email_field)) != email_hash:
+            return None
+        body = line.rstrip(b"\n")
+        replacement = REDACTED_LINE if len(body) >= len(REDACTED_LINE) else b"{}"
+        return replacement.ljust(len(body)) + line[len(body):]
+
+    def erase(self, index: LocationIndex, locations: List[Tuple[str, str]]) -> int:
+        by_file = defaultdict(dict)
+        for email_hash, locator in locations:
+            name, _, offset = locator.rpartition(":")
+            by_file[name][int(offset)] = email_hash
+        erased = 0
+        for name, lines in by_file.items():
+            if not os.path.exists(self._file_path(name)):
+                continue
+            if name.endswith(".gz"):
+                erased += self._rewrite(index, name, lines)
+            else:
+                erased += self._redact_in_place(name, lines)
+        return erased
+
+    def _redact_in_place(self, name: str, lines: Dict[int, str]) -> int:
+        erased = 0
+        with open(self._file_path(name), "r+b") as f:
+            for offset in sorted(lines):
+                f.seek(offset)
+                replacement = self._redacted(f.readline(), lines[offset])
+                if replacement is not None:
+                    f.seek(offset)
+                    f.write(replacement)
+                    erased += 1
+            f.flush()
+            os.fsync(f.fileno())
+        return erased
+
+    def _rewrite(self, index: LocationIndex, name: str, lines: Dict[int, str]) -> int:
+        path = self._file_path(name)
+        tmp_path = f"{path}.tmp"
+        erased = offset = 0
+        with gzip.open(path, "rb") as src, open(tmp_path, "wb") as raw:
+            with gzip.GzipFile(filename=name[:-3], mode="wb", fileobj=raw) as dst:
+                for line in src:
+                    replacement = self._redacted(line, lines[offset]) if offset in lines else None
+                    offset += len(line)
+                    if replacement is not None:
+                        line = replacement
+                        erased += 1
+                    dst.write(line)
+            raw.flush()
+            os.fsync(raw.fileno())
+        if not erased:
+            os.remove(tmp_path)
+            return 0
+        os.replace(tmp_path, path)
+        # Offsets are unchanged; only the segment's signature is new
+        cursors = self._cursors(index)
+        stat = os.stat(path)
+        cursors[name] = f"{stat.st_ino}:{stat.st_size}"
+        index.set_cursor(self.name, json.dumps(cursors))
+        return erased
+
+
+class SqliteTableStore:
+    """
+    A SQLite table keyed by an integer id, e.g. the Analytics Agent's
+    events table (lead_id holds the address). sync() indexes rows with an
+    id above the last one seen; erasure deletes rows by primary key.
+    """
+
+    def __init__(self, name: str, db_path: str, table: str = "events",
+                 email_column: str = "lead_id", id_column: str = "id"):
+        self.name = name
+        self.db_path = db_path
+        self.table = table
+        self.email_column = email_column
+        self.id_column = id_column
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def sync(self, index: LocationIndex) -> int:
+        if not os.path.exists(self.db_path):
+            return 0
+        last_id = int(index.cursor(self.name) or 0)
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT {self.id_column}, {self.email_column} FROM {self.table} "
+                f"WHERE {self.id_column} > ? ORDER BY {self.id_column}", (last_id,)).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            return 0
+        index.record_many(self.name, ((email, row_id) for row_id, email in rows))
+        index.set_cursor(self.name, str(rows[-1][0]))
+        return len(rows)
+
+    def erase(self, index: LocationIndex, locations: List[Tuple[str, str]]) -> int:
+        ids = [int(locator) for _, locator in locations]
+        erased = 0
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for start in range(0, len(ids), 400):
+                chunk = ids[start:start + 400]
+                placeholders = ",".join("?" * len(chunk))
+                erased += conn.execute(
+                    f"DELETE FROM {self.table} WHERE {self.id_column} IN ({placeholders})", chunk).rowcount
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return erased
+
+
+class FileStore(JsonLinesStore):
+    """
+    Files that each belong to one subject, e.g. the Closer's quote PDFs.
+    Their names don't carry the full address, so the producer appends
+    {"email": ..., "path": ...} to a JSON Lines manifest for every file it
+    writes (the Closer's quote_manifest.jsonl), which sync() indexes like
+    any JSON Lines file. Erasure deletes the subjects' files and redacts
+    their manifest lines. Files registered one by one with
+    engine.record(email, store, path) are deleted too.
+    """
+
+    def __init__(self, name: str, manifest: str, email_field: str = "email", path_field: str = "path"):
+        super().__init__(name, manifest, email_field)
+        self.path_field = path_field
+
+    def erase(self, index: LocationIndex, locations: List[Tuple[str, str]]) -> int:
+        manifest = os.path.basename(self.path)
+        entries, paths = [], []
+        for email_hash, locator in locations:
+            name, _, offset = locator.rpartition(":")
+            if name == manifest and offset.isdigit():
+                entries.append((email_hash, locator))
+            else:
+                paths.append(locator)
+        if entries and os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                for email_hash, locator in entries:
+                    f.seek(int(locator.rpartition(":")[2]))
+                    line = f.readline()
+                    if self._redacted(line, email_hash) is not None:
+                        path = json.loads(line).get(self.path_field)
+                        if path:
+                            paths.append(os.path.join(os.path.dirname(self.path), path))
+            super().erase(index, entries)
+        erased = 0
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+                erased += 1
+        return erased
+
+
+class DsarEngine:
+    """
+    Erases DSAR subjects from every registered data store in one pass.
+    ComplianceManager(dsar=engine) runs it for each DSAR deletion, before
+    redacting consent and suppressing the subjects.
+
+    Stores are described by paths, so no other agent's code is imported.
+    Locations come from the LocationIndex, which is kept current as
+    records are written: the Compliance consent log through
+    ComplianceManager.consent_positions, other stores by sync() (which
+    reads only what was appended since the previous sync, and rereads a
+    JSON list file only after its producer rewrote it) or by producers
+    calling record(). Resolving a batch costs index lookups plus work on
+    the subjects' own records; stores holding none of them aren't opened.
+    """
+
+    def __init__(self, index: LocationIndex, stores: Iterable = ()):
+        self.index = index
+        self.stores = {store.name: store for store in stores}
+
+    @classmethod
+    def for_agents(cls, root: str, index_path: str) -> "DsarEngine":
+        """
+        An engine over the other agents' stores at their default paths,
+        with root the directory holding the agent directories.
+        """
+        return cls(LocationIndex(index_path), [
+            JsonListStore("leadgen", os.path.join(root, "Lead-Gen Agent", "data", "ready_leads.json")),
+            JsonLinesStore("outreach", os.path.join(root, "Outreach Worker", "logs", "outreach_*.jsonl")),
+            SqliteTableStore("analytics", os.path.join(root, "Analytics Agent", "analytics.db")),
+            FileStore("closer", os.path.join(root, "Closer worker", "quote_manifest.jsonl")),
+        ])
+
+    def record(self, email: str, store: str, locator: str):
+        """
+        Registers a record written outside a synced store (e.g. a quote PDF).
+        """
+        self.index.record(email, store, locator)
+
+    def sync(self) -> Dict[str, int]:
+        """
+        Indexes records written to the stores since the last sync.
+        """
+        return {name: store.sync(self.index) for name, store in self.stores.items()}
+
+    def erase(self, emails: Iterable[str]) -> Dict[str, int]:
+        """
+        Erases a batch of subjects' records from every store, one pass per
+        store that holds any. Returns the number of records erased per store.
+        """
+        hashes = {hash_email(email) for email in emails if normalize_email(email)}
+        self.sync()
+        by_store = defaultdict(list)
+        for email_hash, locations in self.index.lookup(hashes).items():
+            for store, locator in locations:
+                by_store[store].append((email_hash, locator))
+
+        erased = {}
+        pending = set()
+        for name, locations in by_store.items():
+            store = self.stores.get(name)
+            if store is None:
+                # Keep these locations indexed until the store is registered again
+                print(f"Warning: no store registered for {len(locations)} DSAR locations in '{name}'")
+                pending.update(email_hash for email_hash, _ in locations)
+                continue
+            erased[name] = store.erase(self.index, locations)
+        self.index.forget(hashes - pending)
+        return erased
+
+    def close(self):
+        self.index.close()
+
+
+def main():
+    from .manager import ComplianceManager
+    from .sqlite_storage import SqliteStorage
+    from .storage import JsonStorage
+
+    parser = argparse.ArgumentParser(description="Erase DSAR subjects from every agent's data")
+    parser.add_argument("emails", nargs="*", help="Addresses to erase")
+    parser.add_argument("--file", help="Also read addresses from this file, one per line")
+    parser.add_argument("--data-dir", default="data", help="JsonStorage directory")
+    parser.add_argument("--db", help="Use this SQLite database instead of the JSON files")
+    parser.add_argument("--root", default="..", help="Directory holding the agent directories")
+    args = parser.parse_args()
+
+    emails = list(args.emails)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            emails.extend(line.strip() for line in f if line.strip())
+    if not emails:
+        parser.error("no addresses given")
+
+    storage = SqliteStorage(args.db) if args.db else JsonStorage(data_dir=args.data_dir)
+    directory = os.path.dirname(os.path.abspath(args.db)) if args.db else args.data_dir
+    dsar = DsarEngine.for_agents(args.root, os.path.join(directory, "dsar_index.db"))
+    manager = ComplianceManager(storage=storage, dsar=dsar)
+    try:
+        result = manager.process_dsar_batch(emails)
+    finally:
+        manager.close()
+    print(f"Processed {len(set(emails))} DSAR deletions: erased {result['erased']}, "
+          f"{result['consent_redacted']} consent records redacted, {result['suppressed']} suppressed")
+
+
+if __name__ == "__main__":
+    main()
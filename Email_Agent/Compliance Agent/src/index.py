@@ -0,0 +1,93 @@
+import hashlib
+from typing import Dict, Iterable, List
+
+
+def normalize_email(email: str) -> str:
+    """
+    Canonical form used for suppression matching (trimmed, lower-case).
+    """
+    return (email or "").strip().lower()
+
+
+def hash_email(email: str) -> str:
+    """
+    SHA-256 hex digest of the normalized address, for storing or sharing
+    suppressed addresses without the address itself.
+    """
+    return hashlib.sha256(normalize_email(email).encode("utf-8")).hexdigest()
+
+
+class SuppressionIndex:
+    """
+    In-memory hash set of suppressed addresses with O(1) membership checks.
+
+    Addresses are normalized before they are stored or looked up. With
+    hashed=True only the 32-byte SHA-256 digest of each address is kept,
+    which uses less memory on multi-million-entry lists and keeps plain
+    addresses out of memory. Pre-hashed entries (hex digests) can be added
+    with add_hash; they are matched in either mode.
+    """
+
+    def __init__(self, emails: Iterable[str] = (), hashed: bool = False):
+        self.hashed = hashed
+        self._keys = set()
+        self._hashes = set()
+        self.add_many(emails)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], hashed: bool = False) -> "SuppressionIndex":
+        """
+        Builds an index from suppression records. A record carries either an
+        'email' or an 'email_hash' (hex SHA-256 of the normalized address).
+        """
+        index = cls(hashed=hashed)
+        for record in records:
+            if record.get("email_hash"):
+                index.add_hash(record["email_hash"])
+            elif record.get("email"):
+                index.add(record["email"])
+        return index
+
+    def _key(self, email: str):
+        normalized = normalize_email(email)
+        if self.hashed:
+            return hashlib.sha256(normalized.encode("utf-8")).digest()
+        return normalized
+
+    def add(self, email: str):
+        self._keys.add(self._key(email))
+
+    def add_many(self, emails: Iterable[str]):
+        self._keys.update(map(self._key, emails))
+
+    def add_hash(self, email_hash: str):
+        digest = bytes.fromhex(email_hash)
+        if self.hashed:
+            self._keys.add(digest)
+        else:
+            self._hashes.add(digest)
+
+    def discard(self, email: str):
+        self._keys.discard(self._key(email))
+        self._hashes.discard(hashlib.sha256(normalize_email(email).encode("utf-8")).digest())
+
+    def __contains__(self, email: str) -> bool:
+        if self._key(email) in self._keys:
+            return True
+        if self._hashes:
+            digest = hashlib.sha256(normalize_email(email).encode("utf-8")).digest()
+            return digest in self._hashes
+        return False
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._hashes)
+
+    def filter_eligible(self, emails: Iterable[str]) -> List[str]:
+        """
+        Returns the addresses that are not suppressed, in input order.
+        Meant to be called once per batch from a send loop.
+        """
+        if not self.hashed and not self._hashes:
+            keys = self._keys
+            return [email for email in emails if normalize_email(email) not in keys]
+        return [email for email in emails if email not in self]
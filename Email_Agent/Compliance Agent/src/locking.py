@@ -0,0 +1,95 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # e.g. Windows
+    fcntl = None
+
+
+class LockTimeout(TimeoutError):
+    pass
+
+
+class FileLock:
+    """
+    Advisory inter-process lock on a separate lock file.
+
+    Uses flock (shared or exclusive) where available. Elsewhere it falls
+    back to creating the lock file with O_EXCL, which only gives exclusive
+    locks; a lock file older than stale_after seconds is assumed to be
+    left by a crashed process and removed.
+
+    The lock is re-entrant within an instance, so a method holding it may
+    call another that takes it again; threads of one process using the
+    same instance are serialized as well.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0, poll_interval: float = 0.005,
+                 stale_after: float = 60.0, use_fcntl: bool = True):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.use_fcntl = use_fcntl and fcntl is not None
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    @contextmanager
+    def acquire(self, shared: bool = False):
+        with self._thread_lock:
+            if self._depth == 0:
+                self._lock(shared)
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._unlock()
+
+    def _lock(self, shared: bool):
+        deadline = time.monotonic() + self.timeout
+        if self.use_fcntl:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            mode = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            while True:
+                try:
+                    fcntl.flock(fd, mode | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        os.close(fd)
+                        raise LockTimeout(f"Timed out waiting for {self.path}")
+                    time.sleep(self.poll_interval)
+            self._fd = fd
+            return
+
+        while True:
+            try:
+                fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+                os.write(fd, str(os.getpid()).encode("ascii"))
+                self._fd = fd
+                return
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.stale_after:
+                        os.remove(self.path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() >= deadline:
+                    raise LockTimeout(f"Timed out waiting for {self.path}")
+                time.sleep(self.poll_interval)
+
+    def _unlock(self):
+        fd, self._fd = self._fd, None
+        if self.use_fcntl:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        else:
+            os.close(fd)
+            os.remove(self.path)
@@ -1,23 +1,59 @@
+import os
+from collections import defaultdict
 from datetime import datetime
-from typing import Optional
-from .models import SuppressionRecord, ConsentRecord, SuppressionReason, ConsentType, AuditLog
+from typing import Dict, Iterable, List
+from .models import SuppressionRecord, ConsentRecord, SuppressionReason, ConsentType
+from .audit import AuditTrail
+from .bloom import BloomFilter
+from .bulk import parse_reason
+from .index import SuppressionIndex, normalize_email
 from .storage import JsonStorage
 
 class ComplianceManager:
-    def __init__(self, storage: JsonStorage = None):
+    def __init__(self, storage: JsonStorage = None, hashed_index: bool = False, audit: AuditTrail = None,
+                 dsar=None):
         self.storage = storage or JsonStorage()
+        if audit is None:
+            # Keep the audit trail next to the data it describes
+            directory = getattr(self.storage, "data_dir", None) or \
+                os.path.dirname(os.path.abspath(self.storage.db_path))
+            audit = AuditTrail(os.path.join(directory, "audit.log"))
+        self.audit = audit
+        # DsarEngine erasing DSAR subjects from the other agents' stores
+        self.dsar = dsar
         self.suppression_list = self.storage.load_suppression_list()
         self.consent_log = self.storage.load_consent_log()
+        self.suppression_index = SuppressionIndex.from_records(self.suppression_list, hashed=hashed_index)
+        # Positions of each address's records in consent_log, kept up to date by log_consent
+        self.consent_positions = defaultdict(list)
+        for position, record in enumerate(self.consent_log):
+            if record.get("email") != "REDACTED":
+                self.consent_positions[normalize_email(record.get("email"))].append(position)
 
     def check_eligibility(self, email: str) -> bool:
         """
         Checks if an email is eligible to receive messages.
-        Returns False if suppressed.
+        Returns False if suppressed. Matching ignores case and surrounding whitespace.
         """
-        for record in self.suppression_list:
-            if record['email'] == email:
-                return False
-        return True
+        return email not in self.suppression_index
+
+    def filter_eligible(self, emails: Iterable[str]) -> List[str]:
+        """
+        Returns the emails that may be contacted, in input order.
+        Use this per batch in send loops instead of calling check_eligibility per address.
+        """
+        return self.suppression_index.filter_eligible(emails)
+
+    def publish_bloom_filter(self, path: str, fp_rate: float = 0.001) -> BloomFilter:
+        """
+        Writes a Bloom filter of the current suppression list for other agents
+        to mmap. Republish after the list changes; readers pick up the new epoch.
+        """
+        bloom = BloomFilter.from_records(self.suppression_list, fp_rate=fp_rate)
+        bloom.save(path)
+        self._audit_log("publish_bloom", "system", "*",
+                        f"{bloom.count} entries, epoch {bloom.epoch}, fp_rate {fp_rate}")
+        return bloom
 
     def add_to_suppression_list(self, email: str, reason: SuppressionReason):
         """
@@ -29,47 +65,132 @@ class ComplianceManager:
 
         record = SuppressionRecord(email=email, reason=reason)
         self.suppression_list.append(record.dict())
-        self.storage.save_suppression_list(self.suppression_list)
+        self.suppression_index.add(email)
+        self.storage.append_suppression(record.dict())
         self._audit_log("suppress", "system", email, f"Reason: {reason}")
         print(f"Suppressed {email} due to {reason}")
 
+    def import_suppressions(self, rows: Iterable[Dict],
+                            default_reason: SuppressionReason = SuppressionReason.MANUAL_BLOCK) -> Dict[str, int]:
+        """
+        Suppresses many addresses at once, e.g. an ESP bounce/complaint export.
+        Rows are dicts with an 'email' and optional 'reason' and 'timestamp'.
+        Addresses are normalized and deduplicated against the list and the
+        input, then stored with a single append_suppressions call. The
+        in-memory list and index only change once that write succeeded.
+        Returns counts of rows read, imported, duplicate and invalid.
+        """
+        now = str(datetime.now())
+        counts = {"read": 0, "imported": 0, "duplicates": 0, "invalid": 0}
+        records = []
+        index = self.suppression_index
+        seen = set()
+        reasons = {}  # raw reason -> stored value; exports repeat a handful of spellings
+        for row in rows:
+            counts["read"] += 1
+            email = normalize_email(row.get("email"))
+            if "@" not in email:
+                counts["invalid"] += 1
+                continue
+            if email in seen or email in index:
+                counts["duplicates"] += 1
+                continue
+            seen.add(email)
+            raw_reason = row.get("reason")
+            reason = reasons.get(raw_reason)
+            if reason is None:
+                reason = reasons[raw_reason] = parse_reason(raw_reason, default_reason).value
+            records.append({"email": email, "reason": reason, "timestamp": row.get("timestamp") or now})
+        if records:
+            self.storage.append_suppressions(records)
+            self.suppression_list.extend(records)
+            index.add_many(seen)
+        counts["imported"] = len(records)
+        self._audit_log("bulk_suppress", "system", "*",
+                        f"{counts['imported']} imported, {counts['duplicates']} duplicates, "
+                        f"{counts['invalid']} invalid")
+        return counts
+
     def log_consent(self, email: str, source: str, consent_type: ConsentType = ConsentType.MARKETING):
         """
         Logs consent for a lead.
         """
         record = ConsentRecord(email=email, source=source, consent_type=consent_type)
+        self.consent_positions[normalize_email(email)].append(len(self.consent_log))
         self.consent_log.append(record.dict())
-        self.storage.save_consent_log(self.consent_log)
+        self.storage.append_consent(record.dict())
         self._audit_log("consent_grant", "system", email, f"Source: {source}")
         print(f"Logged consent for {email}")
 
     def process_dsar_delete(self, email: str):
         """
         Handles a DSAR deletion request.
-        Redacts PII from consent logs and adds to suppression list (hashed or marked).
+        Erases the subject from the stores of the DSAR engine (if any), redacts
+        PII from consent logs and adds to suppression list (hashed or marked).
         """
         print(f"Processing DSAR deletion for {email}...")
-        
-        # 1. Redact from Consent Log
+        result = self.process_dsar_batch([email])
+        for store, count in result["erased"].items():
+            if count:
+                print(f"Erased {count} records from {store}.")
+        if result["consent_redacted"] > 0:
+            print(f"Redacted {result['consent_redacted']} records from consent log.")
+
+    def process_dsar_batch(self, emails: Iterable[str]) -> Dict:
+        """
+        Handles many DSAR deletions at once: one DsarEngine pass over the
+        other agents' stores, one consent-log redaction and one suppression
+        write for the whole batch. Work is proportional to the subjects' own
+        records (found through the engine's index and consent_positions).
+        Returns the records erased per store and counts of redacted consent
+        records and new suppressions.
+        """
+        emails = list(dict.fromkeys(emails))
+
+        # 1. Erase from the other agents' stores
+        erased = self.dsar.erase(emails) if self.dsar is not None else {}
+
+        # 2. Redact from Consent Log
         redacted_count = 0
-        for record in self.consent_log:
-            if record['email'] == email:
+        subjects = []
+        for email in emails:
+            positions = self.consent_positions.pop(normalize_email(email), [])
+            if positions:
+                subjects.append(email)
+            for position in positions:
+                record = self.consent_log[position]
                 record['email'] = "REDACTED"
                 record['ip_address'] = "REDACTED"
                 redacted_count += 1
-        
-        if redacted_count > 0:
-            self.storage.save_consent_log(self.consent_log)
-            print(f"Redacted {redacted_count} records from consent log.")
-
-        # 2. Ensure Suppression (to prevent re-add)
-        # Note: In a real system, we might hash this. For now, we keep the email in suppression 
-        # but mark it as DSAR_DELETION so we know why it's there (and maybe don't store other info).
-        self.add_to_suppression_list(email, SuppressionReason.DSAR_DELETION)
-        
-        self._audit_log("dsar_delete", "admin", email, "PII Redacted")
+        if subjects:
+            self.storage.redact_consent(subjects)
+
+        # 3. Ensure Suppression (to prevent re-add)
+        # The email stays in suppression, marked DSAR_DELETION so we know why it's there.
+        records, seen = [], set()
+        for email in emails:
+            key = normalize_email(email)
+            if key in seen or email in self.suppression_index:
+                continue
+            seen.add(key)
+            records.append(SuppressionRecord(email=email, reason=SuppressionReason.DSAR_DELETION).dict())
+        if records:
+            self.storage.append_suppressions(records)
+            self.suppression_list.extend(records)
+            self.suppression_index.add_many(seen)
+
+        for email in emails:
+            self._audit_log("dsar_delete", "admin", email, "PII Redacted")
+        return {"erased": erased, "consent_redacted": redacted_count, "suppressed": len(records)}
 
     def _audit_log(self, action: str, actor: str, target: str, details: str):
-        # Simple print for now, could write to a separate file
-        log = AuditLog(action=action, actor=actor, target_email=target, details=details)
-        print(f"[AUDIT] {log.timestamp} - {action}: {target} ({details})")
+        # Queued for the audit trail's background writer; see AuditTrail.query / verify
+        self.audit.record(action, actor, target, details)
+
+    def close(self):
+        """
+        Writes out pending audit entries and closes the DSAR engine.
+        """
+        self.audit.close()
+        if self.dsar is not None:
+            self.dsar.close()
@@ -0,0 +1,24 @@
+import argparse
+from .sqlite_storage import SqliteStorage
+from .storage import JsonStorage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy the JSON suppression and consent logs into SQLite")
+    parser.add_argument("--data-dir", default="data", help="Directory holding suppression.json and consent_log.json")
+    parser.add_argument("--db", default="data/compliance.db", help="SQLite database to create or overwrite")
+    args = parser.parse_args()
+
+    source = JsonStorage(data_dir=args.data_dir)
+    with SqliteStorage(args.db) as target:
+        counts = target.import_from(source)
+        # Check the copy before anyone switches over to it
+        if target.count_suppressed() != counts["suppression"] or \
+                len(target.load_consent_log()) != counts["consent"]:
+            raise SystemExit("Migration check failed: record counts differ")
+    print(f"Migrated {counts['suppression']} suppression records and "
+          f"{counts['consent']} consent records to {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Eligibility daemon: one process holds the suppression index and answers
+batched checks for many workers over a Unix socket or localhost TCP.
+
+Protocol: one JSON object per line each way. Requests carry an "id"
+that is echoed back; responses come in request order, so a client may
+send many requests before reading (pipelining).
+    {"id": 1, "op": "check", "emails": ["a@example.com", ...]}
+        -> {"id": 1, "suppressed": ["a@example.com"], "generation": 3}
+    {"id": 2, "op": "ping"}
+        -> {"id": 2, "ok": true, "generation": 3, "entries": 120000}
+Errors come back as {"id": ..., "error": "..."}. "generation" goes up
+each time the daemon reloads the suppression list. The client side
+(answer cache, pipelined batches, reconnect) is the Outreach Worker's
+ServiceSuppression.
+
+Run from the Compliance Agent directory:
+    python -m src.service --socket data/eligibility.sock
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+from .index import SuppressionIndex
+
+Address = Union[str, Tuple[str, int]]
+
+
+class EligibilityServer:
+    """
+    Serves check_eligibility from one in-memory SuppressionIndex.
+
+    The index is rebuilt in a worker thread when storage.suppression_version()
+    changes (checked every refresh_interval seconds) and swapped in whole,
+    so every response is answered from one consistent list.
+    """
+
+    def __init__(self, storage, refresh_interval: float = 1.0, hashed_index: bool = False):
+        self.storage = storage
+        self.refresh_interval = refresh_interval
+        self.hashed_index = hashed_index
+        self.generation = 0
+        self.stats = {"connections": 0, "requests": 0, "checked": 0, "reloads": 0}
+        self._version = None
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """
+        Reloads the suppression list if it changed. Returns True if it did.
+        """
+        version = self.storage.suppression_version()
+        if version == self._version:
+            return False
+        index = SuppressionIndex.from_records(self.storage.load_suppression_list(), hashed=self.hashed_index)
+        self.index, self._version = index, version
+        self.generation += 1
+        self.stats["reloads"] += 1
+        return True
+
+    def _respond(self, line: bytes) -> Dict:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"id": None, "error": "invalid JSON"}
+        if not isinstance(request, dict):
+            return {"id": None, "error": "request must be an object"}
+        request_id = request.get("id")
+        self.stats["requests"] += 1
+        op = request.get("op")
+        if op == "check":
+            emails = request.get("emails")
+            if not isinstance(emails, list):
+                return {"id": request_id, "error": "'emails' must be a list"}
+            index = self.index
+            self.stats["checked"] += len(emails)
+            return {"id": request_id, "suppressed": [email for email in emails if email in index],
+                    "generation": self.generation}
+        if op == "ping":
+            return {"id": request_id, "ok": True, "generation": self.generation, "entries": len(self.index)}
+        return {"id": request_id, "error": f"unknown op: {op}"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats["connections"] += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                writer.write((json.dumps(self._respond(line)) + "\n").encode("utf-8"))
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Server shutting down with the client still connected
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+    async def _refresher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await loop.run_in_executor(None, self.refresh)
+            except Exception as e:
+                print(f"Failed to reload suppression list: {e}")
+
+    async def _start(self, socket_path: Optional[str], host: str, port: Optional[int]):
+        limit = 16 * 1024 * 1024
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self._server = await asyncio.start_unix_server(self._handle, path=socket_path, limit=limit)
+            self.address = socket_path
+        else:
+            self._server = await asyncio.start_server(self._handle, host=host, port=port or 0, limit=limit)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        self._refresh_task = asyncio.ensure_future(self._refresher())
+
+    async def _shutdown(self):
+        self._server.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def serve_forever(self, socket_path: Optional[str] = None, host: str = "127.0.0.1", port: Optional[int] = None):
+        async def run():
+            await self._start(socket_path, host, port)
+            print(f"Eligibility service listening on {self.address} ({len(self.index)} suppressed)")
+            await self._server.serve_forever()
+        asyncio.run(run())
+
+    def start(self, socket_path: Optional[str] = None, host: str = "127.0.0.1",
+              port: Optional[int] = None) -> Address:
+        """
+        Serves from a background thread; returns the address once listening.
+        Without socket_path a TCP port is used (port 0 picks a free one).
+        """
+        started = threading.Event()
+        errors = []
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self._start(socket_path, host, port))
+            except Exception as e:
+                errors.append(e)
+                started.set()
+                return
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self._shutdown())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="eligibility-service", daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            raise errors[0]
+        return self.address
+
+    def stop(self):
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+            if isinstance(self.address, str) and os.path.exists(self.address):
+                os.remove(self.address)
+
+
+def main():
+    from .sqlite_storage import SqliteStorage
+    from .storage import JsonStorage
+
+    parser = argparse.ArgumentParser(description="Serve suppression checks to other processes")
+    parser.add_argument("--socket", help="Unix socket path to listen on")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host when --socket isn't given")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port when --socket isn't given")
+    parser.add_argument("--data-dir", default="data", help="JsonStorage directory")
+    parser.add_argument("--db", help="Use this SQLite database instead of the JSON files")
+    parser.add_argument("--refresh", type=float, default=1.0, help="Seconds between checks for list changes")
+    parser.add_argument("--hashed", action="store_true", help="Keep only SHA-256 digests in memory")
+    args = parser.parse_args()
+
+    storage = SqliteStorage(args.db) if args.db else JsonStorage(data_dir=args.data_dir)
+    server = EligibilityServer(storage, refresh_interval=args.refresh, hashed_index=args.hashed)
+    try:
+        server.serve_forever(socket_path=args.socket, host=args.host, port=args.port)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
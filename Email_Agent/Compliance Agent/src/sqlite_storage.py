@@ -0,0 +1,238 @@
+import os
+import sqlite3
+from enum import Enum
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Set
+
+from .index import hash_email, normalize_email
+
+
+def _text(value):
+    if value is None:
+        return None
+    if isinstance(value, Enum):
+        return str(value.value)
+    return str(value)
+
+
+class SqliteStorage:
+    """
+    SQLite backend with the same interface as JsonStorage.
+
+    Suppression rows are indexed by the SHA-256 of the normalized email
+    (hash-only records are kept as such) and consent rows by the
+    normalized email, so lookups
+    and batch lookups (is_suppressed, suppressed_among) don't need the
+    whole list in memory. The database runs in WAL mode, so readers in
+    other processes aren't blocked by a writer. Every write is a single
+    transaction, so a write that fails partway leaves nothing behind;
+    rows are handed to SQLite batch_size at a time to bound memory.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS suppression (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT,
+            email_hash TEXT NOT NULL,
+            reason TEXT,
+            timestamp TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_suppression_email_hash ON suppression (email_hash);
+        CREATE TABLE IF NOT EXISTS consent_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT,
+            email_key TEXT,
+            source TEXT,
+            consent_type TEXT,
+            timestamp TEXT,
+            ip_address TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_consent_log_email_key ON consent_log (email_key);
+    """
+
+    def __init__(self, db_path: str = "data/compliance.db", batch_size: int = 10000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Callers serialize access; the eligibility service reloads from a worker thread
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def _write(self, sql: str, rows: Iterable[tuple], replace_table: str = None):
+        rows = iter(rows)
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            if replace_table:
+                self._conn.execute(f"DELETE FROM {replace_table}")
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                self._conn.executemany(sql, batch)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    # Suppression list
+
+    _INSERT_SUPPRESSION = ("INSERT INTO suppression (email, email_hash, reason, timestamp) "
+                           "VALUES (?, ?, ?, ?)")
+
+    @staticmethod
+    def _suppression_row(record: Dict) -> tuple:
+        email = record.get("email")
+        if email:
+            return (email, hash_email(email),
+                    _text(record.get("reason")), _text(record.get("timestamp")))
+        return (None, record["email_hash"],
+                _text(record.get("reason")), _text(record.get("timestamp")))
+
+    def load_suppression_list(self) -> List[Dict]:
+        return list(self.iter_suppression_list())
+
+    def iter_suppression_list(self) -> Iterator[Dict]:
+        """
+        Streams the suppression records in insertion order without loading them all.
+        """
+        for email, email_hash, reason, timestamp in self._conn.execute(
+                "SELECT email, email_hash, reason, timestamp FROM suppression ORDER BY id"):
+            key = {"email": email} if email is not None else {"email_hash": email_hash}
+            yield {**key, "reason": reason, "timestamp": timestamp}
+
+    def save_suppression_list(self, data: List[Dict]):
+        self._write(self._INSERT_SUPPRESSION, map(self._suppression_row, data),
+                    replace_table="suppression")
+
+    def append_suppression(self, record: Dict):
+        self._write(self._INSERT_SUPPRESSION, [self._suppression_row(record)])
+
+    def append_suppressions(self, records: Iterable[Dict]):
+        """
+        Appends many records. A batch at least as large as the table is
+        loaded in one transaction with the email_hash index rebuilt
+        afterwards, which is several times faster than updating the index
+        row by row. Readers keep seeing the previous state until it commits.
+        """
+        rows = list(map(self._suppression_row, records))
+        if len(rows) < self.batch_size or len(rows) < self.count_suppressed():
+            self._write(self._INSERT_SUPPRESSION, rows)
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute("DROP INDEX IF EXISTS idx_suppression_email_hash")
+            self._conn.executemany(self._INSERT_SUPPRESSION, rows)
+            self._conn.execute("CREATE INDEX idx_suppression_email_hash ON suppression (email_hash)")
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def is_suppressed(self, email: str) -> bool:
+        """
+        Indexed lookup of one address. Every row carries the hash of its
+        address, so plain and hash-only records are found the same way.
+        """
+        return self._conn.execute(
+            "SELECT 1 FROM suppression WHERE email_hash = ? LIMIT 1", (hash_email(email),)
+        ).fetchone() is not None
+
+    def suppressed_among(self, emails: Iterable[str]) -> Set[str]:
+        """
+        Returns the given addresses that are suppressed, a few hundred per query.
+        """
+        emails = iter(emails)
+        suppressed = set()
+        while True:
+            chunk = list(islice(emails, 400))
+            if not chunk:
+                return suppressed
+            by_hash = {hash_email(email): email for email in chunk}
+            placeholders = ",".join("?" * len(by_hash))
+            for (email_hash,) in self._conn.execute(
+                    f"SELECT email_hash FROM suppression WHERE email_hash IN ({placeholders})",
+                    list(by_hash)):
+                suppressed.add(by_hash[email_hash])
+
+    def suppression_version(self) -> str:
+        """
+        Cheap token that changes when another connection commits to the
+        database (PRAGMA data_version) or this one appends rows.
+        """
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        last_id = self._conn.execute("SELECT MAX(id) FROM suppression").fetchone()[0]
+        return f"{data_version}:{last_id}"
+
+    def count_suppressed(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM suppression").fetchone()[0]
+
+    # Consent log
+
+    _INSERT_CONSENT = ("INSERT INTO consent_log (email, email_key, source, consent_type, timestamp, ip_address) "
+                       "VALUES (?, ?, ?, ?, ?, ?)")
+
+    @staticmethod
+    def _consent_row(record: Dict) -> tuple:
+        email = record.get("email")
+        return (email, normalize_email(email), _text(record.get("source")),
+                _text(record.get("consent_type")), _text(record.get("timestamp")),
+                record.get("ip_address"))
+
+    def load_consent_log(self) -> List[Dict]:
+        return [
+            {"email": email, "source": source, "consent_type": consent_type,
+             "timestamp": timestamp, "ip_address": ip_address}
+            for email, source, consent_type, timestamp, ip_address in self._conn.execute(
+                "SELECT email, source, consent_type, timestamp, ip_address FROM consent_log ORDER BY id")
+        ]
+
+    def save_consent_log(self, data: List[Dict]):
+        self._write(self._INSERT_CONSENT, map(self._consent_row, data), replace_table="consent_log")
+
+    def append_consent(self, record: Dict):
+        self._write(self._INSERT_CONSENT, [self._consent_row(record)])
+
+    def redact_consent(self, emails: Iterable[str]) -> int:
+        """
+        Redacts the consent records of the given addresses through the
+        email_key index. Returns the number of records redacted.
+        """
+        keys = list(set(map(normalize_email, emails)))
+        redacted = 0
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            for start in range(0, len(keys), 400):
+                chunk = keys[start:start + 400]
+                placeholders = ",".join("?" * len(chunk))
+                redacted += self._conn.execute(
+                    "UPDATE consent_log SET email = 'REDACTED', email_key = NULL, ip_address = 'REDACTED' "
+                    f"WHERE email_key IN ({placeholders})", chunk).rowcount
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return redacted
+
+    def import_from(self, storage) -> Dict[str, int]:
+        """
+        Copies every record from another storage (e.g. JsonStorage) into this
+        database, replacing what is there. Returns the number of records copied.
+        """
+        suppression = storage.load_suppression_list()
+        consent = storage.load_consent_log()
+        self.save_suppression_list(suppression)
+        self.save_consent_log(consent)
+        return {"suppression": len(suppression), "consent": len(consent)}
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self) -> "SqliteStorage":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
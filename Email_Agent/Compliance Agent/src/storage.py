@@ -1,37 +1,387 @@
+import codecs
+import hashlib
 import json
 import os
-from typing import List, Dict
+import uuid
+from typing import List, Dict, Iterable, Iterator, Optional
+from .index import normalize_email
+from .locking import FileLock
 from .models import SuppressionRecord, ConsentRecord
 
+JOURNAL_VERSION = 1
+
+
+class ConcurrentModificationError(RuntimeError):
+    """
+    save_* found the log rewritten by another writer since it was loaded.
+    Load it again and reapply the change.
+    """
+
+
+class _LogState:
+    """
+    What one JsonStorage knows about a log: the lineage and length of the
+    record sequence it has seen, how far it has read the journal, and the
+    records other writers appended since its last load.
+    """
+
+    def __init__(self, lineage: Optional[str], count: int, stat_key, journal_size: int):
+        self.lineage = lineage
+        self.count = count
+        self.stat_key = stat_key
+        self.journal_size = journal_size
+        self.foreign: List[Dict] = []
+        self.rewritten = False
+
+
 class JsonStorage:
-    def __init__(self, data_dir: str = "data"):
+    """
+    Each log is a JSON snapshot (a list of records) plus an append-only
+    JSON Lines journal next to it (suppression.journal, consent_log.journal).
+
+    Appends only write one line to the journal, so single writes are O(1)
+    and a crash can at worst lose the line being written. Loading replays
+    snapshot + journal. Once a journal holds compact_after records it is
+    folded into a new snapshot (compaction); save_* also compacts.
+
+    The journal's first line names the SHA-256 of the snapshot it extends.
+    If compaction is interrupted after the new snapshot is in place, the
+    old journal no longer matches and is ignored, so no record is applied
+    twice.
+
+    Several processes may write to one data directory. Writers hold an
+    exclusive lock on <log>.lock (readers a shared one), files are replaced
+    by renaming a temp file unique to the writer, and before writing each
+    instance picks up what the others appended or compacted.
+
+    save_* is optimistic. The journal header also names a lineage, which
+    only changes when a log is rewritten (save_*, redaction). If others
+    only appended since this instance loaded the log, their records are
+    kept after the saved ones. If the log was rewritten meanwhile, save_*
+    raises ConcurrentModificationError rather than overwrite it.
+    """
+
+    def __init__(self, data_dir: str = "data", compact_after: int = 10000, fsync: bool = True,
+                 lock_timeout: float = 30.0):
         self.data_dir = data_dir
         self.suppression_file = os.path.join(data_dir, "suppression.json")
         self.consent_file = os.path.join(data_dir, "consent_log.json")
+        self.compact_after = compact_after
+        self.fsync = fsync
+        self.lock_timeout = lock_timeout
+        self._journal_counts = {}
+        self._states: Dict[str, _LogState] = {}
+        self._locks: Dict[str, FileLock] = {}
         self._ensure_files()
 
     def _ensure_files(self):
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
-        if not os.path.exists(self.suppression_file):
-            with open(self.suppression_file, 'w') as f:
-                json.dump([], f)
-        if not os.path.exists(self.consent_file):
-            with open(self.consent_file, 'w') as f:
-                json.dump([], f)
+        os.makedirs(self.data_dir, exist_ok=True)
+        for snapshot_file in (self.suppression_file, self.consent_file):
+            if not os.path.exists(snapshot_file):
+                with self._lock(snapshot_file):
+                    if not os.path.exists(snapshot_file):
+                        self._write_snapshot(snapshot_file, [])
+
+    def _lock(self, snapshot_file: str, shared: bool = False):
+        lock = self._locks.get(snapshot_file)
+        if lock is None:
+            lock = self._locks[snapshot_file] = FileLock(f"{snapshot_file}.lock", timeout=self.lock_timeout)
+        return lock.acquire(shared=shared)
+
+    @staticmethod
+    def journal_path(snapshot_file: str) -> str:
+        return os.path.splitext(snapshot_file)[0] + ".journal"
+
+    def _stat_key(self, snapshot_file: str):
+        # Changes when the snapshot or the journal is replaced (compaction, save_*)
+        try:
+            snapshot = os.stat(snapshot_file)
+            journal = os.stat(self.journal_path(snapshot_file))
+        except FileNotFoundError:
+            return None
+        return (snapshot.st_ino, snapshot.st_size, snapshot.st_mtime_ns, journal.st_ino)
+
+    def _sync(self, f):
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    def _replace(self, path: str, data: bytes):
+        # Temp name unique to this writer, so concurrent writers never share one
+        tmp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                self._sync(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _write_snapshot(self, snapshot_file: str, data: List[Dict], lineage: Optional[str] = None):
+        """
+        Atomically replaces the snapshot and starts an empty journal on top of it.
+        Rewrites get a new lineage; compaction passes the current one on.
+        Call with the log's lock held.
+        """
+        lineage = lineage or uuid.uuid4().hex
+        snapshot = json.dumps(data, indent=2, default=str).encode('utf-8')
+        self._replace(snapshot_file, snapshot)
+        header = {"journal": JOURNAL_VERSION, "base": hashlib.sha256(snapshot).hexdigest(), "lineage": lineage}
+        header_line = (json.dumps(header) + "\n").encode('utf-8')
+        self._replace(self.journal_path(snapshot_file), header_line)
+        self._journal_counts[snapshot_file] = 0
+        self._states[snapshot_file] = _LogState(lineage, len(data), self._stat_key(snapshot_file),
+                                                len(header_line))
+
+    def _load(self, snapshot_file: str) -> List[Dict]:
+        """
+        Reads snapshot + journal and resets what this instance knows about
+        the log. Call with the log's lock held (a shared one is enough).
+        """
+        stat_key = self._stat_key(snapshot_file)
+        with open(snapshot_file, 'rb') as f:
+            snapshot = f.read()
+        records = json.loads(snapshot)
+        journal_file = self.journal_path(snapshot_file)
+        # None: no journal that extends this snapshot, the next append starts one
+        self._journal_counts[snapshot_file] = None
+        self._states[snapshot_file] = _LogState(None, len(records), stat_key, 0)
+        if not os.path.exists(journal_file):
+            return records
+
+        with open(journal_file, 'rb') as f:
+            header_line = f.readline()
+            header = json.loads(header_line) if header_line.endswith(b"\n") else {}
+            if header.get("base") != hashlib.sha256(snapshot).hexdigest():
+                return records
+            replayed = self._read_journal(f, records)
+            journal_size = f.tell()
+        self._journal_counts[snapshot_file] = replayed
+        # Journals from before lineages existed: the snapshot stands in for one
+        self._states[snapshot_file] = _LogState(header.get("lineage") or header["base"], len(records),
+                                                stat_key, journal_size)
+        return records
+
+    @staticmethod
+    def _read_journal(f, records: List[Dict]) -> int:
+        replayed = 0
+        for line in f:
+            # A line without its newline (or that doesn't parse) is a write cut short by a crash
+            if not line.endswith(b"\n") or not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+            replayed += 1
+        return replayed
+
+    def _catch_up(self, snapshot_file: str) -> _LogState:
+        """
+        Picks up what other writers did since this instance last touched the
+        log. Call with the exclusive lock held.
+        """
+        state = self._states.get(snapshot_file)
+        if state is not None and state.lineage is not None and state.stat_key == self._stat_key(snapshot_file):
+            # Same snapshot and journal: read only the lines appended since
+            appended = []
+            with open(self.journal_path(snapshot_file), 'rb') as f:
+                f.seek(state.journal_size)
+                count = self._read_journal(f, appended)
+                state.journal_size = f.tell()
+            state.foreign.extend(appended)
+            state.count += count
+            self._journal_counts[snapshot_file] += count
+            return state
+
+        # Snapshot or journal replaced (or never read): read the log again
+        previous = state
+        records = self._load(snapshot_file)
+        state = self._states[snapshot_file]
+        if previous is not None and previous.lineage is not None:
+            if state.lineage == previous.lineage and len(records) >= previous.count:
+                # Compacted by another writer: the same sequence, possibly longer
+                state.foreign = previous.foreign + records[previous.count:]
+            else:
+                state.foreign = previous.foreign
+                state.rewritten = True
+        return state
+
+    def _append(self, snapshot_file: str, records: Iterable[Dict]):
+        lines = [json.dumps(record, default=str) + "\n" for record in records]
+        count = len(lines)
+        with self._lock(snapshot_file):
+            state = self._catch_up(snapshot_file)
+            if self._journal_counts.get(snapshot_file) is None:
+                # No valid journal yet (e.g. data written by an older version): start one
+                self._write_snapshot(snapshot_file, self._load(snapshot_file), lineage=state.lineage)
+                state = self._states[snapshot_file]
+
+            with open(self.journal_path(snapshot_file), 'a+b') as f:
+                end = f.seek(0, os.SEEK_END)
+                if end:
+                    f.seek(end - 1)
+                    if f.read(1) != b"\n":
+                        # Terminate a line torn by an earlier crash so it stays a single bad line
+                        lines.insert(0, "\n")
+                f.write("".join(lines).encode('utf-8'))
+                self._sync(f)
+                state.journal_size = f.tell()
+            state.count += count
+            self._journal_counts[snapshot_file] += count
+            if self._journal_counts[snapshot_file] >= self.compact_after:
+                self.compact(snapshot_file)
+
+    def _save(self, snapshot_file: str, data: List[Dict]):
+        with self._lock(snapshot_file):
+            state = self._catch_up(snapshot_file)
+            if state.rewritten:
+                raise ConcurrentModificationError(
+                    f"{snapshot_file} was rewritten by another writer since it was loaded")
+            self._write_snapshot(snapshot_file, list(data) + state.foreign)
+
+    def _read(self, snapshot_file: str) -> List[Dict]:
+        with self._lock(snapshot_file, shared=True):
+            return self._load(snapshot_file)
+
+    def compact(self, snapshot_file: str):
+        """
+        Folds the journal into a new snapshot.
+        """
+        with self._lock(snapshot_file):
+            state = self._catch_up(snapshot_file)
+            self._write_snapshot(snapshot_file, self._load(snapshot_file), lineage=state.lineage)
+            # Same sequence as before: a later save_* still needs to merge or refuse
+            self._states[snapshot_file].foreign = state.foreign
+            self._states[snapshot_file].rewritten = state.rewritten
 
     def load_suppression_list(self) -> List[Dict]:
-        with open(self.suppression_file, 'r') as f:
-            return json.load(f)
+        return self._read(self.suppression_file)
+
+    def iter_suppression_list(self, chunk_size: int = 1 << 20) -> Iterator[Dict]:
+        """
+        Streams the suppression records (snapshot, then journal) with only
+        about chunk_size bytes in memory. The files are opened under the
+        lock and read after it is released; writers replace them by
+        renaming, so the open handles keep the state as of the call.
+        """
+        journal_file = self.journal_path(self.suppression_file)
+        with self._lock(self.suppression_file, shared=True):
+            snapshot = open(self.suppression_file, 'rb')
+            try:
+                journal = open(journal_file, 'rb')
+                journal_size = os.fstat(journal.fileno()).st_size
+            except FileNotFoundError:
+                journal, journal_size = None, 0
+        try:
+            digest = hashlib.sha256()
+            yield from self._iter_snapshot(snapshot, digest, chunk_size)
+            if journal is None:
+                return
+            header_line = journal.readline()
+            header = json.loads(header_line) if header_line.endswith(b"\n") else {}
+            if header.get("base") != digest.hexdigest():
+                return
+            while journal.tell() < journal_size:
+                line = journal.readline(journal_size - journal.tell())
+                if not line.endswith(b"\n") or not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+        finally:
+            snapshot.close()
+            if journal is not None:
+                journal.close()
+
+    @staticmethod
+    def _iter_snapshot(f, digest, chunk_size: int) -> Iterator[Dict]:
+        """
+        Incrementally parses a snapshot (a JSON list of objects), feeding
+        every byte read into digest.
+        """
+        decoder = json.JSONDecoder()
+        text = codecs.getincrementaldecoder('utf-8')()
+        buffer, position, started, eof = "", 0, False, False
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer):
+                if not started:
+                    if buffer[position] != "[":
+                        raise ValueError(f"{f.name} is not a JSON list")
+                    started, position = True, position + 1
+                    continue
+                if buffer[position] == "]":
+                    return
+                try:
+                    record, position = decoder.raw_decode(buffer, position)
+                except ValueError:
+                    if eof:
+                        raise
+                else:
+                    yield record
+                    continue
+            elif eof:
+                raise ValueError(f"{f.name} ends before its list does")
+            # Need more input: drop what has been parsed and read the next chunk
+            buffer, position = buffer[position:], 0
+            chunk = f.read(chunk_size)
+            digest.update(chunk)
+            eof = not chunk
+            buffer += text.decode(chunk, final=eof)
 
     def save_suppression_list(self, data: List[Dict]):
-        with open(self.suppression_file, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        self._save(self.suppression_file, data)
+
+    def append_suppression(self, record: Dict):
+        self._append(self.suppression_file, [record])
+
+    def suppression_version(self) -> str:
+        """
+        Cheap token that changes whenever the suppression list is written (by any process).
+        """
+        parts = []
+        for path in (self.suppression_file, self.journal_path(self.suppression_file)):
+            try:
+                stat = os.stat(path)
+                parts.append(f"{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}")
+            except FileNotFoundError:
+                parts.append("-")
+        return "/".join(parts)
+
+    def append_suppressions(self, records: Iterable[Dict]):
+        """
+        Appends many records with a single write and fsync.
+        """
+        self._append(self.suppression_file, records)
 
     def load_consent_log(self) -> List[Dict]:
-        with open(self.consent_file, 'r') as f:
-            return json.load(f)
+        return self._read(self.consent_file)
 
     def save_consent_log(self, data: List[Dict]):
-        with open(self.consent_file, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        self._save(self.consent_file, data)
+
+    def append_consent(self, record: Dict):
+        self._append(self.consent_file, [record])
+
+    def redact_consent(self, emails: Iterable[str]) -> int:
+        """
+        Redacts the consent records of the given addresses. The snapshot
+        has to be rewritten to drop the PII, so pass a whole batch at once.
+        """
+        keys = set(map(normalize_email, emails))
+        with self._lock(self.consent_file):
+            records = self._load(self.consent_file)
+            redacted = 0
+            for record in records:
+                if record.get("email") != "REDACTED" and normalize_email(record.get("email")) in keys:
+                    record["email"] = "REDACTED"
+                    record["ip_address"] = "REDACTED"
+                    redacted += 1
+            if redacted:
+                self._write_snapshot(self.consent_file, records)
+        return redacted
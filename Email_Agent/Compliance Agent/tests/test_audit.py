@@ -0,0 +1,142 @@
+import gc
+import json
+import multiprocessing
+import weakref
+from datetime import datetime, timedelta
+
+import pytest
+from src.audit import GENESIS, AuditTrail, entry_hash
+from src.index import hash_email
+from src.manager import ComplianceManager
+from src.models import SuppressionReason
+from src.sqlite_storage import SqliteStorage
+from src.storage import JsonStorage
+
+@pytest.fixture
+def trail(tmp_path):
+    trail = AuditTrail(str(tmp_path / "audit.log"), flush_interval=0.01)
+    yield trail
+    trail.close()
+
+def test_entries_are_hash_chained(trail):
+    for i in range(250):
+        trail.record("suppress", "system", f"user{i}@example.com", "Reason: bounced")
+    trail.flush()
+
+    entries = list(trail.entries())
+    assert [e["seq"] for e in entries] == list(range(1, 251))
+    assert entries[0]["prev"] == GENESIS
+    assert all(b["prev"] == a["hash"] for a, b in zip(entries, entries[1:]))
+    assert trail.verify() == {"entries": 250, "valid": True, "broken_at": None}
+
+def test_verify_detects_tampering(trail):
+    for i in range(5):
+        trail.record("consent_grant", "system", f"user{i}@example.com", "Source: Web Form")
+    trail.flush()
+    with open(trail.path) as f:
+        lines = f.readlines()
+    edited = json.loads(lines[2])
+    edited["details"] = "Source: forged"
+    lines[2] = json.dumps(edited) + "\n"
+    with open(trail.path, "w") as f:
+        f.writelines(lines)
+    assert trail.verify() == {"entries": 3, "valid": False, "broken_at": 3}
+
+    with open(trail.path, "w") as f:
+        f.writelines(lines[:2] + lines[3:])
+    assert trail.verify()["broken_at"] == 4
+
+def test_query_by_target_and_time_range(trail):
+    start = datetime(2025, 1, 1)
+    for i in range(100):
+        target = "alice@example.com" if i % 10 == 0 else f"user{i}@example.com"
+        trail.record("suppress", "system", target, str(i), timestamp=start + timedelta(minutes=i))
+
+    alice = trail.query(target="Alice@Example.com")
+    assert [e["details"] for e in alice] == [str(i) for i in range(0, 100, 10)]
+    window = trail.query(start=start + timedelta(minutes=20), end=start + timedelta(minutes=25))
+    assert [e["details"] for e in window] == ["20", "21", "22", "23", "24"]
+    assert [e["details"] for e in trail.query(target="alice@example.com", start=start + timedelta(minutes=50),
+                                              limit=2)] == ["50", "60"]
+    assert trail.query(target="nobody@example.com") == []
+
+def test_chain_continues_after_reopen_and_torn_tail(tmp_path):
+    path = str(tmp_path / "audit.log")
+    with AuditTrail(path) as trail:
+        trail.record("suppress", "system", "a@example.com", "")
+    with open(path, "a") as f:
+        f.write('{"seq": 2, "timestamp": "2025')  # crash mid-write
+    with AuditTrail(path) as trail:
+        trail.record("suppress", "system", "b@example.com", "")
+        trail.flush()
+        assert trail.verify() == {"entries": 2, "valid": True, "broken_at": None}
+        assert [e["seq"] for e in trail.query(target="b@example.com")] == [2]
+
+def _write_entries(path, worker, count):
+    with AuditTrail(path, batch_size=7, flush_interval=0.001) as trail:
+        for i in range(count):
+            trail.record("suppress", f"worker{worker}", f"w{worker}-{i}@example.com", "")
+
+def test_processes_share_one_chain(tmp_path):
+    path = str(tmp_path / "audit.log")
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_write_entries, args=(path, w, 200)) for w in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+    with AuditTrail(path) as trail:
+        assert trail.verify() == {"entries": 800, "valid": True, "broken_at": None}
+        # Lines written by the other processes are indexed on query
+        assert len(trail.query(target="w3-199@example.com")) == 1
+
+def test_manager_writes_to_audit_trail(tmp_path):
+    manager = ComplianceManager(storage=JsonStorage(data_dir=str(tmp_path / "data")))
+    assert manager.audit.path == str(tmp_path / "data" / "audit.log")
+    manager.log_consent("lead@example.com", "Web Form")
+    manager.add_to_suppression_list("lead@example.com", SuppressionReason.UNSUBSCRIBED)
+    manager.close()
+
+    trail = AuditTrail(manager.audit.path)
+    assert [e["action"] for e in trail.query(target="lead@example.com")] == ["consent_grant", "suppress"]
+    assert trail.verify()["valid"]
+
+def test_targets_are_stored_hashed(tmp_path):
+    path = str(tmp_path / "audit.log")
+    with AuditTrail(path) as trail:
+        trail.record("suppress", "system", "Secret.Person@Example.com", "")
+        assert [e["target_hash"] for e in trail.query(target="secret.person@example.com")] == \
+            [hash_email("secret.person@example.com")]
+    with open(path) as f:
+        assert "secret.person" not in f.read().lower()
+
+def test_old_entries_with_plain_targets_are_indexed(tmp_path):
+    path = str(tmp_path / "audit.log")
+    entry = {"seq": 1, "timestamp": "2025-01-01T00:00:00", "action": "suppress", "actor": "system",
+             "target_email": "old@example.com", "details": "", "prev": GENESIS}
+    entry["hash"] = entry_hash(entry)
+    with open(path, "w") as f:
+        f.write(json.dumps(entry) + "\n")
+    with AuditTrail(path) as trail:
+        assert [e["seq"] for e in trail.query(target="old@example.com")] == [1]
+
+def test_unclosed_trail_is_collected_and_flushed(tmp_path):
+    path = str(tmp_path / "audit.log")
+    trail = AuditTrail(path)
+    trail.record("suppress", "system", "a@example.com", "")
+    collected = weakref.ref(trail)
+    del trail
+    gc.collect()
+    assert collected() is None
+    with AuditTrail(path) as trail:
+        assert trail.verify() == {"entries": 1, "valid": True, "broken_at": None}
+
+def test_bare_db_path_keeps_audit_log_beside_it(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = ComplianceManager(storage=SqliteStorage("compliance.db"))
+    try:
+        assert manager.audit.path == str(tmp_path / "audit.log")
+    finally:
+        manager.close()
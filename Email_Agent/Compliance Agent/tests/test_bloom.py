@@ -0,0 +1,73 @@
+import os
+import pytest
+from src.bloom import BloomFilter, MappedBloomFilter, HEADER, optimal_parameters
+from src.index import hash_email
+from src.manager import ComplianceManager
+from src.models import SuppressionReason
+from src.storage import JsonStorage
+
+@pytest.fixture
+def test_storage(tmp_path):
+    return JsonStorage(data_dir=str(tmp_path / "data"))
+
+def build(count, fp_rate):
+    bloom = BloomFilter(count, fp_rate)
+    for i in range(count):
+        bloom.add(f"member{i}@example.com")
+    return bloom
+
+@pytest.mark.parametrize("fp_rate", [0.01, 0.001])
+def test_measured_false_positive_rate(fp_rate):
+    bloom = build(20000, fp_rate)
+
+    assert all(f"member{i}@example.com" in bloom for i in range(20000))
+    probes = 100000
+    false_positives = sum(f"outsider{i}@example.org" in bloom for i in range(probes))
+    # Allow for sampling noise around the configured rate
+    assert false_positives / probes < fp_rate * 1.5
+
+def test_saved_filter_is_mapped_and_queried(tmp_path):
+    path = str(tmp_path / "suppression.bloom")
+    bloom = build(1000, 0.01)
+    bloom.save(path, epoch=42)
+
+    with MappedBloomFilter(path) as mapped:
+        assert mapped.epoch == 42
+        assert mapped.count == 1000
+        assert (mapped.bits, mapped.hashes) == (bloom.bits, bloom.hashes)
+        assert "Member7@Example.com " in mapped
+        assert all((f"other{i}@example.org" in mapped) == (f"other{i}@example.org" in bloom)
+                   for i in range(2000))
+    assert not os.path.exists(path + ".tmp")
+
+def test_rejects_foreign_and_truncated_files(tmp_path):
+    path = tmp_path / "bad.bloom"
+    path.write_bytes(b"x" * 100)
+    with pytest.raises(ValueError):
+        MappedBloomFilter(str(path))
+
+    good = tmp_path / "good.bloom"
+    build(1000, 0.01).save(str(good))
+    path.write_bytes(good.read_bytes()[:HEADER.size + 10])
+    with pytest.raises(ValueError):
+        MappedBloomFilter(str(path))
+
+def test_optimal_parameters():
+    bits, hashes = optimal_parameters(1000000, 0.001)
+    assert 14000000 < bits < 15000000
+    assert hashes == 10
+    with pytest.raises(ValueError):
+        optimal_parameters(10, 0)
+
+def test_manager_publishes_hashed_and_plain_records(test_storage, tmp_path):
+    manager = ComplianceManager(storage=test_storage)
+    manager.add_to_suppression_list("unsub@example.com", SuppressionReason.UNSUBSCRIBED)
+    manager.suppression_list.append({"email_hash": hash_email("gone@example.com"), "reason": "dsar_deletion"})
+    path = str(tmp_path / "suppression.bloom")
+
+    manager.publish_bloom_filter(path, fp_rate=0.001)
+
+    with MappedBloomFilter(path) as mapped:
+        assert "UNSUB@example.com" in mapped
+        assert "gone@example.com" in mapped
+        assert mapped.count == 2
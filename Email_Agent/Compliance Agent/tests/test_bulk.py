@@ -0,0 +1,112 @@
+import io
+import json
+import sys
+
+import pytest
+from src.bulk import export_file, import_file, main as bulk_main, parse_reason, read_rows, write_rows
+from src.manager import ComplianceManager
+from src.models import SuppressionReason
+from src.sqlite_storage import SqliteStorage
+from src.storage import JsonStorage
+
+@pytest.fixture(params=["json", "sqlite"])
+def storage(request, tmp_path):
+    if request.param == "json":
+        return JsonStorage(data_dir=str(tmp_path / "data"))
+    return SqliteStorage(str(tmp_path / "data" / "compliance.db"))
+
+def test_import_normalizes_and_dedupes(storage):
+    manager = ComplianceManager(storage=storage)
+    manager.add_to_suppression_list("old@example.com", SuppressionReason.UNSUBSCRIBED)
+    rows = [
+        {"email": " New@Example.com ", "reason": "Hard Bounce"},
+        {"email": "new@example.com", "reason": "complaint"},
+        {"email": "OLD@example.com"},
+        {"email": "not-an-address"},
+        {"email": "spam@example.com", "reason": "spamreport", "timestamp": "2025-01-01T00:00:00"},
+    ]
+
+    counts = manager.import_suppressions(rows)
+
+    assert counts == {"read": 5, "imported": 2, "duplicates": 2, "invalid": 1}
+    stored = storage.load_suppression_list()
+    assert [r["email"] for r in stored] == ["old@example.com", "new@example.com", "spam@example.com"]
+    assert stored[1]["reason"] == "bounced"
+    assert stored[2]["reason"] == "spam_complaint"
+    assert stored[2]["timestamp"] == "2025-01-01T00:00:00"
+    assert manager.check_eligibility("NEW@example.com") is False
+    assert ComplianceManager(storage=storage).check_eligibility("spam@example.com") is False
+
+def test_import_is_one_storage_write(tmp_path, monkeypatch):
+    storage = JsonStorage(data_dir=str(tmp_path / "data"))
+    calls = []
+    original = storage.append_suppressions
+    monkeypatch.setattr(storage, "append_suppressions", lambda records: calls.append(1) or original(records))
+    manager = ComplianceManager(storage=storage)
+    manager.import_suppressions({"email": f"user{i}@example.com"} for i in range(5000))
+    assert calls == [1]
+    assert len(storage.load_suppression_list()) == 5000
+
+def test_failed_import_leaves_index_unchanged(tmp_path, monkeypatch):
+    storage = JsonStorage(data_dir=str(tmp_path / "data"))
+    manager = ComplianceManager(storage=storage)
+
+    def fail(records):
+        raise OSError("disk full")
+    monkeypatch.setattr(storage, "append_suppressions", fail)
+    with pytest.raises(OSError):
+        manager.import_suppressions([{"email": "a@example.com"}])
+    assert manager.check_eligibility("a@example.com") is True
+    assert manager.suppression_list == []
+
+def test_json_export_streams(tmp_path, monkeypatch):
+    storage = JsonStorage(data_dir=str(tmp_path / "data"), compact_after=300)
+    ComplianceManager(storage=storage).import_suppressions({"email": f"user{i}@example.com"} for i in range(500))
+    storage.append_suppression({"email": "late@example.com", "reason": "bounced"})
+    monkeypatch.setattr(storage, "_load", lambda *args: pytest.fail("export loaded the whole list"))
+    records = storage.iter_suppression_list(chunk_size=64)
+    assert next(records)["email"] == "user0@example.com"
+    assert [r["email"] for r in records][-2:] == ["user499@example.com", "late@example.com"]
+
+def test_parse_reason_defaults():
+    assert parse_reason("", SuppressionReason.BOUNCED) == SuppressionReason.BOUNCED
+    assert parse_reason("mystery", SuppressionReason.MANUAL_BLOCK) == SuppressionReason.MANUAL_BLOCK
+    assert parse_reason("unsubscribe", SuppressionReason.MANUAL_BLOCK) == SuppressionReason.UNSUBSCRIBED
+
+def test_read_rows_csv_and_jsonl():
+    csv_rows = list(read_rows(io.StringIO("Email,Reason\na@example.com,bounce\n"), "csv"))
+    assert csv_rows == [{"email": "a@example.com", "reason": "bounce"}]
+    jsonl = '{"email": "b@example.com"}\n\nnot json\n{"email": "c@example.com"}\n'
+    assert [r["email"] for r in read_rows(io.StringIO(jsonl), "jsonl")] == ["b@example.com", "c@example.com"]
+    with pytest.raises(ValueError):
+        list(read_rows(io.StringIO(""), "xml"))
+
+def test_file_roundtrip(storage, tmp_path):
+    source = tmp_path / "bounces.csv"
+    source.write_text("email,reason\n" + "".join(f"user{i}@example.com,bounce\n" for i in range(100)))
+    counts = import_file(ComplianceManager(storage=storage), str(source))
+    assert counts["imported"] == 100
+
+    storage.append_suppression({"email_hash": "ab" * 32, "reason": "dsar_deletion"})
+    assert export_file(storage, str(tmp_path / "out.jsonl")) == 101
+    with open(tmp_path / "out.jsonl") as f:
+        exported = [json.loads(line) for line in f]
+    assert exported[0]["email"] == "user0@example.com"
+    assert exported[-1]["email_hash"] == "ab" * 32
+    assert "email" not in exported[-1]
+
+    out = io.StringIO()
+    assert write_rows(storage.iter_suppression_list(), out, "csv") == 101
+    assert out.getvalue().splitlines()[1].startswith("user0@example.com,,bounced,")
+
+def test_cli_import_and_export(tmp_path, monkeypatch, capsys):
+    source = tmp_path / "complaints.jsonl"
+    source.write_text('{"email": "a@example.com"}\n{"email": "a@example.com"}\n')
+    db = str(tmp_path / "compliance.db")
+    monkeypatch.setattr(sys, "argv", ["bulk", "--db", db, "import", str(source), "--reason", "spam_complaint"])
+    bulk_main()
+    assert "Imported 1 of 2 rows (1 duplicates, 0 invalid)" in capsys.readouterr().out
+
+    monkeypatch.setattr(sys, "argv", ["bulk", "--db", db, "export", "-"])
+    bulk_main()
+    assert json.loads(capsys.readouterr().out.strip())["reason"] == "spam_complaint"
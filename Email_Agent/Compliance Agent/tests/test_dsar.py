@@ -0,0 +1,233 @@
+import gzip
+import json
+import os
+import sqlite3
+
+import pytest
+from src.dsar import DsarEngine, FileStore, JsonLinesStore, JsonListStore, LocationIndex, SqliteTableStore
+from src.index import hash_email
+from src.manager import ComplianceManager
+from src.sqlite_storage import SqliteStorage
+from src.storage import JsonStorage
+
+@pytest.fixture
+def stores(tmp_path):
+    leads_path = tmp_path / "ready_leads.json"
+    leads_path.write_text(json.dumps([
+        {"email": "alice@example.com", "company": "A"},
+        {"email": "bob@example.com", "company": "B"},
+        {"email": "Carol@Example.com", "company": "C"},
+    ], indent=2))
+
+    log_path = tmp_path / "send_log.jsonl"
+    with open(log_path, "w", encoding="utf-8") as f:
+        for recipient in ["alice@example.com", "bob@example.com", "alice@example.com"]:
+            f.write(json.dumps({"recipient": recipient, "subject": "Hi", "status": "sent"}) + "\n")
+
+    events_path = tmp_path / "analytics.db"
+    conn = sqlite3.connect(events_path)
+    conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, event_type TEXT, campaign_id TEXT, lead_id TEXT)")
+    conn.executemany("INSERT INTO events (event_type, campaign_id, lead_id) VALUES (?, ?, ?)",
+                     [("sent", "c1", "alice@example.com"), ("open", "c1", "alice@example.com"),
+                      ("sent", "c1", "bob@example.com")])
+    conn.commit()
+    conn.close()
+
+    quote_path = tmp_path / "quote_alice.pdf"
+    quote_path.write_bytes(b"%PDF-1.3")
+    manifest_path = tmp_path / "quote_manifest.jsonl"
+    manifest_path.write_text(json.dumps({"email": "alice@example.com", "path": str(quote_path)}) + "\n")
+
+    return {
+        "leads": str(leads_path), "log": str(log_path), "events": str(events_path),
+        "quote": str(quote_path), "manifest": str(manifest_path),
+    }
+
+@pytest.fixture
+def manager(tmp_path, stores):
+    engine = DsarEngine(LocationIndex(str(tmp_path / "data" / "dsar_index.db")), [
+        JsonListStore("leadgen", stores["leads"]),
+        JsonLinesStore("outreach", stores["log"]),
+        SqliteTableStore("analytics", stores["events"]),
+        FileStore("closer", stores["manifest"]),
+    ])
+    manager = ComplianceManager(storage=JsonStorage(data_dir=str(tmp_path / "data")), dsar=engine)
+    yield manager
+    manager.close()
+
+def leads(path):
+    with open(path) as f:
+        return [lead.get("email") for lead in json.load(f)]
+
+def test_dsar_batch_erases_subject_from_every_store(manager, stores):
+    manager.log_consent("alice@example.com", "Web Form")
+    manager.log_consent("bob@example.com", "Web Form")
+
+    result = manager.process_dsar_batch(["Alice@Example.com"])
+
+    assert result["erased"] == {"leadgen": 1, "outreach": 2, "analytics": 2, "closer": 1}
+    assert result["consent_redacted"] == 1
+    assert leads(stores["leads"]) == [None, "bob@example.com", "Carol@Example.com"]
+    with open(stores["leads"]) as f:
+        assert json.load(f)[0] == {"redacted": True}
+    with open(stores["log"]) as f:
+        lines = [json.loads(line) for line in f]
+    assert [line.get("recipient") for line in lines] == [None, "bob@example.com", None]
+    assert lines[0] == {"redacted": True}
+    conn = sqlite3.connect(stores["events"])
+    assert conn.execute("SELECT lead_id FROM events").fetchall() == [("bob@example.com",)]
+    conn.close()
+    assert not os.path.exists(stores["quote"])
+    with open(stores["manifest"]) as f:
+        assert json.loads(f.read()) == {"redacted": True}
+
+    consent = manager.storage.load_consent_log()
+    assert [r["email"] for r in consent] == ["REDACTED", "bob@example.com"]
+    assert manager.check_eligibility("alice@example.com") is False
+    assert manager.dsar.index.lookup([hash_email("alice@example.com")]) == {}
+
+def test_process_dsar_delete_goes_through_engine(manager, stores):
+    manager.process_dsar_delete("bob@example.com")
+    assert leads(stores["leads"]) == ["alice@example.com", None, "Carol@Example.com"]
+    assert manager.check_eligibility("bob@example.com") is False
+
+def test_in_place_redaction_keeps_offsets(manager, stores):
+    size = os.path.getsize(stores["log"])
+    manager.process_dsar_batch(["alice@example.com"])
+    assert os.path.getsize(stores["log"]) == size
+
+    # Lines appended later are indexed from the stored offset and still erasable
+    with open(stores["log"], "a", encoding="utf-8") as f:
+        f.write(json.dumps({"recipient": "bob@example.com", "status": "sent"}) + "\n")
+    assert manager.dsar.sync()["outreach"] == 1
+    assert manager.process_dsar_batch(["bob@example.com"])["erased"]["outreach"] == 2
+
+def test_batch_touches_only_stores_holding_subjects(manager, stores):
+    manager.dsar.sync()
+    before = os.stat(stores["leads"]).st_mtime_ns
+    assert manager.process_dsar_batch(["carol@example.com", "nobody@example.com"])["erased"] == {"leadgen": 1}
+    assert os.stat(stores["leads"]).st_mtime_ns != before
+
+    before = os.stat(stores["leads"]).st_mtime_ns
+    assert manager.process_dsar_batch(["nobody2@example.com"])["erased"] == {}
+    assert os.stat(stores["leads"]).st_mtime_ns == before
+
+def test_json_list_is_not_reindexed_after_erasure(manager, stores, monkeypatch):
+    manager.dsar.sync()
+    size = os.path.getsize(stores["leads"])
+    manager.process_dsar_batch(["carol@example.com"])
+    assert os.path.getsize(stores["leads"]) == size
+
+    # Later requests only look up the index; the file isn't parsed again
+    def fail(*args):
+        raise AssertionError("ready_leads.json was reindexed")
+    monkeypatch.setattr(JsonListStore, "_spans", fail)
+    assert manager.dsar.sync()["leadgen"] == 0
+    assert manager.process_dsar_batch(["alice@example.com"])["erased"]["leadgen"] == 1
+    assert leads(stores["leads"]) == [None, "bob@example.com", None]
+
+def test_rewritten_json_file_is_indexed_again(manager, stores):
+    manager.dsar.sync()
+    with open(stores["leads"], "w") as f:
+        json.dump([{"email": "dave@example.com", "note": "caf\u00e9"}, {"email": "alice@example.com"}],
+                  f, ensure_ascii=False)
+    assert manager.process_dsar_batch(["alice@example.com"])["erased"]["leadgen"] == 1
+    with open(stores["leads"], encoding="utf-8") as f:
+        assert json.load(f) == [{"email": "dave@example.com", "note": "caf\u00e9"}, {"redacted": True}]
+
+def test_per_run_logs_are_matched_by_pattern(tmp_path):
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    for run, recipient in [("outreach_20260101_090000", "alice@example.com"),
+                           ("outreach_20260102_090000", "alice@example.com"),
+                           ("other", "alice@example.com")]:
+        (logs / f"{run}.jsonl").write_text(json.dumps({"recipient": recipient}) + "\n")
+
+    with LocationIndex(str(tmp_path / "index.db")) as index:
+        engine = DsarEngine(index, [JsonLinesStore("outreach", str(logs / "outreach_*.jsonl"))])
+        assert engine.erase(["alice@example.com"]) == {"outreach": 2}
+    assert json.loads((logs / "other.jsonl").read_text()) == {"recipient": "alice@example.com"}
+
+def test_rotated_segments_are_erased(manager, stores):
+    engine = manager.dsar
+    engine.sync()
+    # SendLog rotation: the active file becomes .1, an older segment is compressed
+    os.replace(stores["log"], f"{stores['log']}.2")
+    with gzip.open(f"{stores['log']}.1.gz", "wt", encoding="utf-8") as f:
+        for recipient in ["alice@example.com", "carol@example.com"]:
+            f.write(json.dumps({"recipient": recipient, "status": "sent"}) + "\n")
+    with open(stores["log"], "w", encoding="utf-8") as f:
+        f.write(json.dumps({"recipient": "alice@example.com", "status": "sent"}) + "\n")
+
+    assert engine.sync()["outreach"] == 6
+    assert engine.sync()["outreach"] == 0
+
+    assert engine.erase(["alice@example.com"])["outreach"] == 4
+    with gzip.open(f"{stores['log']}.1.gz", "rt", encoding="utf-8") as f:
+        assert [json.loads(line).get("recipient") for line in f] == [None, "carol@example.com"]
+    with open(f"{stores['log']}.2") as f:
+        assert [json.loads(line).get("recipient") for line in f] == [None, "bob@example.com", None]
+    with open(stores["log"]) as f:
+        assert json.loads(f.read()) == {"redacted": True}
+
+    # The rewritten segment isn't indexed again, and its offsets still hold
+    assert engine.sync()["outreach"] == 0
+    assert engine.erase(["carol@example.com"])["outreach"] == 1
+
+def test_files_registered_by_record_are_deleted(manager, tmp_path):
+    other = tmp_path / "contract_bob.pdf"
+    other.write_bytes(b"%PDF-1.3")
+    manager.dsar.record("bob@example.com", "closer", str(other))
+    assert manager.process_dsar_batch(["bob@example.com"])["erased"]["closer"] == 1
+    assert not other.exists()
+
+def test_large_batch_in_one_pass(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "compliance.db"))
+    log_path = tmp_path / "send_log.jsonl"
+    with open(log_path, "w", encoding="utf-8") as f:
+        for i in range(5000):
+            f.write(json.dumps({"recipient": f"user{i}@example.com", "status": "sent"}) + "\n")
+    engine = DsarEngine(LocationIndex(str(tmp_path / "index.db")), [JsonLinesStore("outreach", str(log_path))])
+    manager = ComplianceManager(storage=storage, dsar=engine)
+    for i in range(0, 5000, 2):
+        manager.log_consent(f"user{i}@example.com", "Import")
+
+    try:
+        result = manager.process_dsar_batch(f"user{i}@example.com" for i in range(2000))
+    finally:
+        manager.close()
+
+    assert result == {"erased": {"outreach": 2000}, "consent_redacted": 1000, "suppressed": 2000}
+    consent = storage.load_consent_log()
+    assert sum(r["email"] == "REDACTED" for r in consent) == 1000
+    assert storage.is_suppressed("user1999@example.com")
+    assert not storage.is_suppressed("user2000@example.com")
+
+def test_for_agents_covers_the_agent_layout(tmp_path):
+    leads_path = tmp_path / "Lead-Gen Agent" / "data" / "ready_leads.json"
+    leads_path.parent.mkdir(parents=True)
+    leads_path.write_text(json.dumps([{"email": "alice@example.com"}]))
+    logs = tmp_path / "Outreach Worker" / "logs"
+    logs.mkdir(parents=True)
+    (logs / "outreach_20260101_090000.jsonl").write_text(json.dumps({"recipient": "alice@example.com"}) + "\n")
+
+    engine = DsarEngine.for_agents(str(tmp_path), str(tmp_path / "index.db"))
+    try:
+        assert sorted(engine.stores) == ["analytics", "closer", "leadgen", "outreach"]
+        assert engine.erase(["alice@example.com"]) == {"leadgen": 1, "outreach": 1}
+    finally:
+        engine.close()
+
+def test_process_dsar_delete_uses_consent_positions(tmp_path):
+    storage = JsonStorage(data_dir=str(tmp_path / "data"))
+    manager = ComplianceManager(storage=storage)
+    manager.log_consent("a@example.com", "Web Form")
+    manager.log_consent("b@example.com", "Web Form")
+    manager.log_consent("A@example.com", "Event")
+
+    reloaded = ComplianceManager(storage=storage)
+    assert reloaded.consent_positions["a@example.com"] == [0, 2]
+    reloaded.process_dsar_delete("a@example.com")
+
+    assert [r["email"] for r in storage.load_consent_log()] == ["REDACTED", "b@example.com", "REDACTED"]
+    assert "a@example.com" not in ComplianceManager(storage=storage).consent_positions
@@ -0,0 +1,57 @@
+import pytest
+from src.index import SuppressionIndex, hash_email, normalize_email
+from src.manager import ComplianceManager
+from src.models import SuppressionReason
+from src.storage import JsonStorage
+
+@pytest.fixture
+def test_storage(tmp_path):
+    return JsonStorage(data_dir=str(tmp_path / "data"))
+
+@pytest.mark.parametrize("hashed", [False, True])
+def test_index_matches_normalized_addresses(hashed):
+    index = SuppressionIndex(["Blocked@Example.com "], hashed=hashed)
+
+    assert "blocked@example.com" in index
+    assert " BLOCKED@example.COM" in index
+    assert "other@example.com" not in index
+    assert len(index) == 1
+
+@pytest.mark.parametrize("hashed", [False, True])
+def test_index_from_records_with_hashed_entries(hashed):
+    records = [
+        {"email": "plain@example.com", "reason": "unsubscribed"},
+        {"email_hash": hash_email("Hidden@Example.com"), "reason": "dsar_deletion"},
+    ]
+    index = SuppressionIndex.from_records(records, hashed=hashed)
+
+    assert "plain@example.com" in index
+    assert "hidden@example.com" in index
+    assert index.filter_eligible(["a@example.com", "HIDDEN@example.com", "plain@example.com"]) == ["a@example.com"]
+
+def test_hashed_index_keeps_no_addresses():
+    index = SuppressionIndex(["secret@example.com"], hashed=True)
+
+    assert all(isinstance(key, bytes) and len(key) == 32 for key in index._keys)
+
+def test_discard():
+    index = SuppressionIndex(["a@example.com"])
+    index.discard("A@example.com")
+
+    assert "a@example.com" not in index
+
+def test_hash_email_is_normalized():
+    assert hash_email(" A@Example.com") == hash_email("a@example.com")
+    assert normalize_email(None) == ""
+
+def test_manager_filter_eligible(test_storage):
+    manager = ComplianceManager(storage=test_storage)
+    manager.add_to_suppression_list("unsub@example.com", SuppressionReason.UNSUBSCRIBED)
+
+    emails = ["a@example.com", "Unsub@Example.com", "b@example.com"]
+    assert manager.filter_eligible(emails) == ["a@example.com", "b@example.com"]
+    assert manager.check_eligibility("UNSUB@example.com") is False
+
+    # A new manager rebuilds the index from storage
+    reloaded = ComplianceManager(storage=test_storage, hashed_index=True)
+    assert reloaded.filter_eligible(emails) == ["a@example.com", "b@example.com"]
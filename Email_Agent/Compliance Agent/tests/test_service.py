@@ -0,0 +1,75 @@
+import json
+import socket
+import time
+
+import pytest
+from src.service import EligibilityServer
+from src.sqlite_storage import SqliteStorage
+from src.storage import JsonStorage
+
+def ask(address, *requests):
+    """Sends requests on one connection (all before reading) and returns the responses."""
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(10)
+        sock.connect(address)
+        sock.sendall("".join(json.dumps(r) + "\n" for r in requests).encode())
+        reader = sock.makefile("rb")
+        return [json.loads(reader.readline()) for _ in requests]
+
+@pytest.fixture(params=["json", "sqlite"])
+def storage(request, tmp_path):
+    if request.param == "json":
+        storage = JsonStorage(data_dir=str(tmp_path / "data"))
+    else:
+        storage = SqliteStorage(str(tmp_path / "data" / "compliance.db"))
+    storage.append_suppressions({"email": f"blocked{i}@example.com", "reason": "bounced"} for i in range(100))
+    return storage
+
+@pytest.fixture
+def server(storage, tmp_path):
+    server = EligibilityServer(storage, refresh_interval=0.05)
+    server.start(socket_path=str(tmp_path / "eligibility.sock"))
+    yield server
+    server.stop()
+
+def test_batched_checks(server):
+    emails = ["Blocked1@Example.com", "ok@example.com", "blocked99@example.com"]
+    check, ping = ask(server.address, {"id": 1, "op": "check", "emails": emails}, {"id": 2, "op": "ping"})
+    assert check == {"id": 1, "suppressed": ["Blocked1@Example.com", "blocked99@example.com"], "generation": 1}
+    assert ping["entries"] == 100
+
+def test_tcp_and_pipelined_requests(storage):
+    server = EligibilityServer(storage)
+    host, port = server.start(port=0)
+    try:
+        with socket.create_connection((host, port)) as sock:
+            payload = "".join(json.dumps({"id": i, "op": "check", "emails": [f"blocked{i}@example.com", "x@y.com"]})
+                              + "\n" for i in range(50))
+            sock.sendall(payload.encode() + b"not json\n" + b'{"id": "z", "op": "nope"}\n')
+            reader = sock.makefile("rb")
+            responses = [json.loads(reader.readline()) for _ in range(52)]
+        assert [r["id"] for r in responses[:50]] == list(range(50))
+        assert all(r["suppressed"] == [f"blocked{r['id']}@example.com"] for r in responses[:50])
+        assert responses[50]["error"] == "invalid JSON"
+        assert responses[51] == {"id": "z", "error": "unknown op: nope"}
+        assert server.stats["checked"] == 100
+    finally:
+        server.stop()
+
+def test_reloads_when_list_changes(server, storage):
+    request = {"id": 1, "op": "check", "emails": ["late@example.com"]}
+    assert ask(server.address, request)[0]["suppressed"] == []
+    storage.append_suppression({"email": "late@example.com", "reason": "unsubscribed"})
+    deadline = time.time() + 5
+    while server.generation < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert server.generation == 2
+    assert ask(server.address, request)[0] == {"id": 1, "suppressed": ["late@example.com"], "generation": 2}
+
+def test_restart_on_same_socket(server, tmp_path):
+    request = {"id": 1, "op": "check", "emails": ["blocked3@example.com"]}
+    assert ask(server.address, request)[0]["suppressed"] == ["blocked3@example.com"]
+    server.stop()
+    server.start(socket_path=str(tmp_path / "eligibility.sock"))
+    assert ask(server.address, request)[0]["suppressed"] == ["blocked3@example.com"]
@@ -0,0 +1,81 @@
+import pytest
+from src.index import hash_email
+from src.manager import ComplianceManager
+from src.migrate import main as migrate_main
+from src.models import SuppressionReason
+from src.sqlite_storage import SqliteStorage
+from src.storage import JsonStorage
+
+@pytest.fixture(params=["json", "sqlite"])
+def storage(request, tmp_path):
+    if request.param == "json":
+        return JsonStorage(data_dir=str(tmp_path / "data"))
+    return SqliteStorage(str(tmp_path / "data" / "compliance.db"))
+
+def test_manager_roundtrip_on_both_backends(storage):
+    manager = ComplianceManager(storage=storage)
+    manager.add_to_suppression_list("spam@example.com", SuppressionReason.SPAM_COMPLAINT)
+    manager.log_consent("lead@example.com", "Web Form")
+    manager.process_dsar_delete("lead@example.com")
+
+    suppression = storage.load_suppression_list()
+    consent = storage.load_consent_log()
+    assert [r["email"] for r in suppression] == ["spam@example.com", "lead@example.com"]
+    assert suppression[0]["reason"] == SuppressionReason.SPAM_COMPLAINT
+    assert consent[0]["email"] == "REDACTED"
+    assert consent[0]["consent_type"] == "marketing"
+    assert ComplianceManager(storage=storage).check_eligibility("Spam@Example.com") is False
+
+def test_indexed_lookups(tmp_path):
+    with SqliteStorage(str(tmp_path / "c.db"), batch_size=100) as storage:
+        storage.append_suppressions({"email": f"user{i}@example.com", "reason": "bounced"} for i in range(1000))
+        storage.append_suppression({"email_hash": hash_email("hidden@example.com"), "reason": "dsar_deletion"})
+
+        assert storage.count_suppressed() == 1001
+        assert storage.is_suppressed(" USER5@example.com")
+        assert storage.is_suppressed("hidden@example.com")
+        assert not storage.is_suppressed("other@example.com")
+        candidates = ["user1@example.com", "nobody@example.com", "hidden@example.com"]
+        assert storage.suppressed_among(candidates * 300) == {"user1@example.com", "hidden@example.com"}
+        plan = storage._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT 1 FROM suppression WHERE email_hash = ?", ("x",)).fetchall()
+        assert "idx_suppression_email_hash" in str(plan)
+
+def test_concurrent_reader_sees_committed_writes(tmp_path):
+    path = str(tmp_path / "c.db")
+    with SqliteStorage(path) as writer, SqliteStorage(path) as reader:
+        writer.append_suppression({"email": "a@example.com", "reason": "unsubscribed"})
+        assert reader.is_suppressed("a@example.com")
+        assert writer._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_failed_batch_is_rolled_back(tmp_path):
+    with SqliteStorage(str(tmp_path / "c.db")) as storage:
+        storage.append_suppression({"email": "keep@example.com", "reason": "bounced"})
+        with pytest.raises(KeyError):
+            storage.save_suppression_list([{"email": "new@example.com"}, {"reason": "no address"}])
+        assert [r["email"] for r in storage.load_suppression_list()] == ["keep@example.com"]
+
+def test_failed_append_leaves_no_partial_batches(tmp_path):
+    with SqliteStorage(str(tmp_path / "c.db"), batch_size=10) as storage:
+        records = [{"email": f"user{i}@example.com", "reason": "bounced"} for i in range(35)]
+        with pytest.raises(KeyError):
+            storage._write(storage._INSERT_SUPPRESSION,
+                           map(storage._suppression_row, records + [{"reason": "no address"}]))
+        assert storage.count_suppressed() == 0
+
+def test_migration_tool(tmp_path, monkeypatch, capsys):
+    data_dir = tmp_path / "data"
+    source = JsonStorage(data_dir=str(data_dir))
+    source.save_suppression_list([{"email": "a@example.com", "reason": "unsubscribed", "timestamp": "2025-01-01"}])
+    source.append_suppression({"email": "b@example.com", "reason": "bounced", "timestamp": "2025-01-02"})
+    source.append_consent({"email": "c@example.com", "source": "Form", "consent_type": "marketing",
+                           "timestamp": "2025-01-03", "ip_address": None})
+    db = tmp_path / "compliance.db"
+
+    monkeypatch.setattr("sys.argv", ["migrate", "--data-dir", str(data_dir), "--db", str(db)])
+    migrate_main()
+
+    assert "Migrated 2 suppression records and 1 consent records" in capsys.readouterr().out
+    with SqliteStorage(str(db)) as target:
+        assert target.load_suppression_list() == source.load_suppression_list()
+        assert target.load_consent_log() == source.load_consent_log()
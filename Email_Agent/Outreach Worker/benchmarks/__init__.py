@@ -0,0 +1 @@
+"""Benchmarks and local SMTP test fixtures for the outreach agent."""
@@ -0,0 +1,62 @@
+"""
+Measure HTML campaign throughput with and without render worker processes.
+
+Sends to the local SMTP sink with per-command latency, so the sequential
+run pays rendering and network time one after the other, while the
+pipelined run renders in worker processes during the SMTP round trips.
+
+Run from the Outreach Worker directory:
+    python -m benchmarks.bench_pipeline --contacts 2000 --workers 4
+"""
+
+import argparse
+import time
+from unittest.mock import patch
+
+from benchmarks.smtp_sink import SMTPSink
+from src.agent import OutreachAgent
+
+BODY = "<p>Hi $name,</p><p>I noticed $company is hiring a $position.</p>" * 20
+
+
+def run(label: str, contacts: list, latency: float, **kwargs) -> float:
+    with SMTPSink(latency=latency) as sink:
+        host, port = sink.address
+        agent = OutreachAgent("me@example.com", "secret",
+                              custom_smtp={'smtp_server': host, 'smtp_port': port,
+                                           'use_tls': False})
+        start = time.perf_counter()
+        with patch('builtins.print'):
+            results = agent.send_bulk_outreach(
+                contacts, "Hello $name", BODY, delay=0, html=True,
+                html_title="News for $company", **kwargs
+            )
+        elapsed = time.perf_counter() - start
+    rate = results['sent'] / elapsed
+    print(f"{label:30} {elapsed:8.2f} s  {rate:10.0f} msg/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render pipeline benchmark")
+    parser.add_argument("--contacts", type=int, default=2000, help="Number of contacts")
+    parser.add_argument("--workers", type=int, default=4, help="Render worker processes")
+    parser.add_argument("--latency", type=float, default=0.0005,
+                        help="Sink latency per SMTP command (seconds)")
+    args = parser.parse_args()
+
+    contacts = [
+        {'email': f"user{i}@example.com", 'name': f"User {i}",
+         'company': f"Company {i % 500}", 'position': 'Developer'}
+        for i in range(args.contacts)
+    ]
+
+    print(f"Sending {args.contacts} HTML messages")
+    before = run("render inline", contacts, args.latency)
+    after = run(f"render_workers={args.workers}", contacts, args.latency,
+                render_workers=args.workers)
+    print(f"{'speed-up':30} {after / before:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare per-message connections with the SMTP connection pool.
+
+Run from the Outreach Worker directory:
+    python -m benchmarks.bench_pool --messages 500 --latency 0.002
+"""
+
+import argparse
+import io
+import time
+from contextlib import redirect_stdout
+
+from benchmarks.smtp_sink import SMTPSink
+from src.agent import OutreachAgent
+
+
+def run(messages: int, latency: float, pool_size: int) -> dict:
+    """Send ``messages`` emails both ways and return messages/second for each."""
+    contacts = [{'email': f"user{i}@example.com", 'name': f"User {i}"}
+                for i in range(messages)]
+    rates = {}
+
+    with SMTPSink(latency=latency) as sink:
+        host, port = sink.address
+        agent = OutreachAgent(
+            "sender@example.com",
+            "secret",
+            custom_smtp={'smtp_server': host, 'smtp_port': port, 'use_tls': False}
+        )
+        agent.pool_size = pool_size
+
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for contact in contacts:
+                agent.send_email_with_retry(contact['email'], "Hi", "Hello")
+            rates['per_message_connection'] = messages / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            agent.send_bulk_outreach(contacts, "Hi $name", "Hello $name", delay=0)
+            rates['pooled'] = messages / (time.perf_counter() - start)
+
+        rates['logins'] = sink.stats['logins']
+
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SMTP connection pool benchmark")
+    parser.add_argument("--messages", type=int, default=500, help="Messages per run")
+    parser.add_argument("--latency", type=float, default=0.002,
+                        help="Simulated server latency per SMTP command (seconds)")
+    parser.add_argument("--pool-size", type=int, default=4, help="Pool size")
+    args = parser.parse_args()
+
+    rates = run(args.messages, args.latency, args.pool_size)
+    print(f"Messages:                 {args.messages}")
+    print(f"Per-message connection:   {rates['per_message_connection']:.1f} msg/s")
+    print(f"Pooled sessions:          {rates['pooled']:.1f} msg/s")
+    print(f"Speed-up:                 {rates['pooled'] / rates['per_message_connection']:.1f}x")
+    print(f"Logins seen by sink:      {rates['logins']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measure personalization cost per 100k contacts.
+
+Compares a fresh ``string.Template`` per call (and re-reading the HTML
+template file per recipient) with the compiled template cache.
+
+Run from the Outreach Worker directory:
+    python -m benchmarks.bench_templates --contacts 100000
+"""
+
+import argparse
+import time
+from string import Template
+
+from src.template_cache import compile_template, load_template_file
+
+SUBJECT = "Elevate $company's digital presence, $name"
+BODY = "Hi $name,\n\nI noticed $company is hiring a $position. " * 4
+HTML_TEMPLATE = "templates/html/professional.html"
+
+
+def timed(label: str, func, contacts: list) -> float:
+    start = time.perf_counter()
+    for contact in contacts:
+        func(contact)
+    elapsed = time.perf_counter() - start
+    per_100k = elapsed * 100_000 / len(contacts)
+    print(f"{label:40} {per_100k:8.2f} s / 100k contacts")
+    return per_100k
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Template rendering benchmark")
+    parser.add_argument("--contacts", type=int, default=100_000, help="Number of contacts")
+    args = parser.parse_args()
+
+    contacts = [
+        {'name': f"User {i}", 'company': f"Company {i % 500}", 'position': 'Developer',
+         'sender_email': 'me@example.com'}
+        for i in range(args.contacts)
+    ]
+
+    def uncached_text(contact):
+        Template(SUBJECT).safe_substitute(contact)
+        Template(BODY).safe_substitute(contact)
+
+    def cached_text(contact):
+        compile_template(SUBJECT).render(contact)
+        compile_template(BODY).render(contact)
+
+    def uncached_file(contact):
+        with open(HTML_TEMPLATE, 'r', encoding='utf-8') as f:
+            Template(f.read()).safe_substitute(contact)
+
+    def cached_file(contact):
+        load_template_file(HTML_TEMPLATE).render(contact)
+
+    print(f"Rendering for {args.contacts} contacts")
+    before = timed("subject+body, string.Template per call", uncached_text, contacts)
+    after = timed("subject+body, compiled cache", cached_text, contacts)
+    print(f"{'speed-up':40} {before / after:8.1f}x")
+    before = timed("HTML file, read + parse per recipient", uncached_file, contacts)
+    after = timed("HTML file, mtime-keyed cache", cached_file, contacts)
+    print(f"{'speed-up':40} {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Measure bulk address validation at 1M addresses.
+
+Compares the old per-address ``re.match`` with an uncompiled pattern
+against ``EmailValidator.validate_bulk`` on a list, and on NumPy and
+pandas columns when those packages are installed.
+
+Run from the Outreach Worker directory:
+    python -m benchmarks.bench_validation --addresses 1000000
+"""
+
+import argparse
+import re
+import time
+
+from src.validators import EmailValidator
+
+
+def timed(label: str, func, emails) -> float:
+    start = time.perf_counter()
+    func(emails)
+    elapsed = time.perf_counter() - start
+    print(f"{label:40} {elapsed:8.3f} s  {len(emails) / elapsed / 1e6:6.2f} M addr/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk validation benchmark")
+    parser.add_argument("--addresses", type=int, default=1_000_000, help="Number of addresses")
+    args = parser.parse_args()
+
+    emails = [
+        f" User.{i}@Example{i % 1000}.com " if i % 10 else f"broken-{i}@"
+        for i in range(args.addresses)
+    ]
+
+    def per_address(values):
+        pattern = EmailValidator.EMAIL_PATTERN
+        return [bool(re.match(pattern, e.strip())) for e in values], \
+            [e.strip().lower() for e in values]
+
+    print(f"Validating {args.addresses} addresses")
+    before = timed("re.match per address + clean_email", per_address, emails)
+    after = timed("validate_bulk (list)", EmailValidator.validate_bulk, emails)
+    print(f"{'speed-up':40} {before / after:8.1f}x")
+
+    try:
+        import numpy as np
+        timed("validate_bulk (numpy)", EmailValidator.validate_bulk, np.array(emails, dtype=object))
+    except ImportError:
+        print("numpy not installed, skipping")
+    try:
+        import pandas as pd
+        timed("validate_bulk (pandas)", EmailValidator.validate_bulk, pd.Series(emails))
+    except ImportError:
+        print("pandas not installed, skipping")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Campaign throughput benchmark suite.
+
+Runs whole campaigns against the local SMTP sink for every combination
+of contact-list size and sending mode, and reports per run:
+
+- messages/second (messages sent / wall-clock time)
+- p50/p99 latency of a single delivery attempt, in milliseconds
+- peak RSS and user/system CPU time of the sending process
+- what the sink saw (messages, injected errors, connections)
+
+Each run happens in a fresh child process, so peak RSS and CPU time
+belong to that run alone; the sink runs in the parent process and is not
+counted. Results are written as JSON. With ``--compare`` the runs are
+checked against an earlier results file and the exit status is non-zero
+if throughput dropped by more than ``--tolerance``, so the suite can
+gate a CI job.
+
+Modes:
+    sync      OutreachAgent.send_bulk_outreach on pooled SMTP sessions
+    pipeline  the same with render_workers (rendering in worker processes)
+    senders   SenderPool spreading the campaign over --accounts accounts
+    async     OutreachAgent.send_bulk_outreach_async with --concurrency
+
+Run from the Outreach Worker directory:
+    python -m benchmarks.run --sizes 1000,100000 --latency 0.0005 --output bench.json
+    python -m benchmarks.run --sizes 1000 --error-rate 0.01 --compare bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import platform
+import queue
+import sys
+import tempfile
+import time
+from array import array
+from contextlib import redirect_stdout
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from benchmarks.smtp_sink import SMTPSink
+from src.agent import OutreachAgent
+from src.send_log import SendLog
+from src.sender_pool import SenderAccount, SenderPool
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+MODES = ('sync', 'pipeline', 'senders', 'async')
+SUBJECT = "Quick question for $company"
+BODY = ("Hi $name,\n\nI noticed $company is hiring a $position and wanted to "
+        "share how we help teams like yours.\n\nBest regards") * 4
+
+
+def synthetic_contacts(count: int) -> Iterator[Dict[str, str]]:
+    """Yield ``count`` distinct contacts spread over 1000 domains."""
+    for i in range(count):
+        yield {'email': f"user{i}@domain{i % 1000}.example.com", 'name': f"User {i}",
+               'company': f"Company {i % 5000}", 'position': 'Developer'}
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of already sorted values (None if empty)."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _timed(agent: OutreachAgent, latencies: array):
+    """Record the duration of every delivery attempt made by ``agent``."""
+    deliver = agent._deliver
+
+    def timed_deliver(recipient: str, msg: bytes):
+        start = time.perf_counter()
+        try:
+            deliver(recipient, msg)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    agent._deliver = timed_deliver
+
+
+def _make_agent(email: str, address, retry_delay: float) -> OutreachAgent:
+    host, port = address
+    agent = OutreachAgent(email, "secret",
+                          custom_smtp={'smtp_server': host, 'smtp_port': port, 'use_tls': False})
+    agent.retry_delay = retry_delay
+    return agent
+
+
+def _send(config: Dict, log_path: str, latencies: array) -> Dict:
+    mode = config['mode']
+    contacts = synthetic_contacts(config['contacts'])
+
+    if mode == 'senders':
+        accounts = []
+        for n in range(config['accounts']):
+            account = SenderAccount(f"sender{n}@example.com", "secret",
+                                    custom_smtp={'smtp_server': config['address'][0],
+                                                 'smtp_port': config['address'][1],
+                                                 'use_tls': False},
+                                    daily_limit=config['contacts'])
+            _timed(account.agent, latencies)
+            accounts.append(account)
+        pool = SenderPool(accounts, retry_delay=config['retry_delay'])
+        with SendLog(log_path) as pool.send_log:
+            return pool.send_bulk_outreach(contacts, SUBJECT, BODY)
+
+    agent = _make_agent("sender@example.com", config['address'], config['retry_delay'])
+    _timed(agent, latencies)
+    with SendLog(log_path) as agent.send_log:
+        if mode == 'async':
+            return asyncio.run(agent.send_bulk_outreach_async(
+                contacts, SUBJECT, BODY, concurrency=config['concurrency']))
+        render_workers = config['workers'] if mode == 'pipeline' else 0
+        return agent.send_bulk_outreach(contacts, SUBJECT, BODY, delay=0,
+                                        render_workers=render_workers)
+
+
+def _run_case(config: Dict, results: multiprocessing.Queue):
+    """Child process: run one campaign and report its measurements."""
+    latencies = array('d')
+    with tempfile.TemporaryDirectory() as temp_dir, \
+            open(os.devnull, 'w', encoding='utf-8') as devnull, redirect_stdout(devnull):
+        start = time.perf_counter()
+        outcome = _send(config, os.path.join(temp_dir, 'sends.jsonl'), latencies)
+        elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    report = {
+        'sent': outcome['sent'],
+        'failed': outcome['failed'],
+        'skipped': outcome['skipped'],
+        'attempts': len(ordered),
+        'elapsed_s': round(elapsed, 4),
+        'msgs_per_sec': round(outcome['sent'] / elapsed, 2) if elapsed else None,
+        'latency_ms': {
+            'p50': round(percentile(ordered, 50) * 1000, 3) if ordered else None,
+            'p99': round(percentile(ordered, 99) * 1000, 3) if ordered else None,
+        },
+        'peak_rss_mb': None,
+        'cpu_s': None,
+    }
+    if resource is not None:
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        workers = resource.getrusage(resource.RUSAGE_CHILDREN)
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        report['peak_rss_mb'] = round(own.ru_maxrss / scale, 1)
+        report['cpu_s'] = {
+            'user': round(own.ru_utime + workers.ru_utime, 3),
+            'system': round(own.ru_stime + workers.ru_stime, 3),
+        }
+    results.put(report)
+
+
+def run_case(mode: str, contacts: int, args: argparse.Namespace) -> Dict:
+    """Run one campaign in a child process against a fresh sink."""
+    with SMTPSink(latency=args.latency, error_rate=args.error_rate,
+                  error_code=args.error_code, seed=args.seed) as sink:
+        config = {
+            'mode': mode, 'contacts': contacts, 'address': sink.address,
+            'retry_delay': args.retry_delay, 'workers': args.workers,
+            'concurrency': args.concurrency, 'accounts': args.accounts,
+        }
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        child = context.Process(target=_run_case, args=(config, results))
+        child.start()
+        while True:
+            try:
+                report = results.get(timeout=1)
+                break
+            except queue.Empty:
+                if not child.is_alive():
+                    raise RuntimeError(f"{mode} run with {contacts} contacts crashed "
+                                       f"(exit code {child.exitcode})")
+        child.join()
+        sink_stats = dict(sink.stats)
+
+    return {
+        'mode': mode,
+        'contacts': contacts,
+        **report,
+        'sink': {key: sink_stats[key] for key in ('messages', 'errors', 'connections', 'logins')},
+    }
+
+
+def compare(results: List[Dict], baseline_path: str, tolerance: float) -> List[str]:
+    """Return a description of every run slower than the baseline by more than ``tolerance``."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r['mode'], r['contacts']): r for r in json.load(f)['results']}
+
+    regressions = []
+    for result in results:
+        before = baseline.get((result['mode'], result['contacts']))
+        if not before or not before['msgs_per_sec'] or result['msgs_per_sec'] is None:
+            continue
+        change = result['msgs_per_sec'] / before['msgs_per_sec'] - 1
+        if change < -tolerance:
+            regressions.append(
+                f"{result['mode']} x {result['contacts']}: {before['msgs_per_sec']:.0f} -> "
+                f"{result['msgs_per_sec']:.0f} msg/s ({change:+.0%})"
+            )
+    return regressions
+
+
+def parse_list(value: str, kind=str) -> List:
+    return [kind(item) for item in value.split(',') if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Campaign throughput benchmark suite")
+    parser.add_argument("--sizes", default="1000",
+                        help="Comma-separated contact counts, e.g. 1000,100000,1000000")
+    parser.add_argument("--modes", default=','.join(MODES),
+                        help=f"Comma-separated modes out of {', '.join(MODES)}")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Sink latency per SMTP command (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of recipients the sink rejects")
+    parser.add_argument("--error-code", type=int, default=451,
+                        help="Reply code for rejected recipients (4xx is retried, 5xx is not)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for error injection")
+    parser.add_argument("--retry-delay", type=float, default=0.01,
+                        help="Base retry backoff in seconds")
+    parser.add_argument("--workers", type=int, default=4, help="Render workers (pipeline mode)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrency (async mode)")
+    parser.add_argument("--accounts", type=int, default=3, help="Sender accounts (senders mode)")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="Earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed throughput drop against --compare (fraction)")
+    args = parser.parse_args()
+
+    modes = parse_list(args.modes)
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"Unknown mode(s): {', '.join(sorted(unknown))}")
+
+    results = []
+    for contacts in parse_list(args.sizes, int):
+        for mode in modes:
+            result = run_case(mode, contacts, args)
+            results.append(result)
+            print(f"{mode:9} {contacts:>9} contacts  {result['msgs_per_sec'] or 0:10.0f} msg/s  "
+                  f"p99 {result['latency_ms']['p99'] or 0:8.2f} ms  "
+                  f"rss {result['peak_rss_mb'] or 0:7.1f} MB", file=sys.stderr)
+
+    document = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'config': {
+            'latency': args.latency, 'error_rate': args.error_rate,
+            'error_code': args.error_code, 'retry_delay': args.retry_delay,
+            'workers': args.workers, 'concurrency': args.concurrency,
+            'accounts': args.accounts,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for line in regressions:
+            print(f"✗ Regression: {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Local SMTP sink server for benchmarks and integration tests.
+
+Speaks just enough ESMTP (EHLO, AUTH PLAIN/LOGIN, MAIL, RCPT, DATA,
+RSET, NOOP, QUIT) for ``smtplib`` to deliver messages to it, discards
+the message bodies and counts what it saw. An optional per-command
+latency simulates a remote server, and an optional error rate makes it
+reject that fraction of recipients with a chosen reply code.
+"""
+
+import random
+import socketserver
+import threading
+import time
+from typing import Optional, Tuple
+
+
+class _SinkHandler(socketserver.StreamRequestHandler):
+    """Handle one SMTP session."""
+
+    def _reply(self, line: str):
+        self.wfile.write((line + "\r\n").encode('ascii'))
+        self.wfile.flush()
+
+    def _pause(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+    def handle(self):
+        sink = self.server
+        sink.session_started()
+        try:
+            self._converse(sink)
+        finally:
+            sink.session_ended()
+
+    def _converse(self, sink: 'SMTPSink'):
+        self._pause()
+        self._reply("220 localhost SMTP sink ready")
+
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode('utf-8', errors='replace').rstrip("\r\n")
+            verb = line.split(' ', 1)[0].upper()
+            self._pause()
+
+            if verb in ('EHLO', 'HELO'):
+                if verb == 'EHLO':
+                    self._reply("250-localhost")
+                    self._reply("250-8BITMIME")
+                    self._reply("250 AUTH PLAIN LOGIN")
+                else:
+                    self._reply("250 localhost")
+            elif verb == 'AUTH':
+                parts = line.split()
+                mechanism = parts[1].upper() if len(parts) > 1 else ''
+                if mechanism == 'LOGIN':
+                    self._reply("334 VXNlcm5hbWU6")
+                    self.rfile.readline()
+                    self._reply("334 UGFzc3dvcmQ6")
+                    self.rfile.readline()
+                elif mechanism == 'PLAIN' and len(parts) < 3:
+                    self._reply("334 ")
+                    self.rfile.readline()
+                sink.count('logins')
+                self._reply("235 Authentication successful")
+            elif verb == 'RCPT' and sink.inject_error():
+                sink.count('errors')
+                self._reply(f"{sink.error_code} Injected failure")
+            elif verb in ('MAIL', 'RCPT'):
+                self._reply("250 OK")
+            elif verb == 'DATA':
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line == b".\r\n":
+                        break
+                sink.count('messages')
+                self._reply("250 OK queued")
+            elif verb == 'RSET':
+                sink.count('rsets')
+                self._reply("250 OK")
+            elif verb == 'NOOP':
+                sink.count('noops')
+                self._reply("250 OK")
+            elif verb == 'QUIT':
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """
+    Threaded SMTP sink bound to localhost.
+
+    Usage:
+        with SMTPSink(latency=0.005) as sink:
+            host, port = sink.address
+            ...
+            print(sink.stats['messages'])
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 latency: float = 0.0,
+                 error_rate: float = 0.0,
+                 error_code: int = 451,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Seconds to sleep before answering each command
+            error_rate: Fraction of RCPT commands rejected with ``error_code``
+            error_code: Reply code for injected failures (4xx transient, 5xx permanent)
+            seed: Seed for the error injection, for repeatable runs
+        """
+        super().__init__((host, port), _SinkHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self._rng = random.Random(seed)
+        self.stats = {'connections': 0, 'logins': 0, 'messages': 0, 'noops': 0,
+                      'rsets': 0, 'errors': 0, 'peak_sessions': 0}
+        self._active_sessions = 0
+        self._stats_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Return the (host, port) the sink is listening on."""
+        return self.server_address[0], self.server_address[1]
+
+    def inject_error(self) -> bool:
+        """Decide whether the current recipient is rejected."""
+        if not self.error_rate:
+            return False
+        with self._stats_lock:
+            return self._rng.random() < self.error_rate
+
+    def count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def session_started(self):
+        with self._stats_lock:
+            self.stats['connections'] += 1
+            self._active_sessions += 1
+            self.stats['peak_sessions'] = max(self.stats['peak_sessions'],
+                                              self._active_sessions)
+
+    def session_ended(self):
+        with self._stats_lock:
+            self._active_sessions -= 1
+
+    def start(self) -> 'SMTPSink':
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the socket."""
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> 'SMTPSink':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
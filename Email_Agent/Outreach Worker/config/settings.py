@@ -24,6 +24,10 @@ DEFAULT_DELAY = float(os.getenv('DEFAULT_DELAY', '2.0'))
 MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
 RETRY_DELAY = int(os.getenv('RETRY_DELAY', '5'))
 
+# Rate limiting (messages per second; unset or empty = unlimited)
+ACCOUNT_RATE_LIMIT = float(os.getenv('ACCOUNT_RATE_LIMIT')) if os.getenv('ACCOUNT_RATE_LIMIT') else None
+DOMAIN_RATE_LIMIT = float(os.getenv('DOMAIN_RATE_LIMIT')) if os.getenv('DOMAIN_RATE_LIMIT') else None
+
 # Logging
 LOG_ENABLED = os.getenv('LOG_ENABLED', 'true').lower() == 'true'
 LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # json or csv
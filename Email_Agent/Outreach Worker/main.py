@@ -1,11 +1,20 @@
 import os
 import argparse
 import sys
+from itertools import chain
 from pathlib import Path
 from dotenv import load_dotenv
+from config.settings import ACCOUNT_RATE_LIMIT, DOMAIN_RATE_LIMIT
 from src.agent import OutreachAgent
-from src.utils import load_contacts_from_csv, ensure_directory, generate_log_filename
+from src.rate_limiter import RateLimiter, recipient_domain
+from src.utils import iter_contacts_from_csv, format_progress, ensure_directory, generate_log_filename
+from src.domain_check import DomainVerifier
+from src.recipient_index import RecipientIndex
+from src.send_log import SendLog
+from src.send_queue import SendQueue
+from src.suppression import BloomSuppression, ServiceSuppression, SuppressionList
 from src.templates import HTMLTemplates
+from src.template_cache import compile_template
 
 def main():
     # Load environment variables
@@ -18,6 +27,17 @@ def main():
     parser.add_argument("--html", action="store_true", help="Send as HTML email")
     parser.add_argument("--dry-run", action="store_true", help="Simulate sending without actual delivery")
     parser.add_argument("--delay", type=float, default=2.0, help="Delay between emails in seconds")
+    parser.add_argument("--account-rate", type=float, default=ACCOUNT_RATE_LIMIT, help="Messages per second from the sending account (default: ACCOUNT_RATE_LIMIT; replaces --delay)")
+    parser.add_argument("--domain-rate", type=float, default=DOMAIN_RATE_LIMIT, help="Messages per second to each recipient domain (default: DOMAIN_RATE_LIMIT; replaces --delay)")
+    parser.add_argument("--max-emails", type=int, help="Stop after this many contacts")
+    parser.add_argument("--suppression", help="Path to the Compliance Agent's suppression list (JSON); suppressed addresses are skipped")
+    parser.add_argument("--suppression-bloom", help="Bloom filter published by the Compliance Agent; only its hits are checked against --suppression")
+    parser.add_argument("--suppression-service", help="Compliance eligibility service to check addresses against (Unix socket path or host:port)")
+    parser.add_argument("--verify-domains", action="store_true", help="Skip contacts whose domain cannot receive mail (cached DNS checks)")
+    parser.add_argument("--queue", help="Path to a durable send queue (SQLite) to checkpoint and resume the campaign")
+    parser.add_argument("--campaign", default="default", help="Campaign ID used in the send queue and recipient index")
+    parser.add_argument("--recipient-index", help="Path to a recipient index (SQLite) shared by campaigns to enforce a frequency cap")
+    parser.add_argument("--min-days", type=float, default=7, help="With --recipient-index, contact an address at most once per this many days")
     
     args = parser.parse_args()
     
@@ -37,17 +57,47 @@ def main():
         print("Please create a contacts CSV file with 'email' and 'name' columns.")
         sys.exit(1)
         
-    # Load contacts
+    # Stream contacts: rows are validated and de-duplicated as they are read
+    load_stats = {}
     try:
-        contacts = load_contacts_from_csv(str(contacts_path))
-        if not contacts:
+        contacts = iter_contacts_from_csv(str(contacts_path), validate=True, dedupe=True,
+                                          max_emails=args.max_emails, stats=load_stats)
+        first = next(contacts, None)
+        if first is None:
             print("Error: No contacts found in CSV file")
             sys.exit(1)
+        contacts = chain([first], contacts)
+        
+        # Never contact unsubscribed, complained or deleted addresses
+        suppression = None
+        if args.suppression_service:
+            suppression = ServiceSuppression(args.suppression_service)
+            print(f"Checking addresses against eligibility service {args.suppression_service}")
+        elif args.suppression_bloom:
+            suppression = BloomSuppression(args.suppression_bloom, exact_path=args.suppression)
+            print(f"Mapped suppression filter {args.suppression_bloom} ({suppression.count} entries)")
+        elif args.suppression:
+            suppression = SuppressionList.from_json(args.suppression)
+            print(f"Loaded {len(suppression)} suppressed addresses from {args.suppression}")
+        if suppression is not None:
+            contacts = suppression.filter_contacts(
+                contacts,
+                on_suppressed=lambda c: print(f"⚠ Suppressed, skipping {c.get('email')}")
+            )
+        
+        # Drop contacts on dead domains, one cached DNS lookup per domain
+        verifier = None
+        if args.verify_domains:
+            verifier = DomainVerifier(cache_path="data/domain_cache.json")
+            contacts = verifier.filter_contacts(
+                contacts,
+                on_undeliverable=lambda c: print(f"⚠ Undeliverable domain, skipping {c.get('email')}")
+            )
     except Exception as e:
         print(f"Error loading contacts: {e}")
         sys.exit(1)
         
-    print(f"Loaded {len(contacts)} contacts from {contacts_path}")
+    print(f"Streaming contacts from {contacts_path}")
     
     if args.dry_run:
         print("\n--- DRY RUN MODE ---")
@@ -57,6 +107,9 @@ def main():
         print("--- Contacts to process ---")
         for contact in contacts:
             print(f"- {contact.get('name', 'Unknown')} <{contact.get('email', 'No Email')}>")
+        print(f"Contacts: {load_stats}")
+        if verifier:
+            verifier.save()
         return
 
     # Initialize Agent
@@ -92,12 +145,59 @@ def main():
         import time
         results['start_time'] = datetime.now().isoformat()
         
-        for i, contact in enumerate(contacts):
+        # Stream send results to a JSON Lines log as the campaign runs
+        log_dir = ensure_directory("logs")
+        log_file = log_dir / generate_log_filename(extension='jsonl')
+        agent.send_log = SendLog(str(log_file), max_bytes=50 * 1024 * 1024, compress=True)
+        
+        # Skip addresses any campaign contacted within --min-days; each
+        # address is reserved right before its send, so an interrupted run
+        # holds no reservations for contacts it never reached
+        index = None
+        if args.recipient_index:
+            index = RecipientIndex(args.recipient_index, campaign_id=args.campaign,
+                                   window=args.min_days * 24 * 3600)
+        
+        # Pace by token buckets per account, provider and recipient domain instead of a fixed delay
+        rate_limiter = None
+        if args.account_rate or args.domain_rate:
+            rate_limiter = RateLimiter(account_rate=args.account_rate or None,
+                                       domain_rate=args.domain_rate or None)
+            print(f"Rate limits: {args.account_rate or 'unlimited'}/s per account, "
+                  f"{args.domain_rate or 'unlimited'}/s per domain")
+        
+        # With a send queue, resume from where a previous run stopped
+        queue = None
+        to_send = contacts
+        total = None
+        if args.queue:
+            queue = SendQueue(args.queue, campaign_id=args.campaign)
+            queue.enqueue(contacts)
+            total = queue.remaining()
+            to_send = queue.consume()
+            print(f"Send queue: {total} contacts remaining in campaign '{args.campaign}'")
+        
+        i = 0
+        for contact in to_send:
             email_addr = contact.get('email', '')
             name = contact.get('name', 'there')
             company = contact.get('company', 'your organization')
             
-            print(f"\n[{i+1}/{len(contacts)}] Processing: {name} <{email_addr}>")
+            if index and not index.reserve(email_addr):
+                print(f"⚠ Recently contacted, skipping {email_addr}")
+                results['skipped'] += 1
+                if queue:
+                    queue.mark_failed(email_addr, "Recently contacted")
+                continue
+            
+            print(f"\n[{format_progress(i, total)}] Processing: {name} <{email_addr}>")
+            
+            # Delay between emails
+            if rate_limiter is not None:
+                rate_limiter.acquire(email, service, recipient_domain(email_addr))
+            elif i > 0:
+                time.sleep(args.delay)
+            i += 1
             
             # Load and personalize the HTML template
             try:
@@ -109,9 +209,7 @@ def main():
                 )
                 
                 # Personalize subject
-                from string import Template
-                subject_tmpl = Template(args.subject)
-                subject = subject_tmpl.safe_substitute(contact)
+                subject = compile_template(args.subject).render(contact)
                 
                 # Send email
                 success, error_msg = agent.send_email_with_retry(
@@ -129,21 +227,40 @@ def main():
                     results['failed_emails'].append({'email': email_addr, 'error': error_msg})
                     print(f"✗ Failed to send to {email_addr}: {error_msg}")
                 
-                # Delay between emails
-                if i < len(contacts) - 1:
-                    time.sleep(args.delay)
+                if queue:
+                    if success:
+                        queue.mark_sent(email_addr)
+                    else:
+                        queue.mark_failed(email_addr, error_msg)
+                if index:
+                    if success:
+                        index.mark_sent(email_addr)
+                    else:
+                        index.release(email_addr)
                     
             except Exception as e:
                 results['failed'] += 1
                 results['failed_emails'].append({'email': email_addr, 'error': str(e)})
                 print(f"✗ Error processing {email_addr}: {e}")
+                if queue:
+                    queue.mark_failed(email_addr, str(e))
+                if index:
+                    index.release(email_addr)
         
         results['end_time'] = datetime.now().isoformat()
+        print(f"Contacts: {load_stats}")
+        if verifier:
+            print(f"Domain checks: {verifier.stats}")
+            verifier.save()
+        if queue:
+            print(f"Send queue status: {queue.stats()}")
+            queue.close()
+        if index:
+            print(f"Recipient index: {index.stats}")
+            index.close()
         
-        # Save logs and report
-        log_dir = ensure_directory("logs")
-        log_file = log_dir / generate_log_filename()
-        agent.save_log(str(log_file))
+        agent.send_log.close()
+        print(f"\n📄 Log written to {log_file}")
         
         print(agent.generate_report(results))
         
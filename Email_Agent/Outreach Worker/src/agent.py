@@ -1,18 +1,30 @@
 """Main OutreachAgent class."""
 
+import asyncio
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
-from email import encoders
-from string import Template
-from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from email.mime.multipart import MIMEMultipart
+from contextlib import closing, contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Dict, Optional, Tuple
 import time
 from datetime import datetime
 
 from .email_service import EmailServiceConfig
+from .domain_check import DomainVerifier
+from .smtp_pool import SMTPConnectionPool
+from .attachments import AttachmentCache
+from .message_builder import MessageBuilder
+from .pipeline import CampaignRenderer, RenderPipeline
+from .rate_limiter import RateLimiter, DomainScheduler, recipient_domain
+from .recipient_index import RecipientIndex
+from .retry import AUTH, PERMANENT, RETRYABLE, RetryScheduler, backoff_delay, classify_smtp_error
+from .send_log import SendLog
+from .send_queue import SendQueue
+from .suppression import SuppressionList
 from .templates import HTMLTemplates
+from .template_cache import compile_template
+from .utils import limit_contacts, format_progress
 from .validators import EmailValidator, ContactValidator
 
 
@@ -37,122 +49,322 @@ class OutreachAgent:
         self.password = password
         
         if custom_smtp:
+            self.service = 'custom'
             self.smtp_server = custom_smtp['smtp_server']
             self.smtp_port = custom_smtp['smtp_port']
             self.use_tls = custom_smtp.get('use_tls', True)
         else:
             config = EmailServiceConfig.get_config(service)
+            self.service = service.lower()
             self.smtp_server = config['smtp_server']
             self.smtp_port = config['smtp_port']
             self.use_tls = config['use_tls']
         
         self.sent_log = []
+        self.send_log: Optional[SendLog] = None
         self.retry_count = 3
         self.retry_delay = 5
+        self.pool_size = 4
+        self.attachment_cache = AttachmentCache()
+        self._builders: Dict[Tuple[Tuple[str, ...], bool], MessageBuilder] = {}
+        self._pool: Optional[SMTPConnectionPool] = None
+        
+    @contextmanager
+    def connection_pool(self, size: Optional[int] = None):
+        """
+        Keep authenticated SMTP sessions open for the duration of the block.
+        
+        While the pool is open, ``send_email_with_retry`` reuses its sessions
+        instead of connecting and logging in for every message. Nested calls
+        share the outer pool.
+        
+        Args:
+            size: Maximum number of concurrent sessions (defaults to ``pool_size``)
+        """
+        if self._pool is not None:
+            yield self._pool
+            return
+        
+        self._pool = SMTPConnectionPool(
+            self.smtp_server,
+            self.smtp_port,
+            self.sender_email,
+            self.password,
+            use_tls=self.use_tls,
+            size=size or self.pool_size
+        )
+        try:
+            yield self._pool
+        finally:
+            self._pool.close()
+            self._pool = None
+        
+    def _log_send(self, entry: Dict):
+        """Record one send result in ``send_log`` if set, else in ``sent_log``."""
+        if self.send_log is not None:
+            self.send_log.append(entry)
+        else:
+            self.sent_log.append(entry)
         
     def generate_personalized_message(self, template: str, 
                                      contact: Dict[str, str]) -> str:
         """Generate personalized message from template."""
-        template_obj = Template(template)
         try:
-            return template_obj.safe_substitute(contact)
+            return compile_template(template).render(contact)
         except Exception as e:
             print(f"Error generating message: {e}")
             return template
     
+    def _render_contact(self,
+                        contact: Dict[str, str],
+                        subject_template: str,
+                        body_template: str,
+                        html: bool = False,
+                        html_template_type: str = 'professional',
+                        html_title: str = "",
+                        html_footer: str = "") -> Tuple[str, str]:
+        """Personalize subject and body (wrapped in an HTML template if requested)."""
+        subject = self.generate_personalized_message(subject_template, contact)
+        body_content = self.generate_personalized_message(body_template, contact)
+        
+        if not html:
+            return subject, body_content
+        
+        title = self.generate_personalized_message(html_title, contact) if html_title else ""
+        footer = self.generate_personalized_message(html_footer, contact) if html_footer else ""
+        
+        return subject, HTMLTemplates.wrap(html_template_type, body_content, title, footer)
+    
     def attach_document(self, msg: MIMEMultipart, file_path: str) -> bool:
-        """Attach document to email message."""
+        """
+        Attach document to email message.
+        
+        The file is read and base64-encoded once; later messages reuse the
+        cached part from ``attachment_cache``.
+        """
         try:
-            with open(file_path, 'rb') as attachment:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(attachment.read())
-            
-            encoders.encode_base64(part)
-            filename = Path(file_path).name
-            part.add_header('Content-Disposition', f'attachment; filename= {filename}')
-            msg.attach(part)
+            msg.attach(self.attachment_cache.get_part(file_path))
             return True
         except Exception as e:
             print(f"Error attaching document {file_path}: {e}")
             return False
     
+    def _attachment_parts(self, attachments: Optional[List[str]]) -> Tuple[MIMEBase, ...]:
+        """Fetch encoded parts for ``attachments``, skipping unreadable files."""
+        parts = []
+        for file_path in attachments or ():
+            try:
+                parts.append(self.attachment_cache.get_part(file_path))
+            except Exception as e:
+                print(f"Warning: Failed to attach {file_path}: {e}")
+        return tuple(parts)
+    
+    def _message_builder(self, attachments: Optional[List[str]], html: bool) -> MessageBuilder:
+        """
+        Return the campaign skeleton for this attachment set and body type.
+        
+        The builder is reused for as long as the attachment cache returns
+        the same parts, i.e. until an attachment changes on disk.
+        """
+        parts = self._attachment_parts(attachments)
+        key = (tuple(attachments or ()), html)
+        builder = self._builders.get(key)
+        if builder is None or builder.attachment_parts != parts:
+            builder = MessageBuilder(self.sender_email, html, parts)
+            self._builders[key] = builder
+        return builder
+    
+    def _build_message(self,
+                       recipient: str,
+                       subject: str,
+                       body: str,
+                       attachments: Optional[List[str]] = None,
+                       html: bool = False) -> bytes:
+        """Serialize the message for one recipient, ready for ``sendmail``."""
+        return self._message_builder(attachments, html).build(recipient, subject, body)
+    
+    def _deliver(self, recipient: str, msg: bytes):
+        """Make a single delivery attempt of serialized bytes; raises on failure."""
+        if self._pool is not None:
+            self._pool.sendmail(self.sender_email, [recipient], msg)
+        else:
+            with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30) as server:
+                if self.use_tls:
+                    server.starttls()
+                server.login(self.sender_email, self.password)
+                server.sendmail(self.sender_email, [recipient], msg)
+    
+    def deliver(self,
+                recipient: str,
+                subject: str,
+                body: str,
+                attachments: Optional[List[str]] = None,
+                html: bool = False):
+        """
+        Make one delivery attempt, without retries or logging.
+        
+        Raises:
+            smtplib.SMTPException, ConnectionError, TimeoutError: On failure,
+                so callers such as ``SenderPool`` can decide how to recover
+        """
+        self._deliver(recipient, self._build_message(recipient, subject, body, attachments, html))
+    
+    @staticmethod
+    def _describe_error(error: Exception, kind: str) -> str:
+        if kind == AUTH:
+            return f"Authentication failed: {str(error)}"
+        if isinstance(error, (smtplib.SMTPException, ConnectionError, TimeoutError)):
+            return f"SMTP error: {str(error)}"
+        return f"Unexpected error: {str(error)}"
+    
+    def _try_send(self, recipient: str, subject: str, msg: bytes,
+                  attempt: int) -> Tuple[bool, str, Optional[str]]:
+        """
+        Make one delivery attempt and log it if it succeeds.
+        
+        Returns:
+            Tuple of (success, message, error kind from ``classify_smtp_error``)
+        """
+        try:
+            self._deliver(recipient, msg)
+        except Exception as e:
+            kind = classify_smtp_error(e)
+            return False, self._describe_error(e, kind), kind
+        
+        self._log_send({
+            'timestamp': datetime.now().isoformat(),
+            'recipient': recipient,
+            'subject': subject,
+            'status': 'sent',
+            'attempt': attempt
+        })
+        return True, "Success", None
+    
+    def _log_failure(self, recipient: str, subject: str, error: str, attempts: int):
+        self._log_send({
+            'timestamp': datetime.now().isoformat(),
+            'recipient': recipient,
+            'subject': subject,
+            'status': 'failed',
+            'error': error,
+            'attempts': attempts
+        })
+    
     def send_email_with_retry(self, 
                               recipient: str, 
                               subject: str, 
                               body: str, 
                               attachments: Optional[List[str]] = None,
                               html: bool = False,
-                              max_retries: Optional[int] = None) -> Tuple[bool, str]:
-        """Send email with automatic retry logic."""
+                              max_retries: Optional[int] = None,
+                              message: Optional[bytes] = None) -> Tuple[bool, str]:
+        """
+        Send email with automatic retry logic.
+        
+        ``message`` may carry the already serialized message (e.g. from
+        ``RenderPipeline``); ``body``, ``attachments`` and ``html`` are then
+        not used.
+        """
         if not EmailValidator.validate_email(recipient):
             return False, f"Invalid email address: {recipient}"
         
         max_retries = max_retries if max_retries is not None else self.retry_count
         last_error = ""
+        # Built once; retries resend identical bytes
+        msg = message
+        if msg is None:
+            msg = self._build_message(recipient, subject, body, attachments, html)
         
-        for attempt in range(max_retries):
-            try:
-                msg = MIMEMultipart()
-                msg['From'] = self.sender_email
-                msg['To'] = recipient
-                msg['Subject'] = subject
-                
-                mime_type = 'html' if html else 'plain'
-                msg.attach(MIMEText(body, mime_type))
-                
-                if attachments:
-                    for file_path in attachments:
-                        if not self.attach_document(msg, file_path):
-                            print(f"Warning: Failed to attach {file_path}")
-                
-                with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30) as server:
-                    if self.use_tls:
-                        server.starttls()
-                    server.login(self.sender_email, self.password)
-                    server.send_message(msg)
-                
-                self.sent_log.append({
-                    'timestamp': datetime.now().isoformat(),
-                    'recipient': recipient,
-                    'subject': subject,
-                    'status': 'sent',
-                    'attempt': attempt + 1
-                })
+        attempt = 0
+        for attempt in range(1, max_retries + 1):
+            success, last_error, kind = self._try_send(recipient, subject, msg, attempt)
+            if success:
                 return True, "Success"
-                
-            except smtplib.SMTPAuthenticationError as e:
-                last_error = f"Authentication failed: {str(e)}"
+            
+            if kind == AUTH:
                 print(f"Authentication error - no retry: {last_error}")
                 break
-                
-            except (smtplib.SMTPException, ConnectionError, TimeoutError) as e:
-                last_error = f"SMTP error: {str(e)}"
-                print(f"Attempt {attempt + 1}/{max_retries} failed: {last_error}")
-                
-                if attempt < max_retries - 1:
-                    wait_time = self.retry_delay * (attempt + 1)
-                    print(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    
-            except Exception as e:
-                last_error = f"Unexpected error: {str(e)}"
-                print(f"Attempt {attempt + 1}/{max_retries} failed: {last_error}")
-                
-                if attempt < max_retries - 1:
-                    time.sleep(self.retry_delay)
+            print(f"Attempt {attempt}/{max_retries} failed: {last_error}")
+            if kind == PERMANENT:
+                print("Permanent failure - no retry")
+                break
+            
+            if attempt < max_retries:
+                wait_time = backoff_delay(attempt, self.retry_delay)
+                print(f"Retrying in {wait_time:.1f} seconds...")
+                time.sleep(wait_time)
         
-        self.sent_log.append({
-            'timestamp': datetime.now().isoformat(),
-            'recipient': recipient,
-            'subject': subject,
-            'status': 'failed',
-            'error': last_error,
-            'attempts': max_retries
-        })
+        self._log_failure(recipient, subject, last_error, attempt)
         return False, last_error
     
+    @staticmethod
+    def _valid_contacts(contacts: Iterable[Dict[str, str]],
+                        total: Optional[int],
+                        results: Dict,
+                        skip_invalid: bool = True,
+                        domain_verifier: Optional[DomainVerifier] = None,
+                        recipient_index: Optional[RecipientIndex] = None,
+                        suppression: Optional[SuppressionList] = None
+                        ) -> Tuple[Iterable[Dict[str, str]], Optional[int]]:
+        """
+        Drop contacts with invalid addresses (if ``skip_invalid``),
+        suppressed addresses (if a ``suppression`` list is given) and
+        contacts on undeliverable domains (if a ``domain_verifier`` is
+        given) before sending, counting them as skipped. A list is
+        filtered up front so the total stays exact; a stream is filtered
+        batch by batch as it is read.
+        
+        A ``recipient_index`` is not applied here: each recipient is
+        reserved right before its send (see ``_reserve``), so an
+        interrupted campaign leaves no reservations for contacts it never
+        reached. For a list it only takes the recipients over their cap
+        out of the total, without reserving anything.
+        """
+        if (not skip_invalid and domain_verifier is None and recipient_index is None
+                and suppression is None):
+            return contacts, total
+        
+        def skip(reason: str):
+            def record(contact: Dict[str, str]):
+                print(f"⚠ {reason}: {contact.get('email', '')}")
+                results['skipped'] += 1
+            return record
+        
+        valid = contacts
+        if skip_invalid:
+            valid = EmailValidator.filter_valid(valid, on_invalid=skip("Invalid email address"))
+        if suppression is not None:
+            valid = suppression.filter_contacts(valid, on_suppressed=skip("Suppressed"))
+        if domain_verifier is not None:
+            valid = domain_verifier.filter_contacts(
+                valid, on_undeliverable=skip("Undeliverable domain"))
+        if total is None:
+            return valid, None
+        valid = list(valid)
+        if recipient_index is not None:
+            return valid, recipient_index.count_allowed(contact.get('email', '') for contact in valid)
+        return valid, len(valid)
+    
+    @staticmethod
+    def _reserve(email: str,
+                 results: Dict,
+                 recipient_index: Optional[RecipientIndex],
+                 queue: Optional[SendQueue] = None) -> bool:
+        """
+        Reserve ``email`` in the ``recipient_index`` just before sending to
+        it. A recipient over its frequency cap is counted as skipped (and
+        closed in the ``queue``, if any) and False is returned.
+        """
+        if recipient_index is None or recipient_index.reserve(email):
+            return True
+        print(f"⚠ Recently contacted: {email}")
+        results['skipped'] += 1
+        if queue is not None:
+            queue.mark_failed(email, "Recently contacted")
+        return False
+    
     def send_bulk_outreach(self,
-                          contacts: List[Dict[str, str]],
+                          contacts: Iterable[Dict[str, str]],
                           subject_template: str,
                           body_template: str,
                           attachments: Optional[List[str]] = None,
@@ -162,8 +374,60 @@ class OutreachAgent:
                           html_title: str = "",
                           html_footer: str = "",
                           max_emails: Optional[int] = None,
-                          skip_invalid: bool = True) -> Dict:
-        """Send personalized emails to multiple contacts."""
+                          skip_invalid: bool = True,
+                          rate_limiter: Optional[RateLimiter] = None,
+                          queue: Optional[SendQueue] = None,
+                          render_workers: int = 0,
+                          domain_verifier: Optional[DomainVerifier] = None,
+                          recipient_index: Optional[RecipientIndex] = None,
+                          suppression: Optional[SuppressionList] = None) -> Dict:
+        """
+        Send personalized emails to multiple contacts.
+        
+        With ``skip_invalid`` the addresses are validated and normalized in
+        bulk before the send loop (see ``EmailValidator.filter_valid``) and
+        invalid contacts are counted as skipped. A ``domain_verifier``
+        likewise drops contacts whose domain cannot receive mail, checking
+        each distinct domain once instead of spending SMTP attempts on it.
+        
+        Addresses on a ``suppression`` list (unsubscribes, complaints,
+        deletion requests; see ``SuppressionList.from_json``) are skipped,
+        checked in batches against an in-memory hash set.
+        
+        A ``recipient_index`` enforces its frequency cap across campaigns:
+        addresses contacted too recently (by this or any other campaign
+        sharing the index) are skipped. The others are reserved one at a
+        time right before their send, confirmed when sent and released
+        when the send fails, so a crash leaves no reservations for
+        recipients the campaign never reached.
+        
+        ``contacts`` may be a list or any iterable, e.g. the generator from
+        ``iter_contacts_from_csv``; it is consumed lazily, so sending starts
+        with the first contact and the full list is never held in memory.
+        
+        With a ``rate_limiter`` the fixed ``delay`` is not used; instead
+        contacts are interleaved across recipient domains and each send
+        waits only as long as its account, service and domain budgets
+        require.
+        
+        With a ``queue`` the contacts are first added to the durable send
+        queue (contacts already queued are ignored) and the campaign then
+        drains the queue, recording each recipient's outcome as it goes.
+        Re-running after a crash resumes with the recipients not yet sent,
+        and several processes may drain the same queue.
+        
+        A delivery that fails with a retryable error (4xx reply, dropped
+        connection, timeout) does not block the campaign: the recipient is
+        parked in a ``RetryScheduler`` with jittered exponential backoff
+        and retried once due, while other contacts keep being sent. 5xx
+        and authentication failures are not retried.
+        
+        With ``render_workers`` > 0, personalization and serialization run
+        in that many worker processes (see ``RenderPipeline``) ahead of the
+        sending loop, which then only talks SMTP. A ``rate_limiter`` still
+        paces every send, but contacts are sent in input order rather than
+        interleaved by domain.
+        """
         results = {
             'sent': 0, 
             'failed': 0, 
@@ -172,42 +436,38 @@ class OutreachAgent:
             'start_time': datetime.now().isoformat()
         }
         
-        contacts_to_process = contacts[:max_emails] if max_emails else contacts
+        contacts_to_process, total = limit_contacts(contacts, max_emails)
+        contacts_to_process, total = self._valid_contacts(
+            contacts_to_process, total, results, skip_invalid, domain_verifier,
+            recipient_index, suppression)
+        if queue is not None:
+            queue.enqueue(contacts_to_process)
+            total = queue.remaining()
+            contacts_to_process = queue.consume()
         
-        for i, contact in enumerate(contacts_to_process):
-            email = contact.get('email', '')
-            print(f"\n[{i+1}/{len(contacts_to_process)}] Processing: {email}")
-            
-            if not EmailValidator.validate_email(email):
-                print(f"⚠ Invalid email address: {email}")
-                if skip_invalid:
-                    results['skipped'] += 1
-                    continue
-            
-            subject = self.generate_personalized_message(subject_template, contact)
-            body_content = self.generate_personalized_message(body_template, contact)
-            
-            if html:
-                title = self.generate_personalized_message(html_title, contact) if html_title else ""
-                footer = self.generate_personalized_message(html_footer, contact) if html_footer else ""
-                
-                if html_template_type == 'professional':
-                    body = HTMLTemplates.professional_template(title, body_content, footer)
-                elif html_template_type == 'simple':
-                    body = HTMLTemplates.simple_template(body_content)
-                else:
-                    body = HTMLTemplates.minimal_template(body_content)
-            else:
-                body = body_content
-            
-            success, error_msg = self.send_email_with_retry(
-                recipient=email,
-                subject=subject,
-                body=body,
-                attachments=attachments,
-                html=html
+        pipeline = None
+        if render_workers:
+            builder = self._message_builder(attachments, html)
+            renderer = CampaignRenderer(
+                self.sender_email, subject_template, body_template, html,
+                html_template_type, html_title, html_footer, boundary=builder.boundary
             )
-            
+            pipeline = RenderPipeline(renderer, builder, workers=render_workers)
+            rendered = pipeline.run(contacts_to_process)
+        elif rate_limiter is not None:
+            scheduler = DomainScheduler(contacts_to_process, rate_limiter,
+                                        account=self.sender_email, service=self.service)
+            rendered = ((contact, None, None) for contact in scheduler)
+        else:
+            rendered = ((contact, None, None) for contact in contacts_to_process)
+        if rate_limiter is not None:
+            delay = 0
+        
+        retries = RetryScheduler(self.retry_count, self.retry_delay)
+        attempted = False
+        processed = 0
+        
+        def finish(email: str, success: bool, error_msg: str):
             if success:
                 results['sent'] += 1
                 print(f"✓ Successfully sent to {email}")
@@ -216,8 +476,210 @@ class OutreachAgent:
                 results['failed_emails'].append({'email': email, 'error': error_msg})
                 print(f"✗ Failed to send to {email}: {error_msg}")
             
-            if i < len(contacts_to_process) - 1:
+            if queue is not None:
+                if success:
+                    queue.mark_sent(email)
+                else:
+                    queue.mark_failed(email, error_msg)
+            if recipient_index is not None:
+                if success:
+                    recipient_index.mark_sent(email)
+                else:
+                    recipient_index.release(email)
+        
+        def attempt(email: str, subject: str, msg: bytes, attempts: int, paced: bool):
+            nonlocal attempted
+            if delay and attempted:
                 time.sleep(delay)
+            attempted = True
+            if rate_limiter is not None and not paced:
+                rate_limiter.acquire(self.sender_email, self.service, recipient_domain(email))
+            
+            attempts += 1
+            success, error_msg, kind = self._try_send(email, subject, msg, attempts)
+            if not success and kind == RETRYABLE:
+                wait = retries.park((email, subject, msg), attempts)
+                if wait is not None:
+                    print(f"↻ Attempt {attempts} failed for {email}: {error_msg}; "
+                          f"retrying in {wait:.1f}s")
+                    return
+            if not success:
+                self._log_failure(email, subject, error_msg, attempts)
+            finish(email, success, error_msg)
+        
+        def retry_due():
+            due = retries.pop_due()
+            while due is not None:
+                (email, subject, msg), attempts = due
+                print(f"\n↻ Retrying {email} (attempt {attempts + 1}/{retries.max_attempts})")
+                attempt(email, subject, msg, attempts, paced=False)
+                due = retries.pop_due()
+        
+        with self.connection_pool(), closing(rendered):
+            for contact, subject, msg in rendered:
+                retry_due()
+                
+                email = contact.get('email', '')
+                if not self._reserve(email, results, recipient_index, queue):
+                    continue
+                print(f"\n[{format_progress(processed, total)}] Processing: {email}")
+                processed += 1
+                
+                if msg is None:
+                    subject, body = self._render_contact(
+                        contact, subject_template, body_template,
+                        html, html_template_type, html_title, html_footer
+                    )
+                    if not EmailValidator.validate_email(email):
+                        finish(email, False, f"Invalid email address: {email}")
+                        continue
+                    msg = self._build_message(email, subject, body, attachments, html)
+                
+                attempt(email, subject, msg, 0, paced=pipeline is None)
+            
+            # Source exhausted: wait out the remaining backoffs
+            while len(retries):
+                time.sleep(retries.wait_time())
+                retry_due()
+        
+        results['end_time'] = datetime.now().isoformat()
+        return results
+    
+    async def _send_with_retry_async(self,
+                                     executor: ThreadPoolExecutor,
+                                     recipient: str,
+                                     subject: str,
+                                     body: str,
+                                     attachments: Optional[List[str]] = None,
+                                     html: bool = False) -> Tuple[bool, str]:
+        """Async counterpart of ``send_email_with_retry``; backs off without blocking."""
+        loop = asyncio.get_running_loop()
+        max_retries = self.retry_count
+        last_error = ""
+        # Reading attachments is file I/O, so build in the executor as well
+        msg = await loop.run_in_executor(
+            executor, self._build_message, recipient, subject, body, attachments, html
+        )
+        
+        attempt = 0
+        for attempt in range(1, max_retries + 1):
+            success, last_error, kind = await loop.run_in_executor(
+                executor, self._try_send, recipient, subject, msg, attempt
+            )
+            if success:
+                return True, "Success"
+            
+            if kind == AUTH:
+                print(f"Authentication error - no retry: {last_error}")
+                break
+            print(f"Attempt {attempt}/{max_retries} failed for {recipient}: {last_error}")
+            if kind == PERMANENT:
+                break
+            
+            if attempt < max_retries:
+                await asyncio.sleep(backoff_delay(attempt, self.retry_delay))
+        
+        self._log_failure(recipient, subject, last_error, attempt)
+        return False, last_error
+    
+    async def send_bulk_outreach_async(self,
+                                       contacts: Iterable[Dict[str, str]],
+                                       subject_template: str,
+                                       body_template: str,
+                                       attachments: Optional[List[str]] = None,
+                                       concurrency: int = 10,
+                                       html: bool = False,
+                                       html_template_type: str = 'professional',
+                                       html_title: str = "",
+                                       html_footer: str = "",
+                                       max_emails: Optional[int] = None,
+                                       skip_invalid: bool = True,
+                                       rate_limiter: Optional[RateLimiter] = None,
+                                       domain_verifier: Optional[DomainVerifier] = None,
+                                       recipient_index: Optional[RecipientIndex] = None,
+                                       suppression: Optional[SuppressionList] = None) -> Dict:
+        """
+        Send personalized emails to multiple contacts concurrently.
+        
+        Up to ``concurrency`` deliveries are in flight at once, each on its
+        own pooled SMTP session. Retries back off with ``asyncio.sleep`` so
+        a slow recipient never holds up the others. An optional
+        ``rate_limiter`` paces and interleaves sends by recipient domain and
+        a ``domain_verifier`` drops undeliverable domains up front. A
+        ``recipient_index`` and a ``suppression`` list apply as in
+        ``send_bulk_outreach``.
+        Returns the same results dict as ``send_bulk_outreach``.
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        
+        results = {
+            'sent': 0, 
+            'failed': 0, 
+            'skipped': 0,
+            'failed_emails': [],
+            'start_time': datetime.now().isoformat()
+        }
+        
+        contacts_to_process, total = limit_contacts(contacts, max_emails)
+        contacts_to_process, total = self._valid_contacts(
+            contacts_to_process, total, results, skip_invalid, domain_verifier,
+            recipient_index, suppression)
+        scheduler = None
+        if rate_limiter is not None:
+            scheduler = DomainScheduler(contacts_to_process, rate_limiter,
+                                        account=self.sender_email, service=self.service)
+        pending = iter(contacts_to_process)
+        processed = 0
+        
+        async def next_contact() -> Optional[Dict[str, str]]:
+            if scheduler is not None:
+                return await scheduler.next_async()
+            return next(pending, None)
+        
+        async def worker():
+            nonlocal processed
+            while True:
+                contact = await next_contact()
+                if contact is None:
+                    return
+                email = contact.get('email', '')
+                if not self._reserve(email, results, recipient_index):
+                    continue
+                i = processed
+                processed += 1
+                print(f"\n[{format_progress(i, total)}] Processing: {email}")
+                
+                subject, body = self._render_contact(
+                    contact, subject_template, body_template,
+                    html, html_template_type, html_title, html_footer
+                )
+                
+                if not EmailValidator.validate_email(email):
+                    success, error_msg = False, f"Invalid email address: {email}"
+                else:
+                    success, error_msg = await self._send_with_retry_async(
+                        executor, email, subject, body, attachments, html
+                    )
+                
+                if success:
+                    results['sent'] += 1
+                    print(f"✓ Successfully sent to {email}")
+                else:
+                    results['failed'] += 1
+                    results['failed_emails'].append({'email': email, 'error': error_msg})
+                    print(f"✗ Failed to send to {email}: {error_msg}")
+                
+                if recipient_index is not None:
+                    if success:
+                        recipient_index.mark_sent(email)
+                    else:
+                        recipient_index.release(email)
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            with self.connection_pool(size=concurrency):
+                workers = concurrency if total is None else min(concurrency, max(1, total))
+                await asyncio.gather(*(worker() for _ in range(workers)))
         
         results['end_time'] = datetime.now().isoformat()
         return results
@@ -234,7 +696,12 @@ class OutreachAgent:
             return False, f"Connection failed: {str(e)}"
     
     def save_log(self, log_file: str):
-        """Save sent email log to JSON file."""
+        """
+        Save sent email log to JSON file.
+        
+        Only the in-memory ``sent_log`` is saved; when a streaming
+        ``send_log`` is attached its records are already on disk.
+        """
         import json
         with open(log_file, 'w', encoding='utf-8') as f:
             json.dump(self.sent_log, f, indent=2)
@@ -0,0 +1,101 @@
+"""Encode-once cache of attachment MIME parts for bulk campaigns."""
+
+import base64
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from email.mime.base import MIMEBase
+from pathlib import Path
+from typing import Tuple
+
+
+class AttachmentCache:
+    """
+    Read and base64-encode each attachment once, then hand the same
+    ready-made MIME part to every message of the campaign.
+
+    Parts are keyed by path, modification time and size, so an edited
+    file is re-encoded. Files at or above ``mmap_threshold`` bytes are
+    memory-mapped instead of read into a bytes object. The cache holds at
+    most ``max_bytes`` of encoded data and evicts least recently used
+    parts beyond that; a single part larger than the budget is returned
+    uncached.
+
+    Cached parts are shared between messages and must not be modified.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024,
+                 mmap_threshold: int = 8 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Budget for encoded attachment data held in memory
+            mmap_threshold: File size from which files are memory-mapped
+        """
+        self.max_bytes = max_bytes
+        self.mmap_threshold = mmap_threshold
+        self._parts: 'OrderedDict[Tuple[str, int, int], Tuple[MIMEBase, int]]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @property
+    def size(self) -> int:
+        """Bytes of encoded data currently cached."""
+        return self._size
+
+    def _encode(self, path: str, size: int) -> str:
+        """Base64-encode a file exactly as ``email.encoders.encode_base64`` would."""
+        with open(path, 'rb') as f:
+            if size and size >= self.mmap_threshold:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return base64.encodebytes(data).decode('ascii')
+            return base64.encodebytes(f.read()).decode('ascii')
+
+    def get_part(self, file_path: str) -> MIMEBase:
+        """
+        Return the encoded MIME part for ``file_path``.
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._parts.get(key)
+            if cached is not None:
+                self._parts.move_to_end(key)
+                self.stats['hits'] += 1
+                return cached[0]
+            self.stats['misses'] += 1
+
+        payload = self._encode(path, stat.st_size)
+        part = MIMEBase('application', 'octet-stream')
+        part.set_payload(payload)
+        part['Content-Transfer-Encoding'] = 'base64'
+        part.add_header('Content-Disposition', f'attachment; filename= {Path(path).name}')
+
+        cost = len(payload)
+        if cost > self.max_bytes:
+            return part
+
+        with self._lock:
+            # Drop stale versions of the same file
+            for stale in [k for k in self._parts if k[0] == path and k != key]:
+                self._size -= self._parts.pop(stale)[1]
+            if key not in self._parts:
+                self._parts[key] = (part, cost)
+                self._size += cost
+            while self._size > self.max_bytes:
+                _, (_, evicted_cost) = self._parts.popitem(last=False)
+                self._size -= evicted_cost
+                self.stats['evictions'] += 1
+            return self._parts[key][0] if key in self._parts else part
+
+    def clear(self):
+        """Drop all cached parts."""
+        with self._lock:
+            self._parts.clear()
+            self._size = 0
@@ -0,0 +1,259 @@
+"""Domain-level deliverability checks with a persistent lookup cache."""
+
+import json
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .rate_limiter import recipient_domain
+
+try:
+    import dns.exception
+    import dns.resolver
+except ImportError:  # without dnspython only the system resolver is used
+    dns = None
+
+Resolver = Callable[[str], List[str]]
+
+
+class DomainLookupError(Exception):
+    """A lookup failed for a temporary reason (timeout, SERVFAIL, ...)."""
+
+
+def dnspython_resolver(timeout: float = 5.0) -> Resolver:
+    """
+    Resolver that returns a domain's MX hosts using dnspython.
+
+    A domain without MX records falls back to its A/AAAA records (the
+    implicit MX of RFC 5321); a null MX (``.``) or NXDOMAIN yields no
+    hosts.
+    """
+    resolver = dns.resolver.Resolver()
+    resolver.lifetime = timeout
+
+    def resolve(domain: str) -> List[str]:
+        try:
+            answer = resolver.resolve(domain, 'MX')
+            hosts = [str(r.exchange).rstrip('.') for r in sorted(answer, key=lambda r: r.preference)]
+            return [h for h in hosts if h]
+        except dns.resolver.NXDOMAIN:
+            return []
+        except dns.resolver.NoAnswer:
+            pass
+        except dns.exception.DNSException as e:
+            raise DomainLookupError(str(e)) from e
+        for rdtype in ('A', 'AAAA'):
+            try:
+                if resolver.resolve(domain, rdtype):
+                    return [domain]
+            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+                continue
+            except dns.exception.DNSException as e:
+                raise DomainLookupError(str(e)) from e
+        return []
+
+    return resolve
+
+
+def socket_resolver(domain: str) -> List[str]:
+    """
+    Fallback resolver using the system resolver: a domain is reachable
+    if its name resolves to an address.
+
+    It cannot see MX records, and many mail domains have no address of
+    their own, so a failed lookup only means "unknown": it raises
+    ``DomainLookupError`` and never reports a domain undeliverable.
+    """
+    try:
+        socket.getaddrinfo(domain, 25, proto=socket.IPPROTO_TCP)
+        return [domain]
+    except socket.gaierror as e:
+        raise DomainLookupError(str(e)) from e
+
+
+def default_resolver() -> Resolver:
+    """dnspython MX lookups if installed, otherwise the system resolver."""
+    return dnspython_resolver() if dns is not None else socket_resolver
+
+
+class DomainVerifier:
+    """
+    Decide per recipient domain whether mail can be delivered at all,
+    so dead domains are dropped before any SMTP attempt.
+
+    Each unique domain is resolved once; results are kept in an LRU cache
+    of at most ``max_entries`` domains. Deliverable domains are trusted
+    for ``ttl`` seconds, undeliverable ones (negative caching) for
+    ``negative_ttl``. A lookup that fails temporarily counts as
+    deliverable and is retried after ``error_ttl``. With ``cache_path``
+    the cache is loaded from and saved to a JSON file so it survives
+    between campaigns; failed lookups are not saved.
+
+    The resolver is any callable mapping a domain to its mail hosts (an
+    empty list meaning undeliverable) that raises ``DomainLookupError``
+    on temporary failures, so tests can plug in a local stub.
+    """
+
+    def __init__(self,
+                 resolver: Optional[Resolver] = None,
+                 cache_path: Optional[str] = None,
+                 ttl: float = 24 * 3600,
+                 negative_ttl: float = 3600,
+                 error_ttl: float = 300,
+                 max_entries: int = 100_000,
+                 max_workers: int = 16,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            resolver: Domain -> mail hosts callable (default: ``default_resolver()``)
+            cache_path: JSON file used to persist the cache
+            ttl: Seconds a deliverable result is reused
+            negative_ttl: Seconds an undeliverable result is reused
+            error_ttl: Seconds before a failed lookup is retried
+            max_entries: Maximum number of cached domains
+            max_workers: Concurrent lookups
+            clock: Wall-clock time source (persisted expiry times use it)
+        """
+        self.resolver = resolver or default_resolver()
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.error_ttl = error_ttl
+        self.max_entries = max(1, max_entries)
+        self.max_workers = max(1, max_workers)
+        self.clock = clock
+        self.stats = {'hits': 0, 'misses': 0, 'lookups': 0, 'errors': 0}
+
+        # domain -> (deliverable, hosts, expires_at)
+        self._cache: 'OrderedDict[str, Tuple[bool, List[str], float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_path and os.path.exists(cache_path):
+            self.load()
+
+    def _cached(self, domain: str, now: float) -> Optional[bool]:
+        entry = self._cache.get(domain)
+        if entry is None:
+            return None
+        if entry[2] <= now:
+            del self._cache[domain]
+            return None
+        self._cache.move_to_end(domain)
+        return entry[0]
+
+    def _store(self, domain: str, deliverable: bool, hosts: List[str], ttl: float):
+        self._cache[domain] = (deliverable, hosts, self.clock() + ttl)
+        self._cache.move_to_end(domain)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _lookup(self, domain: str) -> bool:
+        try:
+            hosts = list(self.resolver(domain))
+        except (DomainLookupError, OSError):
+            with self._lock:
+                self.stats['lookups'] += 1
+                self.stats['errors'] += 1
+                self._store(domain, True, [], self.error_ttl)
+            return True
+        deliverable = bool(hosts)
+        with self._lock:
+            self.stats['lookups'] += 1
+            self._store(domain, deliverable, hosts,
+                        self.ttl if deliverable else self.negative_ttl)
+        return deliverable
+
+    def verify_domains(self, domains: Iterable[str]) -> Dict[str, bool]:
+        """
+        Return ``{domain: deliverable}`` for every distinct domain,
+        resolving the uncached ones concurrently.
+        """
+        results: Dict[str, bool] = {}
+        missing = []
+        now = self.clock()
+        with self._lock:
+            for domain in {d.strip().lower() for d in domains}:
+                if not domain:
+                    results[domain] = False
+                    continue
+                cached = self._cached(domain, now)
+                if cached is None:
+                    missing.append(domain)
+                    self.stats['misses'] += 1
+                else:
+                    results[domain] = cached
+                    self.stats['hits'] += 1
+
+        if len(missing) == 1:
+            results[missing[0]] = self._lookup(missing[0])
+        elif missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                results.update(zip(missing, executor.map(self._lookup, missing)))
+        return results
+
+    def is_deliverable(self, domain: str) -> bool:
+        """Return whether mail to ``domain`` can be delivered."""
+        domain = domain.strip().lower()
+        return self.verify_domains([domain]).get(domain, False)
+
+    def filter_contacts(self,
+                        contacts: Iterable[Dict[str, str]],
+                        on_undeliverable: Optional[Callable[[Dict[str, str]], None]] = None,
+                        batch_size: int = 1000) -> Iterator[Dict[str, str]]:
+        """
+        Yield only contacts whose domain is deliverable.
+
+        Contacts are read ``batch_size`` at a time; the distinct domains of
+        each batch are verified together, so a list with many addresses
+        per domain costs one lookup per domain.
+
+        Args:
+            contacts: List or stream of contact dictionaries
+            on_undeliverable: Called with each dropped contact
+            batch_size: Contacts per verification batch
+        """
+        source = iter(contacts)
+        while True:
+            batch = list(islice(source, batch_size))
+            if not batch:
+                return
+            domains = [recipient_domain(contact.get('email', '')) for contact in batch]
+            deliverable = self.verify_domains(domains)
+            for contact, domain in zip(batch, domains):
+                if deliverable.get(domain, False):
+                    yield contact
+                elif on_undeliverable is not None:
+                    on_undeliverable(contact)
+
+    def load(self):
+        """Load unexpired entries from ``cache_path``."""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Could not read domain cache {self.cache_path}: {e}")
+            return
+        now = self.clock()
+        with self._lock:
+            for domain, (deliverable, hosts, expires_at) in entries.items():
+                if expires_at > now:
+                    self._cache[domain] = (deliverable, hosts, expires_at)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def save(self):
+        """Write the cache to ``cache_path`` (least recently used first)."""
+        if not self.cache_path:
+            return
+        with self._lock:
+            # Deliverable without hosts marks a failed lookup, which is not worth keeping
+            entries = {domain: list(entry) for domain, entry in self._cache.items()
+                       if entry[1] or not entry[0]}
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.cache_path)
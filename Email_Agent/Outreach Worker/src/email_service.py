@@ -5,14 +5,26 @@ from typing import Dict
 
 
 class EmailServiceConfig:
-    """Predefined email service configurations."""
+    """Predefined email service configurations.
+    
+    ``rate_limit`` holds the fixed caps a provider publishes for an
+    account: ``daily_limit`` (recipients per day, used by ``SenderPool``)
+    and ``max_per_second``/``burst`` (a message rate, used by
+    ``RateLimiter``). Gmail allows 500 recipients a day from a personal
+    account; Exchange Online (Office 365) 30 messages a minute and 10,000
+    recipients a day. Other providers' limits depend on the plan or the
+    account's reputation, so they have no entry here: ``SenderPool``
+    falls back to its default quota and ``RateLimiter`` to the rates it
+    is given.
+    """
     
     SERVICES = {
         'gmail': {
             'smtp_server': 'smtp.gmail.com',
             'smtp_port': 587,
             'use_tls': True,
-            'description': 'Gmail SMTP (requires App Password)'
+            'description': 'Gmail SMTP (requires App Password)',
+            'rate_limit': {'daily_limit': 500}
         },
         'outlook': {
             'smtp_server': 'smtp-mail.outlook.com',
@@ -30,7 +42,8 @@ class EmailServiceConfig:
             'smtp_server': 'smtp.office365.com',
             'smtp_port': 587,
             'use_tls': True,
-            'description': 'Office 365 SMTP'
+            'description': 'Office 365 SMTP',
+            'rate_limit': {'max_per_second': 0.5, 'burst': 1, 'daily_limit': 10000}
         },
         'sendgrid': {
             'smtp_server': 'smtp.sendgrid.net',
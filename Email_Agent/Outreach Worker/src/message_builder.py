@@ -0,0 +1,77 @@
+"""Serialize outgoing messages from a per-campaign skeleton."""
+
+import uuid
+from email.mime.base import MIMEBase
+from email.mime.text import MIMEText
+from email.policy import SMTP
+from typing import Optional, Sequence
+
+CRLF = b'\r\n'
+
+
+def _header(name: str, value: str) -> bytes:
+    """Fold one header for the wire, RFC 2047-encoding non-ASCII text."""
+    return SMTP.fold_binary(*SMTP.header_store_parse(name, value))
+
+
+class MessageBuilder:
+    """
+    Produce wire-format (CRLF, ``sendmail``-ready) bytes for
+    ``multipart/mixed`` messages that share a sender, body type and
+    attachments.
+
+    Everything that is identical for every recipient -- the multipart
+    headers, the boundary and the already-encoded attachment parts -- is
+    serialized once when the builder is created. ``build`` only
+    serializes the recipient-specific headers and body part and splices
+    them into the skeleton.
+    """
+
+    def __init__(self, sender: str, html: bool = False,
+                 attachment_parts: Sequence[MIMEBase] = (),
+                 boundary: Optional[str] = None):
+        """
+        Args:
+            sender: From address
+            html: Send the body as text/html instead of text/plain
+            attachment_parts: Pre-encoded attachment parts (e.g. from
+                ``AttachmentCache``); they are serialized here once
+            boundary: Multipart boundary; random if not given. Builders
+                sharing a boundary produce interchangeable heads and tails.
+        """
+        self.sender = sender
+        self.html = html
+        self.attachment_parts = tuple(attachment_parts)
+
+        self.boundary = boundary = boundary or f"==============={uuid.uuid4().int}=="
+        self._delimiter = b'--' + boundary.encode('ascii')
+        self._head = (
+            f'Content-Type: multipart/mixed; boundary="{boundary}"'.encode('ascii') + CRLF
+            + b'MIME-Version: 1.0' + CRLF
+            + _header('From', sender)
+        )
+        self._tail = b''.join(
+            CRLF + self._delimiter + CRLF + part.as_bytes(policy=SMTP)
+            for part in self.attachment_parts
+        ) + CRLF + self._delimiter + b'--' + CRLF
+
+    @property
+    def tail(self) -> bytes:
+        """The shared attachment parts and closing boundary."""
+        return self._tail
+
+    def build_head(self, recipient: str, subject: str, body: str) -> bytes:
+        """Return the recipient-specific part of the message (everything before ``tail``)."""
+        body_part = MIMEText(body, 'html' if self.html else 'plain').as_bytes(policy=SMTP)
+        return b''.join((
+            self._head,
+            _header('To', recipient),
+            _header('Subject', subject),
+            CRLF,
+            self._delimiter, CRLF,
+            body_part,
+        ))
+
+    def build(self, recipient: str, subject: str, body: str) -> bytes:
+        """Return the complete message for one recipient."""
+        return self.build_head(recipient, subject, body) + self._tail
@@ -0,0 +1,167 @@
+"""Render messages in worker processes while the caller sends them."""
+
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .message_builder import MessageBuilder
+from .template_cache import compile_template
+from .templates import HTMLTemplates
+from .validators import EmailValidator
+
+Rendered = Tuple[Dict[str, str], Optional[str], Optional[bytes]]
+
+
+class CampaignRenderer:
+    """
+    Everything a worker process needs to turn a contact into message
+    bytes: the templates, the HTML wrapper settings and the multipart
+    boundary of the parent's ``MessageBuilder``.
+
+    Instances are small and picklable; attachments are not part of the
+    renderer because their (large, shared) encoded bytes stay in the
+    parent and are appended there.
+    """
+
+    def __init__(self,
+                 sender: str,
+                 subject_template: str,
+                 body_template: str,
+                 html: bool = False,
+                 html_template_type: str = 'professional',
+                 html_title: str = "",
+                 html_footer: str = "",
+                 boundary: Optional[str] = None):
+        """
+        Args:
+            sender: From address
+            subject_template: Subject with ``$name`` placeholders
+            body_template: Body with ``$name`` placeholders
+            html: Wrap the body in an HTML template and send it as text/html
+            html_template_type: 'professional', 'simple' or 'minimal'
+            html_title: Header title template (professional template only)
+            html_footer: Footer template (professional template only)
+            boundary: Multipart boundary shared with the parent's builder
+        """
+        self.sender = sender
+        self.subject_template = subject_template
+        self.body_template = body_template
+        self.html = html
+        self.html_template_type = html_template_type
+        self.html_title = html_title
+        self.html_footer = html_footer
+        self.boundary = boundary
+        self._builder: Optional[MessageBuilder] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_builder'] = None
+        return state
+
+    def render(self, contact: Dict[str, str]) -> Tuple[str, str]:
+        """Personalize subject and body for one contact."""
+        subject = compile_template(self.subject_template).render(contact)
+        body = compile_template(self.body_template).render(contact)
+        if not self.html:
+            return subject, body
+
+        title = compile_template(self.html_title).render(contact) if self.html_title else ""
+        footer = compile_template(self.html_footer).render(contact) if self.html_footer else ""
+        return subject, HTMLTemplates.wrap(self.html_template_type, body, title, footer)
+
+    def render_head(self, contact: Dict[str, str]) -> Tuple[Optional[str], Optional[bytes]]:
+        """
+        Render and serialize everything but the attachments for one contact.
+
+        Returns:
+            Tuple of (subject, message head), or (None, None) if the
+            contact's address is invalid
+        """
+        email = contact.get('email', '')
+        if not EmailValidator.validate_email(email):
+            return None, None
+        if self._builder is None:
+            self._builder = MessageBuilder(self.sender, self.html, boundary=self.boundary)
+        subject, body = self.render(contact)
+        return subject, self._builder.build_head(email, subject, body)
+
+
+def _render_batch(renderer: CampaignRenderer,
+                  contacts: List[Dict[str, str]]) -> List[Tuple[Optional[str], Optional[bytes]]]:
+    """Worker entry point: render one batch of contacts."""
+    return [renderer.render_head(contact) for contact in contacts]
+
+
+class RenderPipeline:
+    """
+    Two-stage send pipeline: a pool of worker processes renders and
+    serializes messages, while the consuming (I/O) stage sends them.
+
+    Contacts are cut into batches and submitted to the pool; at most
+    ``max_pending`` batches are in flight or waiting to be sent, so a
+    slow SMTP stage stops the pipeline from reading further contacts
+    (back-pressure) and a long contact stream is never buffered whole.
+    Results come back in input order. As long as rendering keeps ahead,
+    the consumer only ever picks up finished batches and never waits on
+    CPU work.
+    """
+
+    def __init__(self,
+                 renderer: CampaignRenderer,
+                 builder: MessageBuilder,
+                 workers: Optional[int] = None,
+                 batch_size: int = 32,
+                 max_pending: Optional[int] = None,
+                 executor: Optional[Executor] = None):
+        """
+        Args:
+            renderer: Templates and settings shipped to the workers
+            builder: Parent-side builder whose ``tail`` (attachments and
+                closing boundary) completes each rendered head; its
+                boundary must match ``renderer.boundary``
+            workers: Number of worker processes (default: CPU count)
+            batch_size: Contacts per task sent to a worker
+            max_pending: Maximum batches in flight (default: 2 per worker)
+            executor: Use this executor instead of creating a process pool
+        """
+        if renderer.boundary != builder.boundary:
+            raise ValueError("Renderer and builder must share a multipart boundary")
+        self.renderer = renderer
+        self.builder = builder
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size)
+        self.max_pending = max_pending or 2 * self.workers
+        self.executor = executor
+
+    def run(self, contacts: Iterable[Dict[str, str]]) -> Iterator[Rendered]:
+        """
+        Render ``contacts`` and yield ``(contact, subject, message)``.
+
+        ``message`` is the complete wire-format message; subject and
+        message are None for contacts with an invalid address. Closing the
+        iterator early cancels batches that have not started yet.
+        """
+        source = iter(contacts)
+        executor = self.executor or ProcessPoolExecutor(max_workers=self.workers)
+        pending = deque()
+        tail = self.builder.tail
+        try:
+            while True:
+                while len(pending) < self.max_pending:
+                    batch = list(islice(source, self.batch_size))
+                    if not batch:
+                        break
+                    pending.append((batch, executor.submit(_render_batch, self.renderer, batch)))
+                if not pending:
+                    return
+
+                batch, future = pending.popleft()
+                for contact, (subject, head) in zip(batch, future.result()):
+                    yield contact, subject, None if head is None else head + tail
+        finally:
+            for _, future in pending:
+                future.cancel()
+            if self.executor is None:
+                executor.shutdown(wait=True, cancel_futures=True)
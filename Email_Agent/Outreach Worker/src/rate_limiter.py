@@ -0,0 +1,287 @@
+"""Token-bucket rate limiting and domain-interleaving send scheduler."""
+
+import asyncio
+import heapq
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from .email_service import EmailServiceConfig
+
+
+class TokenBucket:
+    """
+    Classic token bucket: ``rate`` tokens per second, holding at most
+    ``capacity`` tokens (the allowed burst).
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (defaults to ``max(1, rate)``)
+            clock: Monotonic time source, injectable for tests
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, tokens: float = 1) -> float:
+        """Seconds until ``tokens`` would be available (0 if available now)."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def try_consume(self, tokens: float = 1) -> bool:
+        """Take ``tokens`` if available; return whether they were taken."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def consume(self, tokens: float = 1):
+        """Take ``tokens`` unconditionally (the balance may go negative)."""
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+
+
+class RateLimiter:
+    """
+    Hierarchy of token buckets keyed by sending account, service profile
+    and recipient domain. A send is allowed only when every bucket that
+    applies to it has a token.
+    """
+
+    def __init__(self,
+                 account_rate: Optional[float] = None,
+                 domain_rate: Optional[float] = None,
+                 service_rates: Optional[Dict[str, float]] = None,
+                 domain_overrides: Optional[Dict[str, float]] = None,
+                 burst: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            account_rate: Messages/second per sending account (None = unlimited)
+            domain_rate: Messages/second per recipient domain (None = unlimited)
+            service_rates: Messages/second per service profile; services not
+                listed fall back to ``EmailServiceConfig`` rate limits
+            domain_overrides: Per-domain rates, e.g. ``{'gmail.com': 2.0}``
+            burst: Bucket capacity for account and domain buckets
+            clock: Monotonic time source, injectable for tests
+        """
+        self.account_rate = account_rate
+        self.domain_rate = domain_rate
+        self.service_rates = dict(service_rates or {})
+        self.domain_overrides = {k.lower(): v for k, v in (domain_overrides or {}).items()}
+        self.burst = burst
+        self.clock = clock
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _rate_for(self, scope: str, key: str) -> Optional[float]:
+        if scope == 'account':
+            return self.account_rate
+        if scope == 'domain':
+            return self.domain_overrides.get(key, self.domain_rate)
+        if key in self.service_rates:
+            return self.service_rates[key]
+        return EmailServiceConfig.SERVICES.get(key, {}).get('rate_limit', {}).get('max_per_second')
+
+    def _burst_for(self, scope: str, key: str) -> Optional[float]:
+        if scope == 'service':
+            limits = EmailServiceConfig.SERVICES.get(key, {}).get('rate_limit', {})
+            if 'burst' in limits and key not in self.service_rates:
+                return limits['burst']
+        return self.burst
+
+    def _get_bucket(self, scope: str, key: str) -> Optional[TokenBucket]:
+        key = key.lower()
+        bucket = self._buckets.get((scope, key))
+        if bucket is None:
+            rate = self._rate_for(scope, key)
+            if rate is None:
+                return None
+            bucket = self._buckets[(scope, key)] = TokenBucket(
+                rate, self._burst_for(scope, key), clock=self.clock
+            )
+        return bucket
+
+    def _applicable(self, account: Optional[str], service: Optional[str],
+                    domain: Optional[str]) -> list:
+        buckets = []
+        for scope, key in (('account', account), ('service', service), ('domain', domain)):
+            if key:
+                bucket = self._get_bucket(scope, key)
+                if bucket is not None:
+                    buckets.append(bucket)
+        return buckets
+
+    def bucket(self, scope: str, key: str) -> Optional[TokenBucket]:
+        """Return the bucket for ``scope`` ('account', 'service', 'domain') and key."""
+        with self._lock:
+            return self._get_bucket(scope, key)
+
+    def wait_time(self, account: Optional[str] = None, service: Optional[str] = None,
+                  domain: Optional[str] = None) -> float:
+        """Seconds until a send through all applicable buckets is allowed."""
+        with self._lock:
+            buckets = self._applicable(account, service, domain)
+        return max([b.wait_time() for b in buckets], default=0.0)
+
+    def try_acquire(self, account: Optional[str] = None, service: Optional[str] = None,
+                    domain: Optional[str] = None) -> bool:
+        """Take one token from every applicable bucket, or none if any is empty."""
+        with self._lock:
+            buckets = self._applicable(account, service, domain)
+            if any(b.wait_time() > 0 for b in buckets):
+                return False
+            for b in buckets:
+                b.consume()
+            return True
+
+    def acquire(self, account: Optional[str] = None, service: Optional[str] = None,
+                domain: Optional[str] = None):
+        """Block until a token has been taken from every applicable bucket."""
+        while not self.try_acquire(account, service, domain):
+            time.sleep(max(self.wait_time(account, service, domain), 0.001))
+
+
+def recipient_domain(email: str) -> str:
+    """Return the lower-cased domain part of an address ('' if none)."""
+    return email.rsplit('@', 1)[-1].strip().lower() if '@' in (email or '') else ''
+
+
+class DomainScheduler:
+    """
+    Reorder a contact stream so that sends are spread across recipient
+    domains: while one domain's budget is exhausted, contacts for other
+    domains are sent instead of waiting.
+
+    Contacts are read ahead into per-domain queues (at most ``lookahead``
+    at a time); a min-heap keyed by each domain's next-ready time picks
+    the next domain, with ties served round-robin.
+    """
+
+    def __init__(self,
+                 contacts: Iterable[Dict[str, str]],
+                 limiter: RateLimiter,
+                 account: Optional[str] = None,
+                 service: Optional[str] = None,
+                 lookahead: int = 1000):
+        """
+        Args:
+            contacts: Contact dictionaries with an 'email' key
+            limiter: Rate limiter holding the budgets
+            account: Sending account key for the limiter
+            service: Service profile key for the limiter
+            lookahead: Maximum number of contacts buffered for reordering
+        """
+        self.limiter = limiter
+        self.account = account
+        self.service = service
+        self.lookahead = max(1, lookahead)
+        self._source = iter(contacts)
+        self._source_done = False
+        self._queues: Dict[str, deque] = {}
+        self._ready = []  # heap of (ready_at, seq, domain)
+        self._seq = 0
+        self._buffered = 0
+
+    @property
+    def done(self) -> bool:
+        """True once every contact has been handed out."""
+        return self._source_done and self._buffered == 0
+
+    def _push(self, domain: str, ready_at: float):
+        self._seq += 1
+        heapq.heappush(self._ready, (ready_at, self._seq, domain))
+
+    def _fill(self):
+        while not self._source_done and self._buffered < self.lookahead:
+            try:
+                contact = next(self._source)
+            except StopIteration:
+                self._source_done = True
+                break
+            domain = recipient_domain(contact.get('email', ''))
+            queue = self._queues.get(domain)
+            if queue is None:
+                queue = self._queues[domain] = deque()
+                self._push(domain, self.limiter.clock())
+            queue.append(contact)
+            self._buffered += 1
+
+    def poll(self) -> Tuple[Optional[Dict[str, str]], float]:
+        """
+        Return ``(contact, 0.0)`` if a contact may be sent now, otherwise
+        ``(None, seconds_to_wait)``. Returns ``(None, 0.0)`` when done.
+        """
+        self._fill()
+        if not self._ready:
+            return None, 0.0
+
+        sender_wait = self.limiter.wait_time(self.account, self.service)
+        if sender_wait > 0:
+            return None, sender_wait
+
+        now = self.limiter.clock()
+        while self._ready:
+            ready_at, _, domain = self._ready[0]
+            if ready_at > now:
+                return None, ready_at - now
+            heapq.heappop(self._ready)
+
+            if self.limiter.try_acquire(self.account, self.service, domain):
+                queue = self._queues[domain]
+                contact = queue.popleft()
+                self._buffered -= 1
+                if queue:
+                    self._push(domain, now + self.limiter.wait_time(domain=domain))
+                else:
+                    del self._queues[domain]
+                return contact, 0.0
+
+            domain_wait = self.limiter.wait_time(domain=domain)
+            if domain_wait == 0:
+                # The sender budget ran out between checks; retry this domain first
+                self._push(domain, now)
+                return None, self.limiter.wait_time(self.account, self.service)
+            self._push(domain, now + domain_wait)
+
+        return None, 0.0
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        """Yield contacts in send order, sleeping while every budget is exhausted."""
+        while True:
+            contact, wait = self.poll()
+            if contact is not None:
+                yield contact
+            elif self.done:
+                return
+            else:
+                time.sleep(wait)
+
+    async def next_async(self) -> Optional[Dict[str, str]]:
+        """Return the next contact to send (None when done), waiting without blocking."""
+        while True:
+            contact, wait = self.poll()
+            if contact is not None or self.done:
+                return contact
+            await asyncio.sleep(wait)
@@ -0,0 +1,239 @@
+"""Persistent per-recipient contact history with frequency caps."""
+
+import os
+import sqlite3
+import time
+from collections import Counter
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from .validators import EmailValidator
+
+
+class RecipientIndex:
+    """
+    Which addresses were contacted when, by which campaign, in SQLite.
+
+    Addresses are normalized with ``EmailValidator.clean_email``, so case
+    and whitespace variants count as the same recipient. The index
+    enforces a frequency cap of at most ``max_contacts`` messages per
+    address within ``window`` seconds, across all campaigns.
+
+    ``reserve`` checks the cap and records the contact in one immediate
+    transaction. Campaign runs in several processes can therefore share
+    one index file, and only one of them gets a given address. A
+    reservation is kept when the send succeeds (``mark_sent``) and
+    removed when it fails (``release``). If the process dies in between,
+    the reservation stays and the address counts as contacted. Sending
+    twice is worse than sending once too few.
+
+    Addresses found to be capped are remembered in memory until their cap
+    would expire, so further repeats within a list are rejected without a
+    query.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS recipient_contacts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT NOT NULL,
+            campaign TEXT NOT NULL,
+            contacted_at REAL NOT NULL,
+            status TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_recipient_contacts_email
+            ON recipient_contacts (email, contacted_at);
+    """
+
+    RESERVED = 'reserved'
+    SENT = 'sent'
+
+    def __init__(self,
+                 db_path: str,
+                 campaign_id: str = 'default',
+                 max_contacts: int = 1,
+                 window: float = 7 * 24 * 3600,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            db_path: SQLite database file (shared between campaigns)
+            campaign_id: Campaign recorded on new contacts
+            max_contacts: Messages allowed per address within ``window``
+            window: Length of the frequency-cap window in seconds
+            clock: Wall-clock time source, injectable for tests
+        """
+        if max_contacts < 1:
+            raise ValueError("max_contacts must be at least 1")
+        self.db_path = db_path
+        self.campaign_id = campaign_id
+        self.max_contacts = max_contacts
+        self.window = window
+        self.clock = clock
+        self.stats = {'reserved': 0, 'capped': 0, 'released': 0}
+
+        # email -> time until which it is treated as capped
+        self._capped_until: Dict[str, float] = {}
+        # email -> row id of this run's reservation
+        self._reserved: Dict[str, int] = {}
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def _reserve_one(self, email: str, now: float, new: Dict[str, int]) -> bool:
+        if self._capped_until.get(email, 0) > now:
+            return False
+        count, oldest = self._conn.execute(
+            "SELECT COUNT(*), MIN(contacted_at) FROM recipient_contacts "
+            "WHERE email = ? AND contacted_at > ?",
+            (email, now - self.window)
+        ).fetchone()
+        if count >= self.max_contacts:
+            # The cap lifts at the earliest when the oldest contact leaves the window
+            self._capped_until[email] = oldest + self.window
+            return False
+        cursor = self._conn.execute(
+            "INSERT INTO recipient_contacts (email, campaign, contacted_at, status) "
+            "VALUES (?, ?, ?, ?)",
+            (email, self.campaign_id, now, self.RESERVED)
+        )
+        new[email] = cursor.lastrowid
+        return True
+
+    def reserve_many(self, emails: Iterable[str]) -> List[bool]:
+        """
+        Reserve several addresses in one transaction.
+
+        Returns:
+            For each address, whether it may be contacted now (and has
+            been recorded) or is over its frequency cap
+        """
+        emails = [EmailValidator.clean_email(email) for email in emails]
+        now = self.clock()
+        new: Dict[str, int] = {}
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            allowed = [bool(email) and self._reserve_one(email, now, new) for email in emails]
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._reserved.update(new)
+        granted = sum(allowed)
+        self.stats['reserved'] += granted
+        self.stats['capped'] += len(allowed) - granted
+        return allowed
+
+    def reserve(self, email: str) -> bool:
+        """Record a contact with ``email`` now unless that would exceed its cap."""
+        return self.reserve_many([email])[0]
+
+    def count_allowed(self, emails: Iterable[str]) -> int:
+        """
+        How many of ``emails`` ``reserve_many`` would allow right now,
+        without reserving any. Repeats within ``emails`` count against
+        the cap like earlier contacts do.
+        """
+        counts = Counter(EmailValidator.clean_email(email) for email in emails)
+        counts.pop('', None)
+        now = self.clock()
+        distinct = [email for email in counts if self._capped_until.get(email, 0) <= now]
+        allowed = 0
+        for start in range(0, len(distinct), 500):
+            chunk = distinct[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            used = dict(self._conn.execute(
+                "SELECT email, COUNT(*) FROM recipient_contacts "
+                f"WHERE email IN ({placeholders}) AND contacted_at > ? GROUP BY email",
+                (*chunk, now - self.window)
+            ))
+            for email in chunk:
+                allowed += max(0, min(counts[email], self.max_contacts - used.get(email, 0)))
+        return allowed
+
+    def mark_sent(self, email: str):
+        """Confirm this run's reservation and stamp it with the send time."""
+        row_id = self._reserved.pop(EmailValidator.clean_email(email), None)
+        if row_id is not None:
+            self._conn.execute(
+                "UPDATE recipient_contacts SET status = ?, contacted_at = ? WHERE id = ?",
+                (self.SENT, self.clock(), row_id)
+            )
+
+    def release(self, email: str):
+        """Drop this run's reservation for ``email``, e.g. after a failed send."""
+        email = EmailValidator.clean_email(email)
+        row_id = self._reserved.pop(email, None)
+        if row_id is not None:
+            self._conn.execute("DELETE FROM recipient_contacts WHERE id = ?", (row_id,))
+            self._capped_until.pop(email, None)
+            self.stats['released'] += 1
+
+    def filter_contacts(self,
+                        contacts: Iterable[Dict[str, str]],
+                        on_capped: Optional[Callable[[Dict[str, str]], None]] = None,
+                        batch_size: int = 100) -> Iterator[Dict[str, str]]:
+        """
+        Reserve contacts ``batch_size`` at a time and yield those allowed.
+
+        If the consumer stops early, reservations for contacts not yet
+        yielded are released again.
+
+        Args:
+            contacts: List or stream of contact dictionaries
+            on_capped: Called with each contact over its frequency cap
+            batch_size: Contacts reserved per transaction
+        """
+        source = iter(contacts)
+        while True:
+            batch = list(islice(source, batch_size))
+            if not batch:
+                return
+            allowed = self.reserve_many(contact.get('email', '') for contact in batch)
+            for index, (contact, ok) in enumerate(zip(batch, allowed)):
+                if not ok:
+                    if on_capped is not None:
+                        on_capped(contact)
+                    continue
+                try:
+                    yield contact
+                except GeneratorExit:
+                    for rest, rest_ok in zip(batch[index + 1:], allowed[index + 1:]):
+                        if rest_ok:
+                            self.release(rest.get('email', ''))
+                    raise
+
+    def last_contacted(self, email: str, campaign_id: Optional[str] = None) -> Optional[float]:
+        """Time ``email`` was last contacted, optionally by one campaign only."""
+        query = "SELECT MAX(contacted_at) FROM recipient_contacts WHERE email = ?"
+        params = [EmailValidator.clean_email(email)]
+        if campaign_id is not None:
+            query += " AND campaign = ?"
+            params.append(campaign_id)
+        return self._conn.execute(query, params).fetchone()[0]
+
+    def prune(self, older_than: Optional[float] = None) -> int:
+        """
+        Delete contacts older than ``older_than`` seconds (default: the
+        cap window), which no longer affect any cap.
+
+        Returns:
+            Number of rows deleted
+        """
+        cutoff = self.clock() - (self.window if older_than is None else older_than)
+        cursor = self._conn.execute(
+            "DELETE FROM recipient_contacts WHERE contacted_at <= ?", (cutoff,))
+        return cursor.rowcount
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> 'RecipientIndex':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,111 @@
+"""SMTP error classification and a non-blocking delayed-retry queue."""
+
+import heapq
+import itertools
+import random
+import smtplib
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+RETRYABLE = 'retryable'
+PERMANENT = 'permanent'
+AUTH = 'auth'
+
+
+def classify_smtp_error(error: BaseException) -> str:
+    """
+    Decide whether a failed delivery is worth retrying.
+
+    Returns:
+        ``AUTH`` for authentication failures (retrying cannot help and
+        the whole account is affected), ``PERMANENT`` for 5xx replies
+        (including every recipient refused with 5xx), and ``RETRYABLE``
+        for 4xx replies, dropped connections, timeouts and other errors
+    """
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return AUTH
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return PERMANENT if codes and all(code >= 500 for code in codes) else RETRYABLE
+    code = getattr(error, 'smtp_code', None)
+    if isinstance(code, int) and code >= 500:
+        return PERMANENT
+    return RETRYABLE
+
+
+def backoff_delay(attempt: int,
+                  base: float,
+                  cap: float = 300.0,
+                  rng: Callable[[], float] = random.random) -> float:
+    """
+    Jittered exponential backoff before retry number ``attempt`` (1-based).
+
+    The nominal delay ``base * 2 ** (attempt - 1)``, capped at ``cap``,
+    is randomized to between half and all of itself ("equal jitter"), so
+    recipients that failed together do not all come back at once while
+    each still waits at least half the nominal delay.
+    """
+    nominal = min(cap, base * (2 ** max(0, attempt - 1)))
+    return nominal / 2 + rng() * nominal / 2
+
+
+class RetryScheduler:
+    """
+    Min-heap of failed sends keyed by the time their next attempt is due.
+
+    Instead of sleeping after a failure, the send loop ``park``s the item
+    and moves on; ``pop_due`` hands back items whose backoff has elapsed.
+    Items are retried until ``max_attempts`` attempts have been made.
+    """
+
+    def __init__(self,
+                 max_attempts: int = 3,
+                 base_delay: float = 5.0,
+                 max_delay: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 rng: Callable[[], float] = random.random):
+        """
+        Args:
+            max_attempts: Total attempts per item, including the first
+            base_delay: Nominal delay before the first retry (seconds)
+            max_delay: Upper bound for the nominal delay
+            clock: Monotonic time source, injectable for tests
+            rng: Uniform [0, 1) source for jitter, injectable for tests
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.rng = rng
+        self._heap: List[Tuple[float, int, int, Any]] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def park(self, item: Any, attempts: int) -> Optional[float]:
+        """
+        Schedule another attempt for ``item`` after ``attempts`` failed ones.
+
+        Returns:
+            The delay in seconds, or None if no attempts are left (the
+            item is then not parked)
+        """
+        if attempts >= self.max_attempts:
+            return None
+        delay = backoff_delay(attempts, self.base_delay, self.max_delay, self.rng)
+        heapq.heappush(self._heap, (self.clock() + delay, next(self._seq), attempts, item))
+        return delay
+
+    def wait_time(self) -> Optional[float]:
+        """Seconds until the next item is due (0 if one is due), or None if empty."""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - self.clock())
+
+    def pop_due(self) -> Optional[Tuple[Any, int]]:
+        """Return ``(item, attempts_so_far)`` for the earliest due item, or None."""
+        if self._heap and self._heap[0][0] <= self.clock():
+            _, _, attempts, item = heapq.heappop(self._heap)
+            return item, attempts
+        return None
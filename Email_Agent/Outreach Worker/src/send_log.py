@@ -0,0 +1,190 @@
+"""Append-only JSON Lines send log written by a background thread."""
+
+import gzip
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+_STOP = object()
+
+
+class SendLog:
+    """
+    Buffered, append-only JSON Lines log of send results.
+
+    ``append`` only puts the record on a bounded in-memory queue; a
+    background thread writes queued records in batches (at most
+    ``batch_size`` records or ``flush_interval`` seconds apart) and
+    flushes after every batch, so other processes can tail the file while
+    a campaign runs. Memory use is capped at ``max_queued`` records: when
+    the writer falls behind, ``append`` blocks instead of buffering more.
+
+    With ``max_bytes`` the active file is rotated once it reaches that
+    size: it is renamed to ``<path>.1``, ``<path>.2``, ... (gzip-compressed
+    to ``<path>.N.gz`` when ``compress`` is set) and a new file is started.
+    The active file itself is always plain text so it stays tail-able.
+    ``read_send_log`` reads all segments back in order.
+    """
+
+    def __init__(self,
+                 path: str,
+                 batch_size: int = 500,
+                 flush_interval: float = 1.0,
+                 max_bytes: int = 0,
+                 compress: bool = False,
+                 max_queued: int = 10000):
+        """
+        Args:
+            path: Active log file (created, or appended to if it exists)
+            batch_size: Maximum records written per batch
+            flush_interval: Maximum seconds a record waits before it is written
+            max_bytes: Rotate the active file at this size; 0 disables rotation
+            compress: Gzip rotated segments
+            max_queued: Maximum records buffered in memory
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.stats = {'records': 0, 'batches': 0, 'rotations': 0}
+
+        self._queue = queue.Queue(maxsize=max(1, max_queued))
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._segment = max(_segment_numbers(self.path), default=0)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._thread = threading.Thread(target=self._run, name='send-log-writer', daemon=True)
+        self._thread.start()
+
+    def append(self, record: Dict):
+        """
+        Queue one record for writing.
+
+        Raises:
+            ValueError: If the log has been closed
+        """
+        if self._closed:
+            raise ValueError("Send log is closed")
+        self._queue.put(record)
+
+    def flush(self):
+        """Block until every record appended so far has been written."""
+        if not self._closed:
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait()
+        self._raise_error()
+
+    def close(self):
+        """Write outstanding records and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._file.close()
+        self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch: List[Dict] = []
+            waiters: List[threading.Event] = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    print(f"⚠ Failed to write send log {self.path}: {e}")
+                    self._error = self._error or e
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _write(self, batch: List[Dict]):
+        self._file.write(''.join(
+            json.dumps(record, ensure_ascii=False, default=str) + '\n' for record in batch
+        ))
+        self._file.flush()
+        self.stats['records'] += len(batch)
+        self.stats['batches'] += 1
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        self._segment += 1
+        target = Path(f"{self.path}.{self._segment}")
+        os.replace(self.path, target)
+        if self.compress:
+            with open(target, 'rb') as src, gzip.open(f"{target}.gz", 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            target.unlink()
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self.stats['rotations'] += 1
+
+    def __enter__(self) -> 'SendLog':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _segment_numbers(path: Path) -> List[int]:
+    pattern = re.compile(re.escape(path.name) + r'\.(\d+)(\.gz)?$')
+    if not path.parent.exists():
+        return []
+    return [int(m.group(1)) for m in map(pattern.match, os.listdir(path.parent)) if m]
+
+
+def read_send_log(path: str) -> Iterator[Dict]:
+    """
+    Yield every record of a send log: rotated segments oldest first, then
+    the active file. An incomplete last line (a write in progress) is
+    skipped.
+    """
+    path = Path(path)
+    files = []
+    for number in sorted(set(_segment_numbers(path))):
+        segment = Path(f"{path}.{number}")
+        files.append(segment if segment.exists() else Path(f"{segment}.gz"))
+    if path.exists():
+        files.append(path)
+
+    for file in files:
+        opener = gzip.open if file.suffix == '.gz' else open
+        with opener(file, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.endswith('\n'):
+                    yield json.loads(line)
@@ -0,0 +1,292 @@
+"""Durable SQLite-backed send queue with checkpoint and resume."""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class SendQueue:
+    """
+    Per-recipient campaign state stored in SQLite.
+
+    Every contact moves through ``pending -> in_flight -> sent | failed``.
+    State is committed as the campaign progresses, so a restarted run
+    only picks up recipients that were not sent yet. Several worker
+    processes can consume the same queue: contacts are claimed in small
+    batches inside an immediate transaction and leased to one worker.
+
+    While a worker holds leases, a background thread renews them every
+    third of ``lease_seconds``, so a slow send never loses its contact to
+    another worker. Contacts return to pending when their lease expires,
+    or at once when the worker that holds them is known to be gone: a
+    process on this host that no longer exists, or an earlier run with
+    the same ``worker_id``. Only the worker holding a lease can mark the
+    contact sent or failed.
+    """
+
+    PENDING = 'pending'
+    IN_FLIGHT = 'in_flight'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS send_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            campaign TEXT NOT NULL,
+            email TEXT NOT NULL,
+            contact TEXT NOT NULL,
+            status TEXT NOT NULL,
+            worker TEXT,
+            lease_until REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            updated_at TEXT,
+            UNIQUE (campaign, email)
+        );
+        CREATE INDEX IF NOT EXISTS idx_send_queue_status
+            ON send_queue (campaign, status, id);
+    """
+
+    def __init__(self, db_path: str, campaign_id: str = 'default',
+                 lease_seconds: float = 300.0, worker_id: Optional[str] = None):
+        """
+        Args:
+            db_path: SQLite database file
+            campaign_id: Campaign the queue entries belong to
+            lease_seconds: How long a claimed contact stays reserved for
+                this worker before other workers may take it over
+            worker_id: Identifier recorded on claimed rows (defaults to
+                host:pid:random, which lets a crashed process be recognized)
+        """
+        self.db_path = db_path
+        self.campaign_id = campaign_id
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._heartbeat: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+        # Leases recorded under our id were left by an earlier run that used it
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._reclaim(time.time(), [self.worker_id])
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def enqueue(self, contacts: Iterable[Dict[str, str]]) -> int:
+        """
+        Add contacts as pending; contacts already queued for this campaign
+        (in any state) are left untouched.
+
+        Returns:
+            Number of newly queued contacts
+        """
+        now = datetime.now().isoformat()
+        rows = (
+            (self.campaign_id, contact.get('email', ''), json.dumps(contact), self.PENDING, now)
+            for contact in contacts
+        )
+        before = self._conn.total_changes
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO send_queue (campaign, email, contact, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return self._conn.total_changes - before
+
+    def _is_orphaned(self, worker: str) -> bool:
+        """True if ``worker`` is a process on this host that no longer exists."""
+        host, _, rest = worker.partition(':')
+        pid = rest.partition(':')[0]
+        if worker == self.worker_id or host != socket.gethostname() or not pid.isdigit():
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        return False
+
+    def _reclaim(self, now: float, workers: Iterable[str] = ()):
+        """
+        Return expired leases, and any held by ``workers``, to pending.
+        Call inside a transaction.
+        """
+        self._conn.execute(
+            "UPDATE send_queue SET status = ?, worker = NULL, lease_until = NULL "
+            "WHERE campaign = ? AND status = ? AND lease_until < ?",
+            (self.PENDING, self.campaign_id, self.IN_FLIGHT, now)
+        )
+        self._conn.executemany(
+            "UPDATE send_queue SET status = ?, worker = NULL, lease_until = NULL "
+            "WHERE campaign = ? AND status = ? AND worker = ?",
+            [(self.PENDING, self.campaign_id, self.IN_FLIGHT, worker) for worker in workers]
+        )
+
+    def claim(self, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Atomically lease up to ``limit`` pending contacts to this worker.
+
+        Expired and orphaned leases are returned to pending first, so
+        contacts held by a crashed worker are picked up again.
+        """
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            holders = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT worker FROM send_queue WHERE campaign = ? AND status = ?",
+                (self.campaign_id, self.IN_FLIGHT)
+            ) if row[0] is not None]
+            self._reclaim(now, [worker for worker in holders if self._is_orphaned(worker)])
+            rows = self._conn.execute(
+                "SELECT id, contact FROM send_queue WHERE campaign = ? AND status = ? "
+                "ORDER BY id LIMIT ?",
+                (self.campaign_id, self.PENDING, limit)
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE send_queue SET status = ?, worker = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                [(self.IN_FLIGHT, self.worker_id, now + self.lease_seconds,
+                  datetime.now().isoformat(), row[0]) for row in rows]
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        if rows:
+            self._start_heartbeat()
+        return [json.loads(row[1]) for row in rows]
+
+    def renew(self) -> int:
+        """
+        Extend the leases this worker holds by ``lease_seconds``.
+
+        Returns:
+            Number of leases renewed
+        """
+        return self._renew(self._conn)
+
+    def _renew(self, conn: sqlite3.Connection) -> int:
+        return conn.execute(
+            "UPDATE send_queue SET lease_until = ? WHERE campaign = ? AND status = ? AND worker = ?",
+            (time.time() + self.lease_seconds, self.campaign_id, self.IN_FLIGHT, self.worker_id)
+        ).rowcount
+
+    def _start_heartbeat(self):
+        if self._heartbeat is not None or self.lease_seconds <= 0:
+            return
+        self._heartbeat = threading.Thread(target=self._run_heartbeat,
+                                           name='send-queue-heartbeat', daemon=True)
+        self._heartbeat.start()
+
+    def _run_heartbeat(self):
+        # SQLite connections can't be shared between threads, so renew on our own
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            while not self._stop.wait(self.lease_seconds / 3):
+                try:
+                    self._renew(conn)
+                except sqlite3.Error as e:
+                    print(f"⚠ Could not renew send queue leases: {e}")
+        finally:
+            conn.close()
+
+    def _finish(self, email: str, status: str, error: Optional[str] = None) -> bool:
+        return self._conn.execute(
+            "UPDATE send_queue SET status = ?, error = ?, lease_until = NULL, updated_at = ? "
+            "WHERE campaign = ? AND email = ? AND status = ? AND worker = ?",
+            (status, error, datetime.now().isoformat(), self.campaign_id, email,
+             self.IN_FLIGHT, self.worker_id)
+        ).rowcount > 0
+
+    def mark_sent(self, email: str) -> bool:
+        """
+        Record a successful delivery.
+
+        Returns:
+            False if this worker no longer held the contact's lease (it was
+            reclaimed by another worker), in which case nothing is recorded
+        """
+        return self._finish(email, self.SENT)
+
+    def mark_failed(self, email: str, error: str = "") -> bool:
+        """Record a permanent failure; returns False like ``mark_sent``."""
+        return self._finish(email, self.FAILED, error)
+
+    def release(self, emails: Iterable[str]):
+        """Return contacts leased by this worker to pending without sending."""
+        self._conn.executemany(
+            "UPDATE send_queue SET status = ?, worker = NULL, lease_until = NULL "
+            "WHERE campaign = ? AND email = ? AND status = ? AND worker = ?",
+            [(self.PENDING, self.campaign_id, email, self.IN_FLIGHT, self.worker_id)
+             for email in emails]
+        )
+
+    def consume(self, batch_size: int = 10) -> Iterator[Dict[str, str]]:
+        """
+        Yield claimed contacts until the queue is drained.
+
+        The caller must ``mark_sent``/``mark_failed`` each contact. If the
+        consumer stops early, contacts claimed but not yet yielded are
+        released back to pending.
+        """
+        while True:
+            batch = self.claim(batch_size)
+            if not batch:
+                return
+            for index, contact in enumerate(batch):
+                try:
+                    yield contact
+                except GeneratorExit:
+                    self.release(c.get('email', '') for c in batch[index + 1:])
+                    raise
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of contacts in each state."""
+        counts = {self.PENDING: 0, self.IN_FLIGHT: 0, self.SENT: 0, self.FAILED: 0}
+        for status, count in self._conn.execute(
+            "SELECT status, COUNT(*) FROM send_queue WHERE campaign = ? GROUP BY status",
+            (self.campaign_id,)
+        ):
+            counts[status] = count
+        return counts
+
+    def remaining(self) -> int:
+        """Number of contacts not yet sent or failed."""
+        counts = self.stats()
+        return counts[self.PENDING] + counts[self.IN_FLIGHT]
+
+    def close(self):
+        """Stop renewing leases and close the database connection."""
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+        self._conn.close()
+
+    def __enter__(self) -> 'SendQueue':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,340 @@
+"""Shard outreach across several sending accounts."""
+
+import smtplib
+import time
+from contextlib import ExitStack
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .agent import OutreachAgent
+from .domain_check import DomainVerifier
+from .email_service import EmailServiceConfig
+from .retry import AUTH, RETRYABLE, RetryScheduler, classify_smtp_error
+from .send_log import SendLog
+from .suppression import SuppressionList
+from .utils import format_progress, limit_contacts
+from .validators import EmailValidator
+
+
+class SenderAccount:
+    """One SMTP identity in a ``SenderPool`` plus its quota and health state."""
+
+    DEFAULT_DAILY_LIMIT = 500
+
+    def __init__(self,
+                 email: str,
+                 password: str,
+                 service: str = 'gmail',
+                 custom_smtp: Optional[Dict] = None,
+                 daily_limit: Optional[int] = None,
+                 sent_today: int = 0):
+        """
+        Args:
+            email: Sender email address
+            password: Email password or app-specific password
+            service: Email service name ('gmail', 'outlook', 'yahoo', etc.)
+            custom_smtp: Custom SMTP configuration
+            daily_limit: Messages allowed per day (defaults to the service's
+                published limit)
+            sent_today: Messages already sent today, e.g. by an earlier run
+        """
+        self.agent = OutreachAgent(email, password, service, custom_smtp)
+        if daily_limit is None:
+            limits = EmailServiceConfig.SERVICES.get(self.agent.service, {}).get('rate_limit', {})
+            daily_limit = limits.get('daily_limit', self.DEFAULT_DAILY_LIMIT)
+        self.daily_limit = daily_limit
+        self.sent_today = sent_today
+        self.quota_day = date.today()
+        self.disabled = False
+        self.cooldown_until = 0.0
+        self.current_weight = 0
+
+    @property
+    def email(self) -> str:
+        return self.agent.sender_email
+
+    @property
+    def remaining(self) -> int:
+        """Messages left in today's quota."""
+        if self.quota_day != date.today():
+            self.quota_day = date.today()
+            self.sent_today = 0
+        return max(0, self.daily_limit - self.sent_today)
+
+    def is_available(self, now: float) -> bool:
+        """True if the account may send right now."""
+        return not self.disabled and now >= self.cooldown_until and self.remaining > 0
+
+
+class SenderPool:
+    """
+    Spread a campaign over several sending accounts.
+
+    Contacts are assigned by smooth weighted round-robin where each
+    account's weight is its remaining daily quota. An account that fails
+    authentication is taken out of the pool; one that returns a transient
+    (4xx) error or drops the connection is cooled down. In both cases the
+    contact fails over to the next account. A refused recipient does not
+    fail over: the receiving server would answer every account the same.
+    ``send_bulk_outreach`` parks recipients deferred with 4xx in a
+    ``RetryScheduler`` and tries them again after a backoff.
+
+    If every usable account is cooling down, sending waits for the first
+    one to come back instead of failing the contact.
+    """
+
+    def __init__(self,
+                 accounts: List[SenderAccount],
+                 cooldown: float = 300.0,
+                 max_attempts: Optional[int] = None,
+                 retry_attempts: int = 3,
+                 retry_delay: float = 5.0):
+        """
+        Args:
+            accounts: Sending accounts (at least one)
+            cooldown: Seconds an account rests after a transient failure
+            max_attempts: Delivery attempts per message across all accounts
+                (defaults to one per account plus two)
+            retry_attempts: Times ``send_bulk_outreach`` tries a recipient
+                whose failure is retryable (e.g. greylisting), including
+                the first
+            retry_delay: Nominal backoff before the first of those retries
+        """
+        if not accounts:
+            raise ValueError("SenderPool needs at least one account")
+        self.accounts = accounts
+        self.cooldown = cooldown
+        self.max_attempts = max_attempts if max_attempts is not None else len(accounts) + 2
+        self.retry_attempts = retry_attempts
+        self.retry_delay = retry_delay
+        self.sent_log = []
+        self.send_log: Optional[SendLog] = None
+
+    def select_account(self) -> Optional[SenderAccount]:
+        """Pick the next account by weighted round-robin over remaining quota."""
+        now = time.monotonic()
+        available = [a for a in self.accounts if a.is_available(now)]
+        if not available:
+            return None
+
+        total = 0
+        best = None
+        for account in available:
+            weight = account.remaining
+            account.current_weight += weight
+            total += weight
+            if best is None or account.current_weight > best.current_weight:
+                best = account
+        best.current_weight -= total
+        return best
+
+    def wait_time(self) -> Optional[float]:
+        """
+        Seconds until a cooling account can send again (0 if one can now).
+
+        Returns:
+            None if no account will become available today (all disabled
+            or out of quota)
+        """
+        now = time.monotonic()
+        usable = [a for a in self.accounts if not a.disabled and a.remaining > 0]
+        if not usable:
+            return None
+        return max(0.0, min(a.cooldown_until for a in usable) - now)
+
+    def _handle_failure(self, account: SenderAccount, error: Exception) -> Tuple[str, bool]:
+        """
+        Update account health after a failed attempt.
+
+        Returns:
+            Tuple of (error_message, fail_over_to_another_account)
+        """
+        kind = classify_smtp_error(error)
+        if kind == AUTH:
+            account.disabled = True
+            print(f"⚠ Disabling sender {account.email}: authentication failed")
+            return f"Authentication failed: {error}", True
+
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            # The receiving side deferred this recipient (4xx) or rejected it
+            # (5xx); the account is fine and another one would fare no better
+            return f"Recipient refused: {error}", False
+
+        code = getattr(error, 'smtp_code', None)
+        transient = (
+            isinstance(error, (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError))
+            or (code is not None and 400 <= code < 500)
+        )
+        if transient:
+            account.cooldown_until = time.monotonic() + self.cooldown
+            print(f"⚠ Cooling down sender {account.email} for {self.cooldown:.0f}s: {error}")
+            return f"SMTP error: {error}", True
+
+        return f"SMTP error: {error}", False
+
+    def send_email(self,
+                   recipient: str,
+                   subject: str,
+                   body: str,
+                   attachments: Optional[List[str]] = None,
+                   html: bool = False) -> Tuple[bool, str, Optional[str]]:
+        """
+        Send one message, failing over between accounts.
+
+        A refused recipient fails straight away, including a 4xx deferral;
+        retrying it later is up to the caller.
+
+        Returns:
+            Tuple of (success, message, sender_email)
+        """
+        return self._send(recipient, subject, body, attachments, html)[:3]
+
+    def _send(self,
+              recipient: str,
+              subject: str,
+              body: str,
+              attachments: Optional[List[str]],
+              html: bool) -> Tuple[bool, str, Optional[str], Optional[str]]:
+        """
+        ``send_email`` that also returns the kind of the last error (see
+        ``classify_smtp_error``; None on success or with no account left).
+        """
+        last_error, kind = "No sender account available", None
+        attempts = 0
+        while attempts < self.max_attempts:
+            account = self.select_account()
+            if account is None:
+                wait = self.wait_time()
+                if wait is None:
+                    break
+                print(f"⏳ All senders cooling down, waiting {wait:.0f}s")
+                time.sleep(wait)
+                continue
+            attempts += 1
+            try:
+                account.agent.deliver(recipient, subject, body, attachments, html)
+            except Exception as e:
+                kind = classify_smtp_error(e)
+                last_error, fail_over = self._handle_failure(account, e)
+                if not fail_over:
+                    return False, last_error, account.email, kind
+                continue
+
+            account.sent_today += 1
+            return True, "Success", account.email, None
+        return False, last_error, None, kind
+
+    def send_bulk_outreach(self,
+                           contacts: Iterable[Dict[str, str]],
+                           subject_template: str,
+                           body_template: str,
+                           attachments: Optional[List[str]] = None,
+                           delay: float = 0.0,
+                           html: bool = False,
+                           html_template_type: str = 'professional',
+                           html_title: str = "",
+                           html_footer: str = "",
+                           max_emails: Optional[int] = None,
+                           skip_invalid: bool = True,
+                           domain_verifier: Optional[DomainVerifier] = None,
+                           suppression: Optional[SuppressionList] = None) -> Dict:
+        """
+        Send personalized emails to multiple contacts across all accounts.
+
+        Returns the same results dict as ``OutreachAgent.send_bulk_outreach``
+        plus ``by_sender`` (messages sent per account).
+
+        As there, a recipient whose send failed with a retryable error (a
+        4xx deferral, or every account failing transiently) is parked with
+        jittered exponential backoff while the other contacts keep going.
+        """
+        results = {
+            'sent': 0,
+            'failed': 0,
+            'skipped': 0,
+            'failed_emails': [],
+            'by_sender': {account.email: 0 for account in self.accounts},
+            'start_time': datetime.now().isoformat()
+        }
+
+        contacts_to_process, total = limit_contacts(contacts, max_emails)
+        contacts_to_process, total = OutreachAgent._valid_contacts(
+            contacts_to_process, total, results, skip_invalid, domain_verifier,
+            suppression=suppression)
+        renderer = self.accounts[0].agent
+
+        retries = RetryScheduler(self.retry_attempts, self.retry_delay)
+        attempted = False
+
+        def finish(email: str, subject: str, success: bool, message: str, sender: Optional[str]):
+            entry = {
+                'timestamp': datetime.now().isoformat(),
+                'recipient': email,
+                'sender': sender,
+                'subject': subject,
+                'status': 'sent' if success else 'failed',
+                **({} if success else {'error': message})
+            }
+            if self.send_log is not None:
+                self.send_log.append(entry)
+            else:
+                self.sent_log.append(entry)
+            if success:
+                results['sent'] += 1
+                results['by_sender'][sender] += 1
+                print(f"✓ Successfully sent to {email} via {sender}")
+            else:
+                results['failed'] += 1
+                results['failed_emails'].append({'email': email, 'error': message})
+                print(f"✗ Failed to send to {email}: {message}")
+
+        def attempt(email: str, subject: str, body: str, attempts: int):
+            nonlocal attempted
+            if delay and attempted:
+                time.sleep(delay)
+            attempted = True
+
+            attempts += 1
+            success, message, sender, kind = self._send(email, subject, body, attachments, html)
+            if not success and kind == RETRYABLE:
+                wait = retries.park((email, subject, body), attempts)
+                if wait is not None:
+                    print(f"↻ Attempt {attempts} failed for {email}: {message}; "
+                          f"retrying in {wait:.1f}s")
+                    return
+            finish(email, subject, success, message, sender)
+
+        def retry_due():
+            due = retries.pop_due()
+            while due is not None:
+                (email, subject, body), attempts = due
+                print(f"\n↻ Retrying {email} (attempt {attempts + 1}/{retries.max_attempts})")
+                attempt(email, subject, body, attempts)
+                due = retries.pop_due()
+
+        with ExitStack() as stack:
+            for account in self.accounts:
+                stack.enter_context(account.agent.connection_pool())
+
+            for i, contact in enumerate(contacts_to_process):
+                retry_due()
+
+                email = contact.get('email', '')
+                print(f"\n[{format_progress(i, total)}] Processing: {email}")
+
+                subject, body = renderer._render_contact(
+                    contact, subject_template, body_template,
+                    html, html_template_type, html_title, html_footer
+                )
+                if EmailValidator.validate_email(email):
+                    attempt(email, subject, body, 0)
+                else:
+                    finish(email, subject, False, f"Invalid email address: {email}", None)
+
+            # Source exhausted: wait out the remaining backoffs
+            while len(retries):
+                time.sleep(retries.wait_time())
+                retry_due()
+
+        results['end_time'] = datetime.now().isoformat()
+        return results
@@ -0,0 +1,242 @@
+"""Pool of persistent, authenticated SMTP sessions."""
+
+import smtplib
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from email.message import Message
+from typing import Callable, Iterator, List, Optional
+
+
+class _PooledSession:
+    """An open SMTP connection plus bookkeeping used by the pool."""
+
+    __slots__ = ('server', 'last_used', 'messages')
+
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.last_used = time.monotonic()
+        self.messages = 0
+
+
+class SMTPConnectionPool:
+    """
+    Keep up to ``size`` logged-in SMTP sessions open and hand them out
+    to senders, so a campaign pays the TCP + STARTTLS + AUTH handshake
+    once per session instead of once per message.
+
+    Sessions that sat idle longer than ``health_check_interval`` are
+    probed with NOOP before reuse, sessions whose transaction failed are
+    reset with RSET, and dead sessions are replaced transparently.
+    """
+
+    # Errors that mean the session itself is unusable. Not OSError: every
+    # SMTPException subclasses it, so a rejected message (which RSET
+    # recovers from) would drop the connection too.
+    CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+    def __init__(self,
+                 smtp_server: str,
+                 smtp_port: int,
+                 username: str,
+                 password: str,
+                 use_tls: bool = True,
+                 size: int = 4,
+                 timeout: float = 30,
+                 health_check_interval: float = 30.0,
+                 max_messages_per_session: int = 100):
+        """
+        Args:
+            smtp_server: SMTP host
+            smtp_port: SMTP port
+            username: Login user (usually the sender address)
+            password: Login password or app-specific password
+            use_tls: Upgrade connections with STARTTLS
+            size: Maximum number of concurrent sessions
+            timeout: Socket timeout in seconds
+            health_check_interval: Idle seconds after which a session is
+                probed with NOOP before it is reused
+            max_messages_per_session: Recycle a session after this many
+                messages (most providers cap messages per connection);
+                0 disables recycling
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.max_messages_per_session = max_messages_per_session
+
+        self._idle = deque()
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {'connects': 0, 'reconnects': 0, 'health_checks': 0, 'messages': 0}
+
+    def _connect(self) -> _PooledSession:
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            server.login(self.username, self.password)
+        except Exception:
+            self._close_quietly(server)
+            raise
+        self.stats['connects'] += 1
+        return _PooledSession(server)
+
+    @staticmethod
+    def _close_quietly(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _is_alive(self, session: _PooledSession) -> bool:
+        self.stats['health_checks'] += 1
+        try:
+            code, _ = session.server.noop()
+            return code == 250
+        except Exception:
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> _PooledSession:
+        """
+        Take a healthy session from the pool, opening one if needed.
+
+        Blocks while ``size`` sessions are already checked out.
+
+        Raises:
+            TimeoutError: If no session became available within ``timeout``
+            RuntimeError: If the pool has been closed
+        """
+        with self._cond:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._idle and self._created >= self.size:
+                if self._closed:
+                    raise RuntimeError("SMTP connection pool is closed")
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Timed out waiting for an SMTP session")
+                self._cond.wait(remaining)
+            if self._closed:
+                raise RuntimeError("SMTP connection pool is closed")
+            session = self._idle.pop() if self._idle else None
+            if session is None:
+                self._created += 1
+
+        if session is not None:
+            idle_for = time.monotonic() - session.last_used
+            if idle_for < self.health_check_interval or self._is_alive(session):
+                return session
+            self._close_quietly(session.server)
+            self.stats['reconnects'] += 1
+
+        try:
+            return self._connect()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, session: _PooledSession, discard: bool = False):
+        """
+        Return a session to the pool.
+
+        Args:
+            session: Session obtained from ``acquire``
+            discard: Close the session instead of keeping it for reuse
+        """
+        recycle = (self.max_messages_per_session
+                   and session.messages >= self.max_messages_per_session)
+        if discard or recycle or self._closed:
+            self._close_quietly(session.server)
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            return
+
+        session.last_used = time.monotonic()
+        with self._cond:
+            self._idle.append(session)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        """
+        Borrow an authenticated ``smtplib.SMTP`` for one transaction.
+
+        A session whose SMTP transaction was rejected is reset with RSET;
+        it is dropped if the connection itself failed (disconnect, socket
+        error) or RSET does not succeed.
+        """
+        session = self.acquire()
+        try:
+            yield session.server
+        except self.CONNECTION_ERRORS:
+            self.release(session, discard=True)
+            raise
+        except smtplib.SMTPException:
+            try:
+                healthy = session.server.rset()[0] == 250
+            except Exception:
+                healthy = False
+            self.release(session, discard=not healthy)
+            raise
+        except BaseException:
+            self.release(session, discard=True)
+            raise
+        else:
+            session.messages += 1
+            self.stats['messages'] += 1
+            self.release(session)
+
+    def _with_reconnect(self, send: Callable[[smtplib.SMTP], object]):
+        """
+        Run ``send`` on a pooled session. If a reused session turns out to
+        have been dropped by the server, it is retried once on a fresh
+        connection.
+        """
+        try:
+            with self.connection() as server:
+                return send(server)
+        except smtplib.SMTPServerDisconnected:
+            self.stats['reconnects'] += 1
+            with self.connection() as server:
+                return send(server)
+
+    def send_message(self, msg: Message):
+        """Send an ``email.message.Message`` over a pooled session."""
+        return self._with_reconnect(lambda server: server.send_message(msg))
+
+    def sendmail(self, from_addr: str, to_addrs: List[str], msg: bytes):
+        """Send pre-serialized message bytes over a pooled session."""
+        return self._with_reconnect(lambda server: server.sendmail(from_addr, to_addrs, msg))
+
+    def close(self):
+        """Close all idle sessions; sessions still checked out close on release."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for session in idle:
+            self._close_quietly(session.server)
+
+    def __enter__(self) -> 'SMTPConnectionPool':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,417 @@
+"""Suppression-list checks on the send path."""
+
+import abc
+import hashlib
+import json
+import mmap
+import os
+import socket
+import struct
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .validators import EmailValidator
+
+# Bloom filter file published by the Compliance Agent: a 64-byte header
+# (magic, format version, hash count, bit count, item count, epoch,
+# target false-positive rate) followed by the bit array.
+BLOOM_MAGIC = b"SUPBLOOM"
+BLOOM_FORMAT_VERSION = 1
+BLOOM_HEADER = struct.Struct("<8sHHQQQd20x")
+
+
+def hash_email(email: str) -> str:
+    """
+    SHA-256 hex digest of the normalized address, the same form the
+    Compliance Agent stores as ``email_hash`` in its suppression records.
+    """
+    return hashlib.sha256(EmailValidator.clean_email(email).encode('utf-8')).hexdigest()
+
+
+def read_suppression_records(path: str) -> Iterator[Dict]:
+    """
+    Yield the records of a Compliance Agent suppression list.
+
+    ``path`` is the JSON snapshot. Records added since the last compaction
+    sit in ``<name>.journal`` next to it: a header line naming the SHA-256
+    of the snapshot it extends, then one JSON record per line. A journal
+    for a different snapshot, and a torn or unparseable line, are skipped.
+    """
+    with open(path, 'rb') as f:
+        snapshot = f.read()
+    yield from json.loads(snapshot)
+
+    journal = os.path.splitext(path)[0] + '.journal'
+    if not os.path.exists(journal):
+        return
+    with open(journal, 'r', encoding='utf-8') as f:
+        header = f.readline()
+        if not header.endswith('\n') or json.loads(header).get('base') != \
+                hashlib.sha256(snapshot).hexdigest():
+            return
+        for line in f:
+            if not line.endswith('\n') or not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+class _BatchFilter(abc.ABC):
+    """Shared ``filter_contacts`` on top of a batch ``filter_eligible``."""
+
+    @abc.abstractmethod
+    def filter_eligible(self, emails: Iterable[str]) -> List[str]:
+        """Return the addresses that are not suppressed, in input order."""
+
+    def filter_contacts(self,
+                        contacts: Iterable[Dict[str, str]],
+                        on_suppressed: Optional[Callable[[Dict[str, str]], None]] = None,
+                        batch_size: int = 1000) -> Iterator[Dict[str, str]]:
+        """
+        Yield only contacts whose address is not suppressed.
+
+        Args:
+            contacts: List or stream of contact dictionaries
+            on_suppressed: Called with each dropped contact
+            batch_size: Contacts checked per ``filter_eligible`` call
+        """
+        source = iter(contacts)
+        while True:
+            batch = list(islice(source, batch_size))
+            if not batch:
+                return
+            eligible = set(self.filter_eligible(contact.get('email', '') for contact in batch))
+            for contact in batch:
+                if contact.get('email', '') in eligible:
+                    yield contact
+                elif on_suppressed is not None:
+                    on_suppressed(contact)
+
+
+class SuppressionList(_BatchFilter):
+    """
+    Hash set of suppressed addresses with O(1) membership checks.
+
+    Addresses are normalized with ``EmailValidator.clean_email``. With
+    ``hashed`` only the SHA-256 digest of each address is kept, which
+    keeps plain addresses out of memory and uses less of it on
+    multi-million-entry lists. Records that carry only an ``email_hash``
+    are matched in either mode.
+    """
+
+    def __init__(self, emails: Iterable[str] = (), hashed: bool = False):
+        """
+        Args:
+            emails: Suppressed addresses
+            hashed: Store SHA-256 digests instead of addresses
+        """
+        self.hashed = hashed
+        self._keys = set()
+        self._hashes = set()
+        self._keys.update(map(self._key, emails))
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], hashed: bool = False) -> 'SuppressionList':
+        """Build from suppression records with an 'email' or an 'email_hash'."""
+        suppression = cls(hashed=hashed)
+        for record in records:
+            if record.get('email_hash'):
+                suppression.add_hash(record['email_hash'])
+            elif record.get('email'):
+                suppression.add(record['email'])
+        return suppression
+
+    @classmethod
+    def from_json(cls, path: str, hashed: bool = False) -> 'SuppressionList':
+        """
+        Load the Compliance Agent's suppression list: the JSON snapshot
+        plus the records appended to its journal since (see
+        ``read_suppression_records``).
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If it is not valid JSON
+        """
+        return cls.from_records(read_suppression_records(path), hashed=hashed)
+
+    def _key(self, email: str):
+        normalized = EmailValidator.clean_email(email)
+        if self.hashed:
+            return hashlib.sha256(normalized.encode('utf-8')).digest()
+        return normalized
+
+    def add(self, email: str):
+        """Suppress ``email``."""
+        self._keys.add(self._key(email))
+
+    def add_hash(self, email_hash: str):
+        """Suppress the address whose ``hash_email`` digest is ``email_hash``."""
+        digest = bytes.fromhex(email_hash)
+        (self._keys if self.hashed else self._hashes).add(digest)
+
+    def __contains__(self, email: str) -> bool:
+        if self._key(email) in self._keys:
+            return True
+        if self._hashes:
+            return bytes.fromhex(hash_email(email)) in self._hashes
+        return False
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._hashes)
+
+    def filter_eligible(self, emails: Iterable[str]) -> List[str]:
+        """Return the addresses that are not suppressed, in input order."""
+        if not self.hashed and not self._hashes:
+            keys = self._keys
+            clean = EmailValidator.clean_email
+            return [email for email in emails if clean(email) not in keys]
+        return [email for email in emails if email not in self]
+
+
+class BloomSuppression(_BatchFilter):
+    """
+    Suppression check against the Compliance Agent's published Bloom filter.
+
+    The filter file is memory-mapped, so opening it is cheap and its pages
+    are shared by every process on the host. Most addresses are not
+    suppressed and are cleared by the filter alone. Only filter hits (real
+    suppressions plus the rare false positive) go to ``confirm``, the
+    authoritative check. By default that is a ``SuppressionList`` built
+    from ``exact_path`` on the first hit. ``refresh`` switches to a newer
+    published filter (higher epoch) without restarting.
+    """
+
+    def __init__(self,
+                 bloom_path: str,
+                 exact_path: Optional[str] = None,
+                 confirm: Optional[Callable[[List[str]], Set[str]]] = None):
+        """
+        Args:
+            bloom_path: Bloom filter file published by the Compliance Agent
+            exact_path: Compliance suppression list (JSON) used to confirm hits
+            confirm: Called with the addresses the filter flagged; returns
+                those actually suppressed (overrides ``exact_path``)
+
+        Raises:
+            ValueError: If neither ``exact_path`` nor ``confirm`` is given, or
+                the file is not a supported Bloom filter
+        """
+        if confirm is None and exact_path is None:
+            raise ValueError("BloomSuppression needs exact_path or confirm for filter hits")
+        self.bloom_path = bloom_path
+        self.exact_path = exact_path
+        self._confirm = confirm
+        self._exact: Optional[SuppressionList] = None
+        self._map: Optional[mmap.mmap] = None
+        self.stats = {'checked': 0, 'bloom_hits': 0, 'suppressed': 0}
+        self._open()
+
+    def _open(self):
+        with open(self.bloom_path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(mapped) < BLOOM_HEADER.size:
+                raise ValueError(f"{self.bloom_path} is too short to be a Bloom filter")
+            magic, version, hashes, bits, count, epoch, fp_rate = BLOOM_HEADER.unpack_from(mapped)
+            if magic != BLOOM_MAGIC or version != BLOOM_FORMAT_VERSION:
+                raise ValueError(f"{self.bloom_path} is not a supported suppression Bloom filter")
+            if len(mapped) < BLOOM_HEADER.size + (bits + 7) // 8:
+                raise ValueError(f"{self.bloom_path} is truncated")
+        except Exception:
+            mapped.close()
+            raise
+        if self._map is not None:
+            self._map.close()
+        self._map = mapped
+        self.hashes, self.bits, self.count, self.epoch, self.fp_rate = hashes, bits, count, epoch, fp_rate
+
+    def refresh(self) -> bool:
+        """
+        Map the file again if a newer filter was published.
+
+        Returns:
+            True if a newer epoch was loaded
+        """
+        with open(self.bloom_path, 'rb') as f:
+            header = f.read(BLOOM_HEADER.size)
+        if len(header) < BLOOM_HEADER.size or BLOOM_HEADER.unpack(header)[5] <= self.epoch:
+            return False
+        self._open()
+        self._exact = None  # the suppression list changed as well
+        return True
+
+    def might_contain(self, email: str) -> bool:
+        """Bloom filter answer alone: False is exact, True may be a false positive."""
+        digest = hashlib.sha256(EmailValidator.clean_email(email).encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[0:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        data, offset, bits = self._map, BLOOM_HEADER.size, self.bits
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % bits
+            if not data[offset + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def _confirmed(self, candidates: List[str]) -> Set[str]:
+        if self._confirm is not None:
+            return set(self._confirm(candidates))
+        if self._exact is None:
+            self._exact = SuppressionList.from_json(self.exact_path, hashed=True)
+        eligible = set(self._exact.filter_eligible(candidates))
+        return {email for email in candidates if email not in eligible}
+
+    def __contains__(self, email: str) -> bool:
+        return not self.filter_eligible([email])
+
+    def filter_eligible(self, emails: Iterable[str]) -> List[str]:
+        """Return the addresses that are not suppressed, in input order."""
+        emails = list(emails)
+        candidates = [email for email in emails if self.might_contain(email)]
+        self.stats['checked'] += len(emails)
+        if not candidates:
+            return emails
+        self.stats['bloom_hits'] += len(candidates)
+        suppressed = self._confirmed(candidates)
+        self.stats['suppressed'] += len(suppressed)
+        return [email for email in emails if email not in suppressed]
+
+    def close(self):
+        """Unmap the filter file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class ServiceSuppression(_BatchFilter):
+    """
+    Suppression check against the Compliance Agent's eligibility service.
+
+    The service holds the suppression list once for every worker on the
+    host and answers line-delimited JSON requests
+    (``{"id": 1, "op": "check", "emails": [...]}`` ->
+    ``{"id": 1, "suppressed": [...]}``). Answers are cached per normalized
+    address for ``ttl`` seconds, so a new suppression reaches this worker
+    at most ``ttl`` seconds late. Cache misses are sent in requests of
+    ``batch_size`` addresses, all written before any answer is read. If
+    the connection drops (e.g. the service restarted) it reconnects once.
+
+    This is the service's only client; the Compliance Agent ships just
+    the server (``src/service.py``).
+    """
+
+    def __init__(self,
+                 address: Union[str, Tuple[str, int]],
+                 ttl: float = 5.0,
+                 max_cached: int = 100000,
+                 batch_size: int = 1000,
+                 timeout: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            address: Unix socket path, or ``(host, port)`` / ``"host:port"`` for TCP
+            ttl: Seconds an answer is reused
+            max_cached: Most addresses kept in the cache (oldest dropped first)
+            batch_size: Addresses per request
+            timeout: Socket timeout in seconds
+            clock: Monotonic time source
+        """
+        if isinstance(address, str) and ':' in address and os.path.sep not in address:
+            host, port = address.rsplit(':', 1)
+            address = (host, int(port))
+        self.address = address
+        self.ttl = ttl
+        self.max_cached = max_cached
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
+        self.clock = clock
+        self.stats = {'checked': 0, 'cache_hits': 0, 'requests': 0, 'suppressed': 0}
+        self._cache: 'OrderedDict[str, Tuple[bool, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._next_id = 0
+
+    def _connect(self):
+        family = socket.AF_UNIX if isinstance(self.address, str) else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.address)
+        self._sock, self._reader = sock, sock.makefile('rb')
+
+    def _request(self, batches: List[List[str]]) -> Set[str]:
+        requests = []
+        for batch in batches:
+            self._next_id += 1
+            requests.append({'id': self._next_id, 'op': 'check', 'emails': batch})
+        payload = ''.join(json.dumps(request) + '\n' for request in requests).encode('utf-8')
+        for attempt in range(2):
+            try:
+                if self._sock is None:
+                    self._connect()
+                self._sock.sendall(payload)
+                responses = []
+                for _ in requests:
+                    line = self._reader.readline()
+                    if not line:
+                        raise ConnectionError("Eligibility service closed the connection")
+                    responses.append(json.loads(line))
+                break
+            except OSError:
+                # One reconnect, e.g. after the service restarted
+                self.close()
+                if attempt:
+                    raise
+        self.stats['requests'] += len(requests)
+        suppressed = set()
+        for request, response in zip(requests, responses):
+            if response.get('id') != request['id'] or 'error' in response:
+                self.close()
+                raise ValueError(f"Eligibility service error: {response.get('error', 'out of order')}")
+            suppressed.update(response['suppressed'])
+        return suppressed
+
+    def filter_eligible(self, emails: Iterable[str]) -> List[str]:
+        """Return the addresses that are not suppressed, in input order."""
+        emails = list(emails)
+        clean = EmailValidator.clean_email
+        now = self.clock()
+        suppressed_keys = set()
+        misses = []
+        with self._lock:
+            for key in dict.fromkeys(map(clean, emails)):
+                cached = self._cache.get(key)
+                if cached is not None and cached[1] > now:
+                    self.stats['cache_hits'] += 1
+                    if cached[0]:
+                        suppressed_keys.add(key)
+                else:
+                    misses.append(key)
+            if misses:
+                flagged = self._request([misses[i:i + self.batch_size]
+                                         for i in range(0, len(misses), self.batch_size)])
+                expires = self.clock() + self.ttl
+                for key in misses:
+                    self._cache[key] = (key in flagged, expires)
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.max_cached:
+                    self._cache.popitem(last=False)
+                suppressed_keys |= flagged
+        eligible = [email for email in emails if clean(email) not in suppressed_keys]
+        self.stats['checked'] += len(emails)
+        self.stats['suppressed'] += len(emails) - len(eligible)
+        return eligible
+
+    def __contains__(self, email: str) -> bool:
+        return not self.filter_eligible([email])
+
+    def close(self):
+        """Close the connection; the next check reconnects."""
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+            self._sock = self._reader = None
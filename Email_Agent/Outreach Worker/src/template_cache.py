@@ -0,0 +1,103 @@
+"""Compiled, cached ``string.Template`` rendering for personalization."""
+
+import os
+import threading
+from functools import lru_cache
+from string import Template
+from typing import Dict, List, Mapping, Tuple
+
+_MISSING = object()
+
+
+class CompiledTemplate:
+    """
+    A ``string.Template`` parsed once into alternating literal and
+    placeholder segments.
+
+    ``render`` has the same result as ``Template.safe_substitute``:
+    ``$$`` becomes ``$``, unknown placeholders and stray ``$`` are left as
+    written. Rendering is a single pass over the pre-split segments
+    followed by one ``str.join``.
+    """
+
+    __slots__ = ('source', 'literals', 'placeholders')
+
+    def __init__(self, source: str):
+        """
+        Args:
+            source: Template text using ``$name`` / ``${name}`` placeholders
+        """
+        self.source = source
+        self.literals: List[str] = []
+        self.placeholders: List[Tuple[str, str]] = []  # (name, original text)
+
+        delimiter = Template.delimiter
+        literal: List[str] = []
+        position = 0
+        for match in Template.pattern.finditer(source):
+            literal.append(source[position:match.start()])
+            position = match.end()
+            name = match.group('named') or match.group('braced')
+            if name is not None:
+                self.literals.append(''.join(literal))
+                self.placeholders.append((name, match.group()))
+                literal = []
+            elif match.group('escaped') is not None:
+                literal.append(delimiter)
+            else:
+                literal.append(match.group())
+        literal.append(source[position:])
+        self.literals.append(''.join(literal))
+
+    def render(self, mapping: Mapping[str, object]) -> str:
+        """Substitute values from ``mapping`` (``safe_substitute`` semantics)."""
+        literals = self.literals
+        parts = [literals[0]]
+        append = parts.append
+        get = mapping.get
+        for index, (name, original) in enumerate(self.placeholders, 1):
+            value = get(name, _MISSING)
+            append(original if value is _MISSING else str(value))
+            append(literals[index])
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str) -> CompiledTemplate:
+    """Return the compiled form of ``source``, parsing it only once."""
+    return CompiledTemplate(source)
+
+
+_file_cache: Dict[str, Tuple[Tuple[int, int], CompiledTemplate]] = {}
+_file_cache_lock = threading.Lock()
+
+
+def load_template_file(file_path: str) -> CompiledTemplate:
+    """
+    Read and compile a template file, reusing the cached copy until the
+    file's modification time or size changes.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    with _file_cache_lock:
+        cached = _file_cache.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        compiled = CompiledTemplate(f.read())
+    with _file_cache_lock:
+        _file_cache[path] = (version, compiled)
+    return compiled
+
+
+def clear_template_cache():
+    """Drop all cached templates."""
+    compile_template.cache_clear()
+    with _file_cache_lock:
+        _file_cache.clear()
@@ -1,6 +1,8 @@
 from pathlib import Path
 from typing import Optional
 
+from .template_cache import load_template_file
+
 
 class HTMLTemplates:
     """Pre-built HTML email templates."""
@@ -111,11 +113,34 @@ class HTMLTemplates:
 </html>
 """
     
+    @staticmethod
+    def wrap(template_type: str, content: str, title: str = "", footer: str = "") -> str:
+        """
+        Wrap content in one of the built-in templates.
+        
+        Args:
+            template_type: 'professional', 'simple' or anything else for minimal
+            content: Main email content (HTML)
+            title: Header title (professional template only)
+            footer: Footer text (professional template only)
+            
+        Returns:
+            Complete HTML email string
+        """
+        if template_type == 'professional':
+            return HTMLTemplates.professional_template(title, content, footer)
+        if template_type == 'simple':
+            return HTMLTemplates.simple_template(content)
+        return HTMLTemplates.minimal_template(content)
+    
     @staticmethod
     def load_from_file(file_path: str, **kwargs) -> str:
         """
         Load and format HTML template from file.
         
+        The file is read and parsed once and cached until it changes on
+        disk, so calling this per recipient only costs the substitution.
+        
         Args:
             file_path: Path to HTML template file
             **kwargs: Variables to substitute in template
@@ -123,14 +148,8 @@ class HTMLTemplates:
         Returns:
             Formatted HTML string
         """
-        from string import Template
-        
         path = Path(file_path)
         if not path.exists():
             raise FileNotFoundError(f"Template file not found: {file_path}")
         
-        with open(path, 'r', encoding='utf-8') as f:
-            template_content = f.read()
-        
-        template = Template(template_content)
-        return template.safe_substitute(**kwargs)
+        return load_template_file(str(path)).render(kwargs)
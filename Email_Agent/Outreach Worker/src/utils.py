@@ -2,10 +2,13 @@
 
 import csv
 import json
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 
+from .validators import EmailValidator
+
 
 def load_contacts_from_csv(csv_file: str) -> List[Dict[str, str]]:
     """
@@ -17,12 +20,85 @@ def load_contacts_from_csv(csv_file: str) -> List[Dict[str, str]]:
     Returns:
         List of contact dictionaries
     """
-    contacts = []
-    with open(csv_file, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            contacts.append(dict(row))
-    return contacts
+    return list(iter_contacts_from_csv(csv_file))
+
+
+def iter_contacts_from_csv(csv_file: str,
+                           validate: bool = False,
+                           dedupe: bool = False,
+                           max_emails: Optional[int] = None,
+                           stats: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, str]]:
+    """
+    Stream contacts from a CSV file one row at a time.
+    
+    Rows are parsed lazily, so sending can start as soon as the first row
+    is read and memory use does not grow with the size of the file (apart
+    from the set of seen addresses when ``dedupe`` is on).
+    
+    Args:
+        csv_file: Path to CSV file
+        validate: Drop rows whose 'email' is not a valid address
+        dedupe: Drop rows whose 'email' (case-insensitive) was already yielded
+        max_emails: Stop after yielding this many contacts
+        stats: Optional dict updated in place with 'rows', 'invalid',
+            'duplicates' and 'yielded' counts
+        
+    Yields:
+        Contact dictionaries
+    """
+    counts = stats if stats is not None else {}
+    for key in ('rows', 'invalid', 'duplicates', 'yielded'):
+        counts.setdefault(key, 0)
+    seen = set()
+    
+    with open(csv_file, 'r', encoding='utf-8', newline='') as file:
+        for row in csv.DictReader(file):
+            if max_emails and counts['yielded'] >= max_emails:
+                return
+            counts['rows'] += 1
+            
+            email = row.get('email') or ''
+            if validate and not EmailValidator.validate_email(email):
+                counts['invalid'] += 1
+                continue
+            if dedupe:
+                key = email.strip().lower()
+                if key in seen:
+                    counts['duplicates'] += 1
+                    continue
+                seen.add(key)
+            
+            counts['yielded'] += 1
+            yield row
+
+
+def limit_contacts(contacts: Iterable[Dict[str, str]],
+                   max_emails: Optional[int] = None) -> Tuple[Iterable[Dict[str, str]], Optional[int]]:
+    """
+    Apply ``max_emails`` to a list or stream of contacts without copying.
+    
+    Args:
+        contacts: List, generator or any other iterable of contacts
+        max_emails: Maximum number of contacts to take (None/0 for all)
+        
+    Returns:
+        Tuple of (contacts, total); total is None when the length of a
+        stream is not known in advance
+    """
+    try:
+        total = len(contacts)
+    except TypeError:
+        total = None
+    if max_emails:
+        contacts = islice(contacts, max_emails)
+        if total is not None:
+            total = min(total, max_emails)
+    return contacts, total
+
+
+def format_progress(index: int, total: Optional[int]) -> str:
+    """Format a 0-based position as '3/10', or '3' when the total is unknown."""
+    return f"{index + 1}/{total}" if total is not None else str(index + 1)
 
 
 def save_contacts_to_csv(contacts: List[Dict[str, str]], csv_file: str) -> None:
@@ -73,18 +149,19 @@ def ensure_directory(directory: str) -> Path:
     return path
 
 
-def generate_log_filename(prefix: str = 'outreach') -> str:
+def generate_log_filename(prefix: str = 'outreach', extension: str = 'json') -> str:
     """
     Generate timestamped log filename.
     
     Args:
         prefix: Filename prefix
+        extension: Filename extension, e.g. 'jsonl' for a streaming send log
         
     Returns:
         Filename string
     """
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    return f"{prefix}_{timestamp}.json"
+    return f"{prefix}_{timestamp}.{extension}"
 
 
 def format_timestamp(iso_string: str) -> str:
@@ -1,7 +1,8 @@
 """Email validation and data validation utilities."""
 
 import re
-from typing import Dict, List, Tuple
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 class EmailValidator:
@@ -9,6 +10,7 @@ class EmailValidator:
     
     # Email regex pattern (RFC 5322 simplified)
     EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    EMAIL_REGEX = re.compile(EMAIL_PATTERN)
     
     @classmethod
     def validate_email(cls, email: str) -> bool:
@@ -23,7 +25,7 @@ class EmailValidator:
         """
         if not email or not isinstance(email, str):
             return False
-        return bool(re.match(cls.EMAIL_PATTERN, email.strip()))
+        return cls.EMAIL_REGEX.match(email.strip()) is not None
     
     @classmethod
     def validate_contacts(cls, contacts: List[Dict[str, str]]) -> Tuple[List[Dict], List[Dict]]:
@@ -36,12 +38,12 @@ class EmailValidator:
         Returns:
             Tuple of (valid_contacts, invalid_contacts)
         """
+        mask, _ = cls.validate_bulk([contact.get('email', '') for contact in contacts])
         valid = []
         invalid = []
         
-        for contact in contacts:
-            email = contact.get('email', '')
-            if cls.validate_email(email):
+        for contact, is_valid in zip(contacts, mask):
+            if is_valid:
                 valid.append(contact)
             else:
                 invalid.append({
@@ -51,6 +53,85 @@ class EmailValidator:
         
         return valid, invalid
     
+    @classmethod
+    def validate_bulk(cls, emails: Any) -> Tuple[Any, Any]:
+        """
+        Validate and normalize a whole column of addresses in one pass.
+        
+        Accepts a list (or any iterable), a NumPy array or a pandas Series.
+        The result has the same kind as the input: lists for lists and
+        iterables, arrays for arrays, and Series sharing the input's index
+        for Series (validated with pandas' vectorized string methods).
+        NumPy and pandas are optional and never imported unless such an
+        object is passed in.
+        
+        Args:
+            emails: Column of addresses; non-strings count as invalid
+            
+        Returns:
+            Tuple of (mask, normalized) where mask[i] tells whether
+            emails[i] is valid and normalized[i] is its ``clean_email`` form
+        """
+        module = type(emails).__module__.split('.', 1)[0]
+        if module == 'pandas':
+            text = emails.where(emails.map(lambda value: isinstance(value, str)), '')
+            normalized = text.str.strip().str.lower()
+            return normalized.str.match(cls.EMAIL_PATTERN), normalized
+        
+        values = emails.tolist() if module == 'numpy' else emails
+        match = cls.EMAIL_REGEX.match
+        mask = []
+        normalized = []
+        for email in values:
+            if isinstance(email, str):
+                email = email.strip()
+                mask.append(match(email) is not None)
+                normalized.append(email.lower())
+            else:
+                mask.append(False)
+                normalized.append('')
+        
+        if module == 'numpy':
+            import numpy as np
+            return np.array(mask, dtype=bool), np.array(normalized, dtype=object)
+        return mask, normalized
+    
+    @classmethod
+    def filter_valid(cls,
+                     contacts: Iterable[Dict[str, str]],
+                     on_invalid: Optional[Callable[[Dict[str, str]], None]] = None,
+                     batch_size: int = 1000) -> Iterator[Dict[str, str]]:
+        """
+        Yield only contacts with a valid 'email', validated in batches with
+        ``validate_bulk``.
+        
+        Addresses are normalized with ``clean_email``; a contact is copied
+        only if its address actually changed. Invalid contacts are passed
+        to ``on_invalid`` instead of being yielded.
+        
+        Args:
+            contacts: List or stream of contact dictionaries
+            on_invalid: Called with each contact whose address is invalid
+            batch_size: Contacts validated per batch
+            
+        Yields:
+            Contacts with a valid, normalized 'email'
+        """
+        source = iter(contacts)
+        while True:
+            batch = list(islice(source, batch_size))
+            if not batch:
+                return
+            mask, normalized = cls.validate_bulk([contact.get('email') for contact in batch])
+            for contact, valid, email in zip(batch, mask, normalized):
+                if not valid:
+                    if on_invalid is not None:
+                        on_invalid(contact)
+                    continue
+                if contact['email'] != email:
+                    contact = {**contact, 'email': email}
+                yield contact
+    
     @classmethod
     def clean_email(cls, email: str) -> str:
         """
@@ -1,7 +1,9 @@
 """Test cases for agent module."""
 
+import asyncio
 import unittest
 from unittest.mock import Mock, patch, MagicMock
+from benchmarks.smtp_sink import SMTPSink
 from src.agent import OutreachAgent
 
 
@@ -73,7 +75,11 @@ class TestOutreachAgent(unittest.TestCase):
         self.assertTrue(success)
         self.assertEqual(message, "Success")
         mock_server.login.assert_called_once()
-        mock_server.send_message.assert_called_once()
+        mock_server.sendmail.assert_called_once()
+        sender, recipients, msg = mock_server.sendmail.call_args[0]
+        self.assertEqual(sender, "test@example.com")
+        self.assertEqual(recipients, ["recipient@example.com"])
+        self.assertIn(b"Subject: Test Subject", msg)
     
     def test_send_email_invalid_recipient(self):
         """Test sending email to invalid address."""
@@ -93,9 +99,9 @@ class TestOutreachAgent(unittest.TestCase):
         mock_smtp.return_value.__enter__.return_value = mock_server
         
         # Simulate failure then success
-        mock_server.send_message.side_effect = [
+        mock_server.sendmail.side_effect = [
             ConnectionError("Temporary failure"),
-            None  # Success on second attempt
+            {}  # Success on second attempt
         ]
         
         with patch('time.sleep'):  # Skip actual sleep delays
@@ -107,7 +113,31 @@ class TestOutreachAgent(unittest.TestCase):
             )
         
         self.assertTrue(success)
-        self.assertEqual(mock_server.send_message.call_count, 2)
+        self.assertEqual(mock_server.sendmail.call_count, 2)
+        # The message is built once and the retry resends identical bytes
+        first, second = mock_server.sendmail.call_args_list
+        self.assertIs(first[0][2], second[0][2])
+    
+    @patch('builtins.print')
+    @patch('src.agent.time.sleep')
+    def test_bulk_outreach_consumes_stream_lazily(self, mock_sleep, mock_print):
+        """Test that a contact generator is read only as far as max_emails."""
+        read = []
+        
+        def contacts():
+            for i in range(1000):
+                read.append(i)
+                yield {'email': f"user{i}@example.com", 'name': f"User {i}"}
+        
+        with patch.object(self.agent, '_deliver') as mock_send:
+            results = self.agent.send_bulk_outreach(
+                contacts(), "Hi $name", "Hello $name", delay=1.0, max_emails=3
+            )
+        
+        self.assertEqual(results['sent'], 3)
+        self.assertEqual(len(read), 3)
+        self.assertEqual(mock_send.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
     
     @patch('src.agent.smtplib.SMTP')
     def test_test_connection_success(self, mock_smtp):
@@ -165,5 +195,90 @@ class TestOutreachAgent(unittest.TestCase):
         mock_json_dump.assert_called_once()
 
 
+@patch('builtins.print')
+class TestAsyncBulkOutreach(unittest.TestCase):
+    """Test cases for send_bulk_outreach_async against a local SMTP sink."""
+    
+    def setUp(self):
+        """Start a slow local SMTP sink and an agent pointed at it."""
+        self.sink = SMTPSink(latency=0.01).start()
+        host, port = self.sink.address
+        self.agent = OutreachAgent(
+            "sender@example.com",
+            "secret",
+            custom_smtp={'smtp_server': host, 'smtp_port': port, 'use_tls': False}
+        )
+        self.contacts = [
+            {'email': f"user{i}@example.com", 'name': f"User {i}"} for i in range(12)
+        ]
+    
+    def tearDown(self):
+        """Stop the sink."""
+        self.sink.stop()
+    
+    def test_sends_concurrently(self, mock_print):
+        """Test that deliveries overlap up to the concurrency limit."""
+        results = asyncio.run(self.agent.send_bulk_outreach_async(
+            self.contacts, "Hi $name", "Hello $name", concurrency=4
+        ))
+        
+        self.assertEqual(results['sent'], 12)
+        self.assertEqual(results['failed'], 0)
+        self.assertEqual(self.sink.stats['messages'], 12)
+        self.assertGreater(self.sink.stats['peak_sessions'], 1)
+        self.assertLessEqual(self.sink.stats['peak_sessions'], 4)
+    
+    def test_results_shape_matches_sync(self, mock_print):
+        """Test that the results dict works with generate_report."""
+        contacts = self.contacts[:3] + [{'email': 'not-an-email', 'name': 'Bad'}]
+        
+        results = asyncio.run(self.agent.send_bulk_outreach_async(
+            contacts, "Hi", "Hello", concurrency=2
+        ))
+        
+        self.assertEqual(results['sent'], 3)
+        self.assertEqual(results['skipped'], 1)
+        self.assertIn('start_time', results)
+        self.assertIn('end_time', results)
+        self.assertIn('Successfully Sent: 3', self.agent.generate_report(results))
+    
+    def test_max_emails(self, mock_print):
+        """Test that max_emails limits the campaign."""
+        results = asyncio.run(self.agent.send_bulk_outreach_async(
+            self.contacts, "Hi", "Hello", max_emails=5
+        ))
+        
+        self.assertEqual(results['sent'], 5)
+    
+    def test_retry_backs_off_without_blocking(self, mock_print):
+        """Test that a failing recipient is retried while others proceed."""
+        self.agent.retry_delay = 0.5
+        deliver = self.agent._deliver
+        failures = {'user0@example.com': 1}
+        
+        def flaky_deliver(recipient, msg):
+            if failures.get(recipient):
+                failures[recipient] -= 1
+                raise ConnectionError("Temporary failure")
+            deliver(recipient, msg)
+        
+        with patch.object(self.agent, '_deliver', side_effect=flaky_deliver):
+            results = asyncio.run(self.agent.send_bulk_outreach_async(
+                self.contacts[:4], "Hi", "Hello", concurrency=2
+            ))
+        
+        self.assertEqual(results['sent'], 4)
+        retried = [e for e in self.agent.sent_log if e['recipient'] == 'user0@example.com']
+        self.assertEqual(retried[0]['attempt'], 2)
+        self.assertEqual(self.agent.sent_log[-1]['recipient'], 'user0@example.com')
+    
+    def test_invalid_concurrency(self, mock_print):
+        """Test that concurrency must be positive."""
+        with self.assertRaises(ValueError):
+            asyncio.run(self.agent.send_bulk_outreach_async(
+                self.contacts, "Hi", "Hello", concurrency=0
+            ))
+
+
 if __name__ == '__main__':
     unittest.main()
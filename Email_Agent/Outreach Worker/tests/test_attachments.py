@@ -0,0 +1,126 @@
+"""Test cases for attachments module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from email import encoders
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+
+from src.agent import OutreachAgent
+from src.attachments import AttachmentCache
+
+
+class TestAttachmentCache(unittest.TestCase):
+    """Test cases for AttachmentCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = self._write('brochure.pdf', b'%PDF-1.4 ' + bytes(range(256)) * 40)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name: str, data: bytes) -> str:
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def _reference_payload(self, path: str) -> str:
+        part = MIMEBase('application', 'octet-stream')
+        with open(path, 'rb') as f:
+            part.set_payload(f.read())
+        encoders.encode_base64(part)
+        return part.get_payload()
+
+    def test_encoded_once(self):
+        """Test that repeated lookups return the same encoded part."""
+        cache = AttachmentCache()
+
+        first = cache.get_part(self.path)
+        second = cache.get_part(self.path)
+
+        self.assertIs(first, second)
+        self.assertEqual(cache.stats, {'hits': 1, 'misses': 1, 'evictions': 0})
+        with open(self.path, 'rb') as f:
+            self.assertEqual(first.get_payload(decode=True), f.read())
+
+    def test_matches_email_encoders(self):
+        """Test that read and mmap paths both match encode_base64 output."""
+        with_newline = self._write('notes.txt', b'line one\nline two\n' * 100)
+        for path in (self.path, with_newline):
+            for threshold in (0, 1 << 30):
+                with self.subTest(path=path, mmap_threshold=threshold):
+                    cache = AttachmentCache(mmap_threshold=threshold)
+                    self.assertEqual(cache.get_part(path).get_payload(),
+                                     self._reference_payload(path))
+
+    def test_headers(self):
+        """Test the MIME headers of a cached part."""
+        part = AttachmentCache().get_part(self.path)
+
+        self.assertEqual(part['Content-Transfer-Encoding'], 'base64')
+        self.assertIn('filename= brochure.pdf', part['Content-Disposition'])
+
+    def test_modified_file_reencoded(self):
+        """Test that a changed file replaces the stale entry."""
+        cache = AttachmentCache()
+        first = cache.get_part(self.path)
+        size_before = cache.size
+
+        with open(self.path, 'ab') as f:
+            f.write(b'appendix')
+        second = cache.get_part(self.path)
+
+        self.assertIsNot(first, second)
+        self.assertGreater(cache.size, size_before)
+        self.assertEqual(len(cache._parts), 1)
+
+    def test_lru_eviction(self):
+        """Test that the byte budget evicts the least recently used part."""
+        a = self._write('a.bin', b'a' * 3000)
+        b = self._write('b.bin', b'b' * 3000)
+        c = self._write('c.bin', b'c' * 3000)
+        cache = AttachmentCache(max_bytes=9000)
+
+        part_a = cache.get_part(a)
+        cache.get_part(b)
+        cache.get_part(a)
+        cache.get_part(c)
+
+        self.assertEqual(cache.stats['evictions'], 1)
+        self.assertIs(cache.get_part(a), part_a)
+        self.assertLessEqual(cache.size, 9000)
+
+    def test_oversized_part_not_cached(self):
+        """Test that a part bigger than the budget is returned but not kept."""
+        cache = AttachmentCache(max_bytes=100)
+
+        part = cache.get_part(self.path)
+
+        self.assertIsNotNone(part)
+        self.assertEqual(cache.size, 0)
+
+    def test_missing_file(self):
+        """Test that a missing file raises OSError."""
+        with self.assertRaises(OSError):
+            AttachmentCache().get_part(os.path.join(self.temp_dir, 'missing.pdf'))
+
+    def test_agent_shares_part_across_messages(self):
+        """Test that the agent attaches the cached part to every message."""
+        agent = OutreachAgent("me@example.com", "secret", "gmail")
+        first, second = MIMEMultipart(), MIMEMultipart()
+
+        self.assertTrue(agent.attach_document(first, self.path))
+        self.assertTrue(agent.attach_document(second, self.path))
+
+        self.assertIs(first.get_payload()[0], second.get_payload()[0])
+        self.assertIn(b'filename= brochure.pdf', first.as_bytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Test cases for the benchmark harness."""
+
+import json
+import os
+import shutil
+import smtplib
+import tempfile
+import unittest
+
+from benchmarks.run import compare, percentile
+from benchmarks.smtp_sink import SMTPSink
+
+
+class TestSMTPSinkErrors(unittest.TestCase):
+    """Test cases for SMTPSink error injection."""
+
+    def test_recipients_rejected_with_error_code(self):
+        """Test that every recipient is refused at error_rate 1."""
+        with SMTPSink(error_rate=1.0, error_code=550) as sink:
+            with smtplib.SMTP(*sink.address) as server:
+                with self.assertRaises(smtplib.SMTPRecipientsRefused) as ctx:
+                    server.sendmail("me@example.com", ["a@example.com"], b"Subject: hi\r\n\r\nhi")
+
+        self.assertEqual(ctx.exception.recipients["a@example.com"][0], 550)
+        self.assertEqual(sink.stats['errors'], 1)
+        self.assertEqual(sink.stats['messages'], 0)
+
+
+class TestBenchmarkReport(unittest.TestCase):
+    """Test cases for benchmark result helpers."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_compare_flags_throughput_drop(self):
+        """Test that only runs slower than the tolerance are reported."""
+        baseline = os.path.join(self.temp_dir, 'baseline.json')
+        with open(baseline, 'w', encoding='utf-8') as f:
+            json.dump({'results': [
+                {'mode': 'sync', 'contacts': 1000, 'msgs_per_sec': 1000.0},
+                {'mode': 'async', 'contacts': 1000, 'msgs_per_sec': 1000.0},
+            ]}, f)
+
+        regressions = compare([
+            {'mode': 'sync', 'contacts': 1000, 'msgs_per_sec': 950.0},
+            {'mode': 'async', 'contacts': 1000, 'msgs_per_sec': 700.0},
+            {'mode': 'senders', 'contacts': 1000, 'msgs_per_sec': 10.0},
+        ], baseline, tolerance=0.10)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("async", regressions[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
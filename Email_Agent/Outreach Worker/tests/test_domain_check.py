@@ -0,0 +1,204 @@
+"""Test cases for domain_check module."""
+
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.agent import OutreachAgent
+from src.domain_check import DomainLookupError, DomainVerifier, socket_resolver
+
+
+class StubResolver:
+    """Local resolver answering from a fixed table and counting lookups."""
+
+    def __init__(self, table, delay=0.0):
+        self.table = table
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, domain):
+        with self._lock:
+            self.calls.append(domain)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            answer = self.table.get(domain, [])
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDomainVerifier(unittest.TestCase):
+    """Test cases for DomainVerifier class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.clock = FakeClock()
+        self.resolver = StubResolver({
+            'example.com': ['mx1.example.com'],
+            'good.org': ['mail.good.org'],
+            'flaky.net': DomainLookupError("SERVFAIL"),
+        })
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def make_verifier(self, **kwargs):
+        return DomainVerifier(resolver=self.resolver, clock=self.clock, **kwargs)
+
+    def test_one_lookup_per_unique_domain(self):
+        """Test that a list with repeated domains resolves each domain once."""
+        verifier = self.make_verifier()
+        domains = ['example.com', 'Example.COM', 'dead.invalid', 'good.org'] * 50
+
+        results = verifier.verify_domains(domains)
+
+        self.assertEqual(results, {'example.com': True, 'dead.invalid': False, 'good.org': True})
+        self.assertEqual(sorted(self.resolver.calls), ['dead.invalid', 'example.com', 'good.org'])
+
+        verifier.verify_domains(domains)
+        self.assertEqual(len(self.resolver.calls), 3)
+        self.assertEqual(verifier.stats['hits'], 3)
+
+    def test_lookups_run_concurrently(self):
+        """Test that uncached domains are resolved in parallel."""
+        self.resolver.delay = 0.05
+        verifier = self.make_verifier(max_workers=8)
+
+        verifier.verify_domains([f"domain{i}.com" for i in range(8)])
+
+        self.assertGreater(self.resolver.peak, 1)
+
+    def test_ttl_and_negative_ttl(self):
+        """Test that positive and negative results expire independently."""
+        verifier = self.make_verifier(ttl=100, negative_ttl=10)
+        verifier.verify_domains(['example.com', 'dead.invalid'])
+
+        self.clock.now += 11
+        verifier.verify_domains(['example.com', 'dead.invalid'])
+        self.assertEqual(self.resolver.calls.count('dead.invalid'), 2)
+        self.assertEqual(self.resolver.calls.count('example.com'), 1)
+
+        self.clock.now += 100
+        verifier.verify_domains(['example.com'])
+        self.assertEqual(self.resolver.calls.count('example.com'), 2)
+
+    def test_temporary_failure_counts_as_deliverable(self):
+        """Test that a failed lookup does not drop the domain and is retried later."""
+        verifier = self.make_verifier(error_ttl=5)
+
+        self.assertTrue(verifier.is_deliverable('flaky.net'))
+        self.assertEqual(verifier.stats['errors'], 1)
+        self.clock.now += 6
+        verifier.is_deliverable('flaky.net')
+        self.assertEqual(self.resolver.calls.count('flaky.net'), 2)
+
+    def test_lru_bound(self):
+        """Test that the cache keeps only the most recently used domains."""
+        verifier = self.make_verifier(max_entries=2)
+        verifier.verify_domains(['a.com'])
+        verifier.verify_domains(['b.com'])
+        verifier.verify_domains(['a.com'])
+        verifier.verify_domains(['c.com'])
+
+        verifier.verify_domains(['a.com', 'b.com'])
+
+        self.assertEqual(self.resolver.calls, ['a.com', 'b.com', 'c.com', 'b.com'])
+
+    def test_cache_persists(self):
+        """Test that results survive in the cache file until they expire."""
+        path = os.path.join(self.temp_dir, 'domains.json')
+        verifier = self.make_verifier(cache_path=path, ttl=100, negative_ttl=10)
+        verifier.verify_domains(['example.com', 'dead.invalid'])
+        verifier.save()
+
+        self.clock.now += 50
+        reloaded = self.make_verifier(cache_path=path)
+
+        self.assertEqual(reloaded.verify_domains(['example.com', 'dead.invalid']),
+                         {'example.com': True, 'dead.invalid': False})
+        self.assertEqual(self.resolver.calls.count('example.com'), 1)
+        self.assertEqual(self.resolver.calls.count('dead.invalid'), 2)
+
+    def test_failed_lookups_are_not_saved(self):
+        """Test that an unknown result is not persisted to the cache file."""
+        path = os.path.join(self.temp_dir, 'domains.json')
+        verifier = self.make_verifier(cache_path=path)
+        verifier.verify_domains(['example.com', 'flaky.net', 'dead.invalid'])
+        verifier.save()
+
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(sorted(json.load(f)), ['dead.invalid', 'example.com'])
+
+    def test_socket_resolver_failure_is_unknown(self):
+        """Test that the fallback never reports a domain without an address as undeliverable."""
+        error = socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        with patch('src.domain_check.socket.getaddrinfo', side_effect=error):
+            with self.assertRaises(DomainLookupError):
+                socket_resolver('gmail.com')
+            verifier = DomainVerifier(resolver=socket_resolver, clock=self.clock)
+            self.assertTrue(verifier.is_deliverable('gmail.com'))
+
+    def test_filter_contacts(self):
+        """Test streaming contacts through the domain filter."""
+        verifier = self.make_verifier()
+        contacts = [{'email': 'a@example.com'}, {'email': 'b@dead.invalid'},
+                    {'email': 'c@good.org'}, {'email': 'd@dead.invalid'}]
+        dropped = []
+
+        kept = list(verifier.filter_contacts(iter(contacts), on_undeliverable=dropped.append,
+                                             batch_size=3))
+
+        self.assertEqual([c['email'] for c in kept], ['a@example.com', 'c@good.org'])
+        self.assertEqual([c['email'] for c in dropped], ['b@dead.invalid', 'd@dead.invalid'])
+
+
+class TestAgentDomainVerification(unittest.TestCase):
+    """Test cases for send_bulk_outreach with a domain verifier."""
+
+    @patch('builtins.print')
+    def test_undeliverable_domains_skipped(self, mock_print):
+        """Test that contacts on dead domains never reach SMTP."""
+        agent = OutreachAgent("me@example.com", "secret", "gmail")
+        verifier = DomainVerifier(resolver=StubResolver({'example.com': ['mx.example.com']}))
+        contacts = [{'email': f"user{i}@example.com"} for i in range(3)]
+        contacts += [{'email': f"user{i}@dead.invalid"} for i in range(2)]
+
+        with patch.object(agent, 'connection_pool'), \
+                patch.object(agent, '_deliver') as send:
+            results = agent.send_bulk_outreach(contacts, "Hi", "Hello", delay=0,
+                                               domain_verifier=verifier)
+
+        self.assertEqual(results['sent'], 3)
+        self.assertEqual(results['skipped'], 2)
+        self.assertEqual(send.call_count, 3)
+        self.assertEqual(verifier.stats['lookups'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
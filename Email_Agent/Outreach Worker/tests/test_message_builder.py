@@ -0,0 +1,125 @@
+"""Test cases for message_builder module."""
+
+import email
+import os
+import shutil
+import tempfile
+import unittest
+from email.policy import default
+from unittest.mock import patch
+
+from src.agent import OutreachAgent
+from src.attachments import AttachmentCache
+from src.message_builder import MessageBuilder
+
+
+class TestMessageBuilder(unittest.TestCase):
+    """Test cases for MessageBuilder class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf = os.path.join(self.temp_dir, 'brochure.pdf')
+        with open(self.pdf, 'wb') as f:
+            f.write(b'%PDF-1.4 ' + bytes(range(256)) * 10)
+        self.cache = AttachmentCache()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def parse(self, data: bytes):
+        return email.message_from_bytes(data, policy=default)
+
+    def test_plain_message(self):
+        """Test that the output is a valid multipart message."""
+        data = MessageBuilder("me@example.com").build("you@example.com", "Hello", "Body text")
+        msg = self.parse(data)
+
+        self.assertEqual(msg['From'], "me@example.com")
+        self.assertEqual(msg['To'], "you@example.com")
+        self.assertEqual(msg['Subject'], "Hello")
+        self.assertEqual(msg.get_content_type(), 'multipart/mixed')
+        parts = list(msg.iter_parts())
+        self.assertEqual(len(parts), 1)
+        self.assertEqual(parts[0].get_content_type(), 'text/plain')
+        self.assertEqual(parts[0].get_content().strip(), "Body text")
+        self.assertNotIn(b'\n', data.replace(b'\r\n', b''))
+
+    def test_html_and_unicode(self):
+        """Test HTML bodies and non-ASCII headers and content."""
+        builder = MessageBuilder("me@example.com", html=True)
+        msg = self.parse(builder.build("you@example.com", "Grüße, José", "<p>Olá</p>"))
+
+        self.assertEqual(msg['Subject'], "Grüße, José")
+        body = next(msg.iter_parts())
+        self.assertEqual(body.get_content_type(), 'text/html')
+        self.assertEqual(body.get_content().strip(), "<p>Olá</p>")
+
+    def test_attachments_serialized_once(self):
+        """Test that attachment parts are serialized when the builder is created."""
+        part = self.cache.get_part(self.pdf)
+        with patch.object(part, 'as_bytes', wraps=part.as_bytes) as as_bytes:
+            builder = MessageBuilder("me@example.com", attachment_parts=[part])
+            messages = [builder.build(f"user{i}@example.com", "Hi", "Body") for i in range(5)]
+
+        self.assertEqual(as_bytes.call_count, 1)
+        attachment = list(self.parse(messages[-1]).iter_attachments())[0]
+        self.assertEqual(attachment.get_filename(), 'brochure.pdf')
+        with open(self.pdf, 'rb') as f:
+            self.assertEqual(attachment.get_content(), f.read())
+
+    def test_only_recipient_parts_differ(self):
+        """Test that two recipients share the same skeleton bytes."""
+        builder = MessageBuilder("me@example.com",
+                                 attachment_parts=[self.cache.get_part(self.pdf)])
+        first = builder.build("a@example.com", "Hi", "Body")
+        second = builder.build("b@example.com", "Hi", "Body")
+
+        self.assertEqual(first.replace(b"a@example.com", b"b@example.com"), second)
+
+
+class TestAgentMessageBuilding(unittest.TestCase):
+    """Test cases for message construction in OutreachAgent."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf = os.path.join(self.temp_dir, 'brochure.pdf')
+        with open(self.pdf, 'wb') as f:
+            f.write(b'version one')
+        self.agent = OutreachAgent("me@example.com", "secret", "gmail")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_builder_reused_per_campaign(self):
+        """Test that one skeleton serves every recipient."""
+        self.agent._build_message("a@example.com", "Hi", "Body", [self.pdf])
+        builder = self.agent._message_builder([self.pdf], False)
+        self.agent._build_message("b@example.com", "Hi", "Body", [self.pdf])
+
+        self.assertIs(self.agent._message_builder([self.pdf], False), builder)
+
+    def test_builder_rebuilt_when_attachment_changes(self):
+        """Test that a modified attachment produces a new skeleton."""
+        builder = self.agent._message_builder([self.pdf], False)
+        with open(self.pdf, 'wb') as f:
+            f.write(b'version two, longer')
+
+        self.assertIsNot(self.agent._message_builder([self.pdf], False), builder)
+
+    @patch('builtins.print')
+    def test_missing_attachment_skipped(self, mock_print):
+        """Test that an unreadable attachment is skipped with a warning."""
+        data = self.agent._build_message("a@example.com", "Hi", "Body",
+                                         [os.path.join(self.temp_dir, 'missing.pdf')])
+
+        msg = email.message_from_bytes(data, policy=default)
+        self.assertEqual(list(msg.iter_attachments()), [])
+        self.assertIn("Failed to attach", mock_print.call_args[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
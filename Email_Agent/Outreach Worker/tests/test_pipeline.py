@@ -0,0 +1,137 @@
+"""Test cases for pipeline module."""
+
+import email
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from email.policy import default
+from unittest.mock import patch
+
+from benchmarks.smtp_sink import SMTPSink
+from src.agent import OutreachAgent
+from src.attachments import AttachmentCache
+from src.message_builder import MessageBuilder
+from src.pipeline import CampaignRenderer, RenderPipeline
+
+
+def make_contacts(count, invalid_every=0):
+    for i in range(count):
+        address = "not-an-email" if invalid_every and i % invalid_every == 0 else f"user{i}@example.com"
+        yield {'email': address, 'name': f"User {i}"}
+
+
+class TestRenderPipeline(unittest.TestCase):
+    """Test cases for CampaignRenderer and RenderPipeline."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        pdf = os.path.join(self.temp_dir, 'brochure.pdf')
+        with open(pdf, 'wb') as f:
+            f.write(b'%PDF-1.4 brochure')
+        part = AttachmentCache().get_part(pdf)
+        self.builder = MessageBuilder("me@example.com", html=True, attachment_parts=[part])
+        self.renderer = CampaignRenderer("me@example.com", "Hi $name", "<p>Hello $name</p>",
+                                         html=True, html_template_type='simple',
+                                         boundary=self.builder.boundary)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_matches_sequential_build(self):
+        """Test that worker output equals a message built in the parent."""
+        pipeline = RenderPipeline(self.renderer, self.builder, workers=2, batch_size=3)
+
+        results = list(pipeline.run(make_contacts(10)))
+
+        self.assertEqual(len(results), 10)
+        for i, (contact, subject, msg) in enumerate(results):
+            self.assertEqual(contact['email'], f"user{i}@example.com")
+            self.assertEqual(subject, f"Hi User {i}")
+            expected = self.builder.build(contact['email'], subject, self.renderer.render(contact)[1])
+            self.assertEqual(msg, expected)
+
+        parsed = email.message_from_bytes(results[0][2], policy=default)
+        self.assertEqual(next(parsed.iter_parts()).get_content_type(), 'text/html')
+        self.assertEqual(list(parsed.iter_attachments())[0].get_filename(), 'brochure.pdf')
+
+    def test_invalid_contacts_not_rendered(self):
+        """Test that contacts with invalid addresses come back empty, in order."""
+        pipeline = RenderPipeline(self.renderer, self.builder,
+                                  executor=ThreadPoolExecutor(2), batch_size=4)
+
+        results = list(pipeline.run(make_contacts(9, invalid_every=3)))
+
+        self.assertEqual([r[0]['name'] for r in results], [f"User {i}" for i in range(9)])
+        self.assertEqual([r[2] is None for r in results], [i % 3 == 0 for i in range(9)])
+
+    def test_back_pressure_limits_read_ahead(self):
+        """Test that the pipeline reads only max_pending batches ahead of the consumer."""
+        read = []
+
+        def contacts():
+            for contact in make_contacts(1000):
+                read.append(contact)
+                yield contact
+
+        with ThreadPoolExecutor(2) as executor:
+            pipeline = RenderPipeline(self.renderer, self.builder, executor=executor,
+                                      batch_size=5, max_pending=3)
+            results = pipeline.run(contacts())
+            next(results)
+            self.assertLessEqual(len(read), 15)
+            results.close()
+
+    def test_boundary_must_match(self):
+        """Test that a renderer and builder with different boundaries are rejected."""
+        with self.assertRaises(ValueError):
+            RenderPipeline(CampaignRenderer("me@example.com", "s", "b"), self.builder)
+
+    def test_renderer_pickles_without_builder(self):
+        """Test that the per-process builder cache is not shipped to workers."""
+        self.renderer.render_head({'email': 'a@example.com', 'name': 'A'})
+
+        clone = pickle.loads(pickle.dumps(self.renderer))
+
+        self.assertIsNone(clone._builder)
+        self.assertEqual(clone.render_head({'email': 'a@example.com', 'name': 'A'}),
+                         self.renderer.render_head({'email': 'a@example.com', 'name': 'A'}))
+
+
+@patch('builtins.print')
+class TestAgentRenderWorkers(unittest.TestCase):
+    """Test cases for send_bulk_outreach with render_workers."""
+
+    def setUp(self):
+        """Start a local SMTP sink and an agent pointed at it."""
+        self.sink = SMTPSink().start()
+        host, port = self.sink.address
+        self.agent = OutreachAgent(
+            "sender@example.com",
+            "secret",
+            custom_smtp={'smtp_server': host, 'smtp_port': port, 'use_tls': False}
+        )
+
+    def tearDown(self):
+        """Stop the sink."""
+        self.sink.stop()
+
+    def test_bulk_outreach_with_render_workers(self, mock_print):
+        """Test a campaign rendered in worker processes."""
+        results = self.agent.send_bulk_outreach(
+            make_contacts(20, invalid_every=10), "Hi $name", "Hello $name",
+            delay=0, html=True, render_workers=2
+        )
+
+        self.assertEqual(results['sent'], 18)
+        self.assertEqual(results['skipped'], 2)
+        self.assertEqual(self.sink.stats['messages'], 18)
+        self.assertEqual(self.sink.stats['logins'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
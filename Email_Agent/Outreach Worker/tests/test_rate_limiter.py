@@ -0,0 +1,197 @@
+"""Test cases for rate_limiter module."""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from src.agent import OutreachAgent
+from src.rate_limiter import TokenBucket, RateLimiter, DomainScheduler, recipient_domain
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for TokenBucket class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+
+    def test_burst_then_refill(self):
+        """Test that a full bucket allows a burst and then refills at rate."""
+        bucket = TokenBucket(rate=2, capacity=3, clock=self.clock)
+
+        self.assertTrue(all(bucket.try_consume() for _ in range(3)))
+        self.assertFalse(bucket.try_consume())
+        self.assertAlmostEqual(bucket.wait_time(), 0.5)
+
+        self.clock.advance(0.5)
+        self.assertTrue(bucket.try_consume())
+
+    def test_capacity_caps_refill(self):
+        """Test that idle time does not accumulate beyond capacity."""
+        bucket = TokenBucket(rate=1, capacity=2, clock=self.clock)
+        self.clock.advance(100)
+
+        self.assertTrue(bucket.try_consume())
+        self.assertTrue(bucket.try_consume())
+        self.assertFalse(bucket.try_consume())
+
+    def test_invalid_rate(self):
+        """Test that the rate must be positive."""
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for RateLimiter class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+
+    def test_all_buckets_must_have_tokens(self):
+        """Test that an empty domain bucket blocks without draining the account."""
+        limiter = RateLimiter(account_rate=10, domain_rate=1, clock=self.clock)
+
+        self.assertTrue(limiter.try_acquire('me@x.com', None, 'gmail.com'))
+        self.assertFalse(limiter.try_acquire('me@x.com', None, 'gmail.com'))
+        self.assertTrue(limiter.try_acquire('me@x.com', None, 'yahoo.com'))
+
+    def test_service_limits_from_config(self):
+        """Test that service budgets come from EmailServiceConfig."""
+        limiter = RateLimiter(clock=self.clock)
+
+        bucket = limiter.bucket('service', 'office365')
+        self.assertEqual(bucket.rate, 0.5)
+        self.assertEqual(bucket.capacity, 1)
+        self.assertIsNone(limiter.bucket('service', 'gmail'))
+        self.assertIsNone(limiter.bucket('service', 'custom'))
+
+    def test_domain_overrides(self):
+        """Test per-domain rate overrides."""
+        limiter = RateLimiter(domain_rate=1, domain_overrides={'Gmail.com': 5}, clock=self.clock)
+
+        self.assertEqual(limiter.bucket('domain', 'gmail.com').rate, 5)
+        self.assertEqual(limiter.bucket('domain', 'yahoo.com').rate, 1)
+
+    def test_unlimited_by_default(self):
+        """Test that no configured rates means no waiting."""
+        limiter = RateLimiter(clock=self.clock)
+
+        self.assertEqual(limiter.wait_time('me@x.com', 'custom', 'gmail.com'), 0.0)
+
+    def test_acquire_sleeps_until_token(self):
+        """Test that acquire blocks for the wait time and then takes a token."""
+        limiter = RateLimiter(domain_rate=2, burst=1, clock=self.clock)
+        limiter.acquire(domain='gmail.com')
+
+        with patch('src.rate_limiter.time.sleep', side_effect=self.clock.advance) as mock_sleep:
+            limiter.acquire(domain='gmail.com')
+
+        mock_sleep.assert_called_once_with(0.5)
+        self.assertFalse(limiter.try_acquire(domain='gmail.com'))
+
+
+class TestDomainScheduler(unittest.TestCase):
+    """Test cases for DomainScheduler class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(domain_rate=1, burst=1, clock=self.clock)
+
+    def test_interleaves_domains(self):
+        """Test that a throttled domain does not block other domains."""
+        contacts = [{'email': f"u{i}@gmail.com"} for i in range(3)]
+        contacts.append({'email': 'a@yahoo.com'})
+        contacts.append({'email': 'b@outlook.com'})
+        scheduler = DomainScheduler(contacts, self.limiter)
+
+        first_round = []
+        while True:
+            contact, wait = scheduler.poll()
+            if contact is None:
+                break
+            first_round.append(contact['email'])
+
+        self.assertEqual(first_round, ['u0@gmail.com', 'a@yahoo.com', 'b@outlook.com'])
+        self.assertAlmostEqual(wait, 1.0)
+
+        self.clock.advance(wait)
+        self.assertEqual(scheduler.poll()[0]['email'], 'u1@gmail.com')
+
+    def test_iterates_all_contacts(self):
+        """Test that iteration yields every contact exactly once."""
+        contacts = [{'email': f"u{i}@d{i % 3}.com"} for i in range(9)]
+        scheduler = DomainScheduler(contacts, self.limiter, lookahead=2)
+
+        with patch('src.rate_limiter.time.sleep', side_effect=self.clock.advance):
+            result = [c['email'] for c in scheduler]
+
+        self.assertEqual(sorted(result), sorted(c['email'] for c in contacts))
+        self.assertTrue(scheduler.done)
+
+    def test_sender_budget_limits_total(self):
+        """Test that the account budget caps the aggregate rate."""
+        limiter = RateLimiter(account_rate=1, burst=1, clock=self.clock)
+        contacts = [{'email': 'a@x.com'}, {'email': 'b@y.com'}]
+        scheduler = DomainScheduler(contacts, limiter, account='me@example.com')
+
+        self.assertIsNotNone(scheduler.poll()[0])
+        contact, wait = scheduler.poll()
+        self.assertIsNone(contact)
+        self.assertAlmostEqual(wait, 1.0)
+
+    def test_next_async(self):
+        """Test the non-blocking async accessor."""
+        scheduler = DomainScheduler([{'email': 'a@x.com'}], self.limiter)
+
+        async def drain():
+            return [await scheduler.next_async(), await scheduler.next_async()]
+
+        first, second = asyncio.run(drain())
+        self.assertEqual(first['email'], 'a@x.com')
+        self.assertIsNone(second)
+
+    def test_recipient_domain(self):
+        """Test domain extraction."""
+        self.assertEqual(recipient_domain('User@Example.COM '), 'example.com')
+        self.assertEqual(recipient_domain('invalid'), '')
+
+
+class TestAgentRateLimiting(unittest.TestCase):
+    """Test cases for rate-limited bulk outreach."""
+
+    @patch('builtins.print')
+    @patch('src.agent.time.sleep')
+    def test_bulk_outreach_uses_scheduler(self, mock_agent_sleep, mock_print):
+        """Test that a rate limiter replaces the fixed delay."""
+        agent = OutreachAgent("me@example.com", "secret", "gmail")
+        limiter = RateLimiter(domain_rate=100, burst=10)
+        contacts = [{'email': 'a@x.com'}, {'email': 'b@y.com'}]
+
+        with patch.object(agent, '_deliver') as send:
+            with patch.object(agent, 'connection_pool'):
+                results = agent.send_bulk_outreach(contacts, "Hi", "Hello",
+                                                   delay=5, rate_limiter=limiter)
+
+        self.assertEqual(results['sent'], 2)
+        self.assertEqual(send.call_count, 2)
+        mock_agent_sleep.assert_not_called()
+        self.assertEqual(agent.service, 'gmail')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,202 @@
+"""Test cases for recipient_index module."""
+
+import multiprocessing
+import os
+import shutil
+import smtplib
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.agent import OutreachAgent
+from src.recipient_index import RecipientIndex
+
+DAY = 24 * 3600
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def reserve_all(db_path: str, campaign_id: str, results):
+    """Worker process: reserve every address of a shared list."""
+    with RecipientIndex(db_path, campaign_id=campaign_id) as index:
+        emails = [f"user{i}@example.com" for i in range(200)]
+        allowed = []
+        for start in range(0, len(emails), 10):
+            allowed.extend(index.reserve_many(emails[start:start + 10]))
+    results.put([email for email, ok in zip(emails, allowed) if ok])
+
+
+class TestRecipientIndex(unittest.TestCase):
+    """Test cases for RecipientIndex class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'recipients.db')
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_address_variants_are_one_recipient(self):
+        """Test that case and whitespace variants hit the same cap."""
+        with RecipientIndex(self.db_path, clock=self.clock) as index:
+            allowed = index.reserve_many(["Jane@Example.com", " jane@example.com ", "JANE@EXAMPLE.COM"])
+
+        self.assertEqual(allowed, [True, False, False])
+
+    def test_cap_applies_across_campaigns_until_window_passes(self):
+        """Test a once-per-7-days cap shared by two campaigns."""
+        first = RecipientIndex(self.db_path, campaign_id='spring', clock=self.clock)
+        second = RecipientIndex(self.db_path, campaign_id='summer', clock=self.clock)
+        self.assertTrue(first.reserve("a@example.com"))
+        first.mark_sent("a@example.com")
+
+        self.clock.now += 6 * DAY
+        self.assertFalse(second.reserve("a@example.com"))
+        self.clock.now += 1 * DAY + 1
+        self.assertTrue(second.reserve("a@example.com"))
+
+        self.assertEqual(second.last_contacted("a@example.com", 'spring'), self.clock.now - 7 * DAY - 1)
+        self.assertEqual(second.last_contacted("a@example.com"), self.clock.now)
+        first.close()
+        second.close()
+
+    def test_max_contacts_per_window(self):
+        """Test a cap allowing two messages per window."""
+        with RecipientIndex(self.db_path, max_contacts=2, window=DAY, clock=self.clock) as index:
+            self.assertTrue(index.reserve("a@example.com"))
+            self.clock.now += 60
+            self.assertTrue(index.reserve("a@example.com"))
+            self.assertFalse(index.reserve("a@example.com"))
+            self.clock.now += DAY - 30
+            self.assertTrue(index.reserve("a@example.com"))
+
+    def test_release_after_failed_send(self):
+        """Test that a released reservation does not count against the cap."""
+        with RecipientIndex(self.db_path, clock=self.clock) as index:
+            index.reserve("a@example.com")
+            index.release("A@example.com")
+
+            self.assertIsNone(index.last_contacted("a@example.com"))
+            self.assertTrue(index.reserve("a@example.com"))
+
+    def test_filter_contacts_releases_unyielded_on_early_stop(self):
+        """Test that stopping a filtered stream frees reservations not yet used."""
+        contacts = [{'email': f"user{i}@example.com"} for i in range(10)]
+        with RecipientIndex(self.db_path, clock=self.clock) as index:
+            stream = index.filter_contacts(contacts, batch_size=10)
+            next(stream)
+            stream.close()
+
+            self.assertEqual(index.stats['released'], 9)
+            self.assertFalse(index.reserve("user0@example.com"))
+            self.assertTrue(index.reserve("user1@example.com"))
+
+    def test_count_allowed_reserves_nothing(self):
+        """Test that counting allowed recipients leaves the index unchanged."""
+        with RecipientIndex(self.db_path, clock=self.clock) as index:
+            index.reserve("old@example.com")
+            emails = ["a@example.com", " A@example.com", "old@example.com", "b@example.com"]
+
+            self.assertEqual(index.count_allowed(emails), 2)
+            self.assertEqual(index.stats['reserved'], 1)
+            self.assertTrue(index.reserve("a@example.com"))
+
+    def test_prune(self):
+        """Test that contacts outside the window are deleted."""
+        with RecipientIndex(self.db_path, window=DAY, clock=self.clock) as index:
+            index.reserve("old@example.com")
+            self.clock.now += 2 * DAY
+            index.reserve("new@example.com")
+
+            self.assertEqual(index.prune(), 1)
+            self.assertIsNone(index.last_contacted("old@example.com"))
+
+    def test_concurrent_runs_never_share_an_address(self):
+        """Test that processes reserving the same list split it without overlap."""
+        ctx = multiprocessing.get_context('spawn')
+        results = ctx.Queue()
+        workers = [ctx.Process(target=reserve_all, args=(self.db_path, f"c{n}", results))
+                   for n in range(3)]
+        for worker in workers:
+            worker.start()
+        granted = [results.get(timeout=60) for _ in workers]
+        for worker in workers:
+            worker.join(timeout=60)
+
+        flat = [email for part in granted for email in part]
+        self.assertEqual(len(flat), 200)
+        self.assertEqual(len(set(flat)), 200)
+
+
+@patch('builtins.print')
+class TestAgentRecipientIndex(unittest.TestCase):
+    """Test cases for send_bulk_outreach with a recipient index."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.index = RecipientIndex(os.path.join(self.temp_dir, 'recipients.db'))
+        self.agent = OutreachAgent("me@example.com", "secret", "gmail")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.index.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_duplicates_and_recent_recipients_skipped(self, mock_print):
+        """Test that repeats within and across campaigns are not mailed."""
+        self.index.reserve("old@example.com")
+        contacts = [{'email': 'a@example.com'}, {'email': ' A@Example.com'},
+                    {'email': 'old@example.com'}, {'email': 'b@example.com'}]
+
+        with patch.object(self.agent, 'connection_pool'), \
+                patch.object(self.agent, '_deliver') as deliver:
+            results = self.agent.send_bulk_outreach(contacts, "Hi", "Hello", delay=0,
+                                                    recipient_index=self.index)
+
+        self.assertEqual(results['sent'], 2)
+        self.assertEqual(results['skipped'], 2)
+        self.assertEqual([c.args[0] for c in deliver.call_args_list],
+                         ['a@example.com', 'b@example.com'])
+
+    def test_interrupted_campaign_keeps_unsent_recipients_free(self, mock_print):
+        """Test that recipients after the point of interruption are not reserved."""
+        contacts = [{'email': f"user{i}@example.com"} for i in range(5)]
+
+        with patch.object(self.agent, 'connection_pool'), \
+                patch.object(self.agent, '_deliver', side_effect=[None, KeyboardInterrupt]):
+            with self.assertRaises(KeyboardInterrupt):
+                self.agent.send_bulk_outreach(contacts, "Hi", "Hello", delay=0,
+                                              recipient_index=self.index)
+
+        # Sent, and interrupted mid-send (kept: it may have gone out)
+        self.assertFalse(self.index.reserve("user0@example.com"))
+        self.assertFalse(self.index.reserve("user1@example.com"))
+        for i in range(2, 5):
+            self.assertTrue(self.index.reserve(f"user{i}@example.com"))
+
+    def test_failed_send_can_be_retried_later(self, mock_print):
+        """Test that a permanently failed recipient is released from the index."""
+        error = smtplib.SMTPDataError(550, b"mailbox unavailable")
+        with patch.object(self.agent, 'connection_pool'), \
+                patch.object(self.agent, '_deliver', side_effect=error):
+            results = self.agent.send_bulk_outreach([{'email': 'a@example.com'}], "Hi", "Hello",
+                                                    delay=0, recipient_index=self.index)
+
+        self.assertEqual(results['failed'], 1)
+        self.assertTrue(self.index.reserve("a@example.com"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+"""Test cases for retry module."""
+
+import smtplib
+import unittest
+from unittest.mock import patch
+
+from src.agent import OutreachAgent
+from src.retry import (AUTH, PERMANENT, RETRYABLE, RetryScheduler, backoff_delay,
+                       classify_smtp_error)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestClassifySMTPError(unittest.TestCase):
+    """Test cases for classify_smtp_error."""
+
+    def test_classification(self):
+        """Test 4xx/5xx/auth/connection errors."""
+        cases = [
+            (smtplib.SMTPAuthenticationError(535, b"bad credentials"), AUTH),
+            (smtplib.SMTPDataError(550, b"mailbox unavailable"), PERMANENT),
+            (smtplib.SMTPSenderRefused(553, b"sender rejected", "me@x.com"), PERMANENT),
+            (smtplib.SMTPDataError(451, b"greylisted, try later"), RETRYABLE),
+            (smtplib.SMTPRecipientsRefused({'a@x.com': (550, b"no such user")}), PERMANENT),
+            (smtplib.SMTPRecipientsRefused({'a@x.com': (450, b"mailbox busy")}), RETRYABLE),
+            (smtplib.SMTPServerDisconnected("gone"), RETRYABLE),
+            (ConnectionError("reset"), RETRYABLE),
+            (TimeoutError(), RETRYABLE),
+        ]
+        for error, expected in cases:
+            with self.subTest(error=error):
+                self.assertEqual(classify_smtp_error(error), expected)
+
+
+class TestRetryScheduler(unittest.TestCase):
+    """Test cases for backoff_delay and RetryScheduler."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+
+    def test_backoff_grows_with_jitter_and_cap(self):
+        """Test equal-jitter exponential backoff bounds."""
+        self.assertEqual(backoff_delay(1, 4, rng=lambda: 0.0), 2.0)
+        self.assertEqual(backoff_delay(1, 4, rng=lambda: 1.0), 4.0)
+        self.assertEqual(backoff_delay(3, 4, rng=lambda: 1.0), 16.0)
+        self.assertEqual(backoff_delay(10, 4, cap=60, rng=lambda: 1.0), 60.0)
+
+    def test_items_come_back_when_due(self):
+        """Test that parked items are returned in due order."""
+        retries = RetryScheduler(max_attempts=3, base_delay=10, clock=self.clock, rng=lambda: 1.0)
+        retries.park('slow', 2)  # due in 20s
+        retries.park('fast', 1)  # due in 10s
+
+        self.assertIsNone(retries.pop_due())
+        self.assertEqual(retries.wait_time(), 10)
+
+        self.clock.now = 20
+        self.assertEqual(retries.pop_due(), ('fast', 1))
+        self.assertEqual(retries.pop_due(), ('slow', 2))
+        self.assertIsNone(retries.wait_time())
+
+    def test_attempts_exhausted(self):
+        """Test that an item out of attempts is not parked."""
+        retries = RetryScheduler(max_attempts=2, clock=self.clock)
+
+        self.assertIsNotNone(retries.park('item', 1))
+        self.assertIsNone(retries.park('item', 2))
+        self.assertEqual(len(retries), 1)
+
+
+@patch('builtins.print')
+class TestAgentRetries(unittest.TestCase):
+    """Test cases for non-blocking retries in send_bulk_outreach."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.agent = OutreachAgent("me@example.com", "secret", "gmail")
+        self.agent.retry_delay = 0.01
+        self.contacts = [{'email': f"{name}@example.com"} for name in ('a', 'b', 'c')]
+
+    def run_campaign(self, errors):
+        delivered = []
+
+        def deliver(recipient, msg):
+            delivered.append(recipient)
+            pending = errors.get(recipient)
+            if pending:
+                raise pending.pop(0)
+
+        with patch.object(self.agent, '_deliver', side_effect=deliver), \
+                patch.object(self.agent, 'connection_pool'):
+            results = self.agent.send_bulk_outreach(self.contacts, "Hi", "Hello", delay=0)
+        return results, delivered
+
+    def test_greylisted_recipient_does_not_block_others(self, mock_print):
+        """Test that a 4xx recipient is parked while the others are sent."""
+        results, delivered = self.run_campaign({
+            'a@example.com': [smtplib.SMTPDataError(451, b"greylisted")]
+        })
+
+        self.assertEqual(results['sent'], 3)
+        self.assertEqual(delivered[:3], ['a@example.com', 'b@example.com', 'c@example.com'])
+        self.assertEqual(delivered[3], 'a@example.com')
+        retried = [e for e in self.agent.sent_log if e['recipient'] == 'a@example.com']
+        self.assertEqual(retried[0]['attempt'], 2)
+
+    def test_permanent_failure_not_retried(self, mock_print):
+        """Test that a 5xx recipient fails immediately."""
+        results, delivered = self.run_campaign({
+            'b@example.com': [smtplib.SMTPDataError(550, b"no such user")]
+        })
+
+        self.assertEqual(results['sent'], 2)
+        self.assertEqual(results['failed'], 1)
+        self.assertEqual(delivered.count('b@example.com'), 1)
+        self.assertIn("550", results['failed_emails'][0]['error'])
+
+    def test_retries_exhausted(self, mock_print):
+        """Test that a recipient failing every attempt ends up failed."""
+        self.agent.retry_count = 3
+        results, delivered = self.run_campaign({
+            'c@example.com': [ConnectionError("reset")] * 3
+        })
+
+        self.assertEqual(results['failed'], 1)
+        self.assertEqual(delivered.count('c@example.com'), 3)
+        self.assertEqual(self.agent.sent_log[-1]['attempts'], 3)
+
+    @patch('src.agent.time.sleep')
+    def test_single_send_permanent_failure(self, mock_sleep, mock_print):
+        """Test that send_email_with_retry does not retry 5xx replies."""
+        error = smtplib.SMTPRecipientsRefused({'a@example.com': (550, b"no such user")})
+        with patch.object(self.agent, '_deliver', side_effect=error) as deliver:
+            success, message = self.agent.send_email_with_retry("a@example.com", "Hi", "Body")
+
+        self.assertFalse(success)
+        self.assertEqual(deliver.call_count, 1)
+        mock_sleep.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""Test cases for send_log module."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.agent import OutreachAgent
+from src.send_log import SendLog, read_send_log
+
+
+class TestSendLog(unittest.TestCase):
+    """Test cases for SendLog class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'logs', 'sends.jsonl')
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_records_written_as_json_lines(self):
+        """Test that every appended record becomes one JSON line."""
+        with SendLog(self.path, batch_size=10) as log:
+            for i in range(25):
+                log.append({'recipient': f"user{i}@example.com", 'status': 'sent'})
+
+        with open(self.path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 25)
+        self.assertEqual(json.loads(lines[-1])['recipient'], "user24@example.com")
+        self.assertGreaterEqual(log.stats['batches'], 3)
+
+    def test_flush_makes_records_visible_to_readers(self):
+        """Test that another reader sees records after flush, while the log is open."""
+        log = SendLog(self.path, flush_interval=60)
+        try:
+            log.append({'recipient': "a@example.com", 'status': 'sent'})
+            log.flush()
+
+            self.assertEqual([r['recipient'] for r in read_send_log(self.path)], ["a@example.com"])
+        finally:
+            log.close()
+
+    def test_appends_to_existing_log(self):
+        """Test that reopening a log continues after the existing records."""
+        with SendLog(self.path) as log:
+            log.append({'n': 1})
+        with SendLog(self.path) as log:
+            log.append({'n': 2})
+
+        self.assertEqual([r['n'] for r in read_send_log(self.path)], [1, 2])
+
+    def test_rotation_with_compression(self):
+        """Test that full files are rotated into gzip segments and read back in order."""
+        with SendLog(self.path, batch_size=1, max_bytes=200, compress=True) as log:
+            for i in range(40):
+                log.append({'n': i, 'recipient': f"user{i}@example.com"})
+
+        segments = sorted(name for name in os.listdir(os.path.dirname(self.path))
+                          if name != 'sends.jsonl')
+        self.assertGreater(log.stats['rotations'], 1)
+        self.assertTrue(all(name.endswith('.gz') for name in segments))
+        self.assertEqual([r['n'] for r in read_send_log(self.path)], list(range(40)))
+
+    def test_rotation_continues_numbering(self):
+        """Test that a reopened log does not overwrite earlier segments."""
+        with SendLog(self.path, batch_size=1, max_bytes=1) as log:
+            log.append({'n': 1})
+        with SendLog(self.path, batch_size=1, max_bytes=1) as log:
+            log.append({'n': 2})
+
+        self.assertTrue(os.path.exists(self.path + '.2'))
+        self.assertEqual([r['n'] for r in read_send_log(self.path)], [1, 2])
+
+    def test_incomplete_last_line_skipped(self):
+        """Test that a half-written trailing line is ignored by readers."""
+        with SendLog(self.path) as log:
+            log.append({'n': 1})
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"n": 2')
+
+        self.assertEqual([r['n'] for r in read_send_log(self.path)], [1])
+
+    def test_append_after_close(self):
+        """Test that a closed log rejects records."""
+        log = SendLog(self.path)
+        log.close()
+
+        with self.assertRaises(ValueError):
+            log.append({'n': 1})
+
+
+class TestAgentSendLog(unittest.TestCase):
+    """Test cases for OutreachAgent with a streaming send log."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'sends.jsonl')
+        self.agent = OutreachAgent("me@example.com", "secret", "gmail")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    @patch('builtins.print')
+    def test_results_streamed_instead_of_kept(self, mock_print):
+        """Test that results go to the send log and not to sent_log."""
+        self.agent.send_log = SendLog(self.path)
+        with patch.object(self.agent, '_deliver'):
+            for i in range(3):
+                self.agent.send_email_with_retry(f"user{i}@example.com", "Hi", "Body")
+        self.agent.send_log.close()
+
+        self.assertEqual(self.agent.sent_log, [])
+        records = list(read_send_log(self.path))
+        self.assertEqual([r['status'] for r in records], ['sent'] * 3)
+        self.assertEqual(records[0]['recipient'], "user0@example.com")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+"""Test cases for send_queue module."""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from src.agent import OutreachAgent
+from src.send_queue import SendQueue
+
+
+def drain_queue(db_path: str, campaign_id: str):
+    """Worker process: claim contacts and mark them sent."""
+    queue = SendQueue(db_path, campaign_id=campaign_id)
+    for contact in queue.consume(batch_size=5):
+        queue.mark_sent(contact['email'])
+    queue.close()
+
+
+def crash_while_sending(db_path: str, campaign_id: str, crash_at: str):
+    """Worker process: send until ``crash_at`` is claimed, then die without cleanup."""
+    queue = SendQueue(db_path, campaign_id=campaign_id)
+    for contact in queue.consume():
+        if contact['email'] == crash_at:
+            os._exit(1)
+        queue.mark_sent(contact['email'])
+
+
+class TestSendQueue(unittest.TestCase):
+    """Test cases for SendQueue class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'queue.db')
+        self.contacts = [{'email': f"user{i}@example.com", 'name': f"User {i}"} for i in range(20)]
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_enqueue_is_idempotent(self):
+        """Test that re-enqueueing the same contacts adds nothing."""
+        with SendQueue(self.db_path) as queue:
+            self.assertEqual(queue.enqueue(self.contacts), 20)
+            self.assertEqual(queue.enqueue(self.contacts), 0)
+            self.assertEqual(queue.stats()['pending'], 20)
+
+    def test_claim_and_mark(self):
+        """Test state transitions for claimed contacts."""
+        with SendQueue(self.db_path) as queue:
+            queue.enqueue(self.contacts)
+            claimed = queue.claim(3)
+            self.assertEqual([c['email'] for c in claimed],
+                             ['user0@example.com', 'user1@example.com', 'user2@example.com'])
+
+            queue.mark_sent('user0@example.com')
+            queue.mark_failed('user1@example.com', "550 No such user")
+
+            self.assertEqual(queue.stats(), {'pending': 17, 'in_flight': 1, 'sent': 1, 'failed': 1})
+            self.assertEqual(queue.remaining(), 18)
+
+    def test_resume_after_crash(self):
+        """Test that a new run only sends what the crashed run did not."""
+        with SendQueue(self.db_path, campaign_id='launch') as queue:
+            queue.enqueue(self.contacts)
+        ctx = multiprocessing.get_context('spawn')
+        crashed = ctx.Process(target=crash_while_sending,
+                              args=(self.db_path, 'launch', 'user7@example.com'))
+        crashed.start()
+        crashed.join(timeout=60)
+        self.assertEqual(crashed.exitcode, 1)
+
+        # The default lease has not expired, but its holder is gone
+        resumed = SendQueue(self.db_path, campaign_id='launch')
+        self.assertEqual(resumed.stats()['in_flight'], 3)
+        resumed.enqueue(self.contacts)
+        remaining = [c['email'] for c in resumed.consume()]
+        resumed.close()
+
+        self.assertEqual(remaining[0], 'user7@example.com')
+        self.assertEqual(len(remaining), 13)
+
+    def test_restart_with_same_worker_id(self):
+        """Test that leases left under a fixed worker id are reclaimed on startup."""
+        queue = SendQueue(self.db_path, worker_id='worker-1')
+        queue.enqueue(self.contacts[:3])
+        queue.claim(3)
+        queue.close()
+
+        with SendQueue(self.db_path, worker_id='worker-1') as restarted:
+            self.assertEqual(restarted.stats()['pending'], 3)
+
+    def test_only_lease_holder_can_finish(self):
+        """Test that a worker whose lease was taken over cannot mark the contact."""
+        first = SendQueue(self.db_path, worker_id='a', lease_seconds=0)
+        second = SendQueue(self.db_path, worker_id='b')
+        first.enqueue(self.contacts[:1])
+        first.claim(1)
+        self.assertEqual(len(second.claim(1)), 1)
+
+        self.assertFalse(first.mark_sent('user0@example.com'))
+        self.assertEqual(second.stats()['in_flight'], 1)
+        self.assertTrue(second.mark_sent('user0@example.com'))
+        first.close()
+        second.close()
+
+    def test_leases_are_renewed_during_slow_sends(self):
+        """Test that a lease outliving its send time is not taken over."""
+        first = SendQueue(self.db_path, worker_id='a', lease_seconds=0.3)
+        second = SendQueue(self.db_path, worker_id='b')
+        first.enqueue(self.contacts[:1])
+        first.claim(1)
+
+        time.sleep(0.6)  # a send slower than the lease
+        self.assertEqual(second.claim(1), [])
+        self.assertTrue(first.mark_sent('user0@example.com'))
+        first.close()
+        second.close()
+
+    def test_unexpired_lease_is_not_reclaimed(self):
+        """Test that another worker cannot take contacts still leased."""
+        first = SendQueue(self.db_path, worker_id='a')
+        second = SendQueue(self.db_path, worker_id='b')
+        first.enqueue(self.contacts[:2])
+
+        self.assertEqual(len(first.claim(2)), 2)
+        self.assertEqual(second.claim(2), [])
+        first.close()
+        second.close()
+
+    def test_campaigns_are_isolated(self):
+        """Test that the same address can be queued in separate campaigns."""
+        with SendQueue(self.db_path, campaign_id='a') as a, \
+                SendQueue(self.db_path, campaign_id='b') as b:
+            a.enqueue(self.contacts[:1])
+            self.assertEqual(b.enqueue(self.contacts[:1]), 1)
+
+    def test_multiple_processes_no_double_send(self):
+        """Test that concurrent workers split the queue without overlap."""
+        with SendQueue(self.db_path, campaign_id='mp') as queue:
+            queue.enqueue({'email': f"user{i}@example.com"} for i in range(200))
+
+        ctx = multiprocessing.get_context('spawn')
+        workers = [ctx.Process(target=drain_queue, args=(self.db_path, 'mp')) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+
+        with SendQueue(self.db_path, campaign_id='mp') as queue:
+            self.assertEqual(queue.stats()['sent'], 200)
+            attempts = queue._conn.execute(
+                "SELECT MAX(attempts) FROM send_queue WHERE campaign = 'mp'"
+            ).fetchone()[0]
+        self.assertEqual(attempts, 1)
+
+
+class TestAgentSendQueue(unittest.TestCase):
+    """Test cases for queue-backed bulk outreach."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'queue.db')
+        self.agent = OutreachAgent("me@example.com", "secret", "gmail")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    @patch('builtins.print')
+    def test_bulk_outreach_checkpoints(self, mock_print):
+        """Test that a rerun skips recipients already sent."""
+        contacts = [{'email': 'a@example.com'}, {'email': 'bad'}, {'email': 'c@example.com'}]
+
+        with SendQueue(self.db_path) as queue, \
+                patch.object(self.agent, 'connection_pool'), \
+                patch.object(self.agent, '_deliver') as send:
+            first = self.agent.send_bulk_outreach(contacts, "Hi", "Hello", delay=0, queue=queue)
+            second = self.agent.send_bulk_outreach(contacts, "Hi", "Hello", delay=0, queue=queue)
+            stats = queue.stats()
+
+        self.assertEqual(first['sent'], 2)
+        self.assertEqual(first['skipped'], 1)
+        self.assertEqual(second['sent'], 0)
+        self.assertEqual(send.call_count, 2)
+        # Invalid addresses are filtered out before they reach the queue
+        self.assertEqual(stats, {'pending': 0, 'in_flight': 0, 'sent': 2, 'failed': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+"""Test cases for sender_pool module."""
+
+import smtplib
+import time
+import unittest
+from unittest.mock import patch
+
+from src.sender_pool import SenderAccount, SenderPool
+
+
+def make_account(email: str, daily_limit: int = 100, **kwargs) -> SenderAccount:
+    return SenderAccount(email, "password", "gmail", daily_limit=daily_limit, **kwargs)
+
+
+class TestSenderAccount(unittest.TestCase):
+    """Test cases for SenderAccount class."""
+
+    def test_daily_limit_from_service(self):
+        """Test that the quota defaults to the service's published limit."""
+        account = SenderAccount("a@example.com", "pw", "office365")
+        self.assertEqual(account.daily_limit, 10000)
+
+        account = SenderAccount("b@example.com", "pw", "sendgrid")
+        self.assertEqual(account.daily_limit, SenderAccount.DEFAULT_DAILY_LIMIT)
+
+    def test_remaining_quota(self):
+        """Test remaining quota accounting."""
+        account = make_account("a@example.com", daily_limit=10, sent_today=4)
+        self.assertEqual(account.remaining, 6)
+        self.assertTrue(account.is_available(0))
+
+        account.sent_today = 10
+        self.assertFalse(account.is_available(0))
+
+
+class TestSenderPool(unittest.TestCase):
+    """Test cases for SenderPool class."""
+
+    def test_requires_accounts(self):
+        """Test that an empty pool is rejected."""
+        with self.assertRaises(ValueError):
+            SenderPool([])
+
+    def test_weighted_round_robin(self):
+        """Test that selection is proportional to remaining quota."""
+        big = make_account("big@example.com", daily_limit=300)
+        small = make_account("small@example.com", daily_limit=100)
+        pool = SenderPool([big, small])
+
+        picks = [pool.select_account().email for _ in range(8)]
+
+        self.assertEqual(picks.count("big@example.com"), 6)
+        self.assertEqual(picks.count("small@example.com"), 2)
+        self.assertNotEqual(picks[:3], ["big@example.com"] * 3)
+
+    @patch('builtins.print')
+    def test_auth_failure_disables_and_fails_over(self, mock_print):
+        """Test that an account failing auth is removed and the message retried elsewhere."""
+        bad = make_account("bad@example.com", daily_limit=1000)
+        good = make_account("good@example.com")
+        pool = SenderPool([bad, good])
+        error = smtplib.SMTPAuthenticationError(535, b"bad credentials")
+
+        with patch.object(bad.agent, 'deliver', side_effect=error), \
+                patch.object(good.agent, 'deliver') as good_deliver:
+            success, message, sender = pool.send_email("to@example.com", "Hi", "Body")
+
+        self.assertTrue(success)
+        self.assertEqual(sender, "good@example.com")
+        self.assertTrue(bad.disabled)
+        good_deliver.assert_called_once()
+        self.assertEqual(good.sent_today, 1)
+
+    @patch('builtins.print')
+    def test_transient_failure_cools_down(self, mock_print):
+        """Test that a 4xx response cools the account down."""
+        flaky = make_account("flaky@example.com", daily_limit=1000)
+        good = make_account("good@example.com")
+        pool = SenderPool([flaky, good], cooldown=60)
+        error = smtplib.SMTPSenderRefused(421, b"Try again later", "flaky@example.com")
+
+        with patch.object(flaky.agent, 'deliver', side_effect=error), \
+                patch.object(good.agent, 'deliver'):
+            success, _, sender = pool.send_email("to@example.com", "Hi", "Body")
+
+        self.assertTrue(success)
+        self.assertEqual(sender, "good@example.com")
+        self.assertFalse(flaky.disabled)
+        self.assertFalse(flaky.is_available(0))
+
+    @patch('builtins.print')
+    def test_permanent_recipient_error_does_not_fail_over(self, mock_print):
+        """Test that a refused recipient fails without trying other accounts."""
+        first = make_account("first@example.com", daily_limit=1000)
+        second = make_account("second@example.com")
+        pool = SenderPool([first, second])
+        error = smtplib.SMTPRecipientsRefused({"to@example.com": (550, b"No such user")})
+
+        with patch.object(first.agent, 'deliver', side_effect=error), \
+                patch.object(second.agent, 'deliver') as second_deliver:
+            success, message, _ = pool.send_email("to@example.com", "Hi", "Body")
+
+        self.assertFalse(success)
+        self.assertIn("Recipient refused", message)
+        second_deliver.assert_not_called()
+        self.assertTrue(first.is_available(0))
+
+    @patch('builtins.print')
+    def test_deferred_recipient_does_not_fail_over(self, mock_print):
+        """Test that a recipient deferred with 4xx fails without trying other accounts."""
+        first = make_account("first@example.com")
+        second = make_account("second@example.com")
+        pool = SenderPool([first, second])
+        error = smtplib.SMTPRecipientsRefused({"to@example.com": (451, b"Greylisted")})
+
+        with patch.object(first.agent, 'deliver', side_effect=error), \
+                patch.object(second.agent, 'deliver') as second_deliver:
+            success, message, sender = pool.send_email("to@example.com", "Hi", "Body")
+
+        self.assertFalse(success)
+        self.assertIn("Recipient refused", message)
+        self.assertEqual(sender, "first@example.com")
+        second_deliver.assert_not_called()
+        self.assertTrue(first.is_available(0))
+
+    @patch('builtins.print')
+    def test_deferred_recipient_is_retried_after_backoff(self, mock_print):
+        """Test that a greylisted recipient is parked and retried after a delay."""
+        account = make_account("only@example.com")
+        pool = SenderPool([account], retry_delay=0.2)
+        contacts = [{'email': "greylisted@example.com"}, {'email': "other@example.com"}]
+        deferral = smtplib.SMTPRecipientsRefused({"greylisted@example.com": (451, b"Greylisted")})
+        calls = []
+
+        def deliver(recipient, *args):
+            calls.append((recipient, time.monotonic()))
+            if len(calls) == 1:
+                raise deferral
+
+        with patch.object(account.agent, 'deliver', side_effect=deliver):
+            results = pool.send_bulk_outreach(contacts, "Hi", "Hello")
+
+        self.assertEqual(results['sent'], 2)
+        self.assertEqual(results['failed'], 0)
+        self.assertEqual([recipient for recipient, _ in calls],
+                         ["greylisted@example.com", "other@example.com", "greylisted@example.com"])
+        # Equal jitter: at least half the nominal delay
+        self.assertGreaterEqual(calls[2][1] - calls[0][1], 0.1)
+
+    @patch('builtins.print')
+    def test_deferred_recipient_fails_after_retry_attempts(self, mock_print):
+        """Test that a recipient deferred on every attempt is recorded as failed."""
+        account = make_account("only@example.com")
+        pool = SenderPool([account], retry_attempts=2, retry_delay=0.01)
+        deferral = smtplib.SMTPRecipientsRefused({"to@example.com": (450, b"Try later")})
+
+        with patch.object(account.agent, 'deliver', side_effect=deferral) as deliver:
+            results = pool.send_bulk_outreach([{'email': "to@example.com"}], "Hi", "Hello")
+
+        self.assertEqual(results['failed'], 1)
+        self.assertEqual(deliver.call_count, 2)
+
+    @patch('builtins.print')
+    def test_waits_for_cooling_account(self, mock_print):
+        """Test that a dropped connection on the only account delays, not fails, the campaign."""
+        account = make_account("only@example.com")
+        pool = SenderPool([account], cooldown=0.05)
+        contacts = [{'email': f"user{i}@example.com"} for i in range(10)]
+        outcomes = [smtplib.SMTPServerDisconnected("Connection unexpectedly closed")] + [None] * 10
+
+        with patch.object(account.agent, 'deliver', side_effect=outcomes) as deliver:
+            results = pool.send_bulk_outreach(contacts, "Hi", "Hello")
+
+        self.assertEqual(results['sent'], 10)
+        self.assertEqual(results['failed'], 0)
+        self.assertEqual(deliver.call_count, 11)
+
+    @patch('builtins.print')
+    def test_bulk_outreach_shards_contacts(self, mock_print):
+        """Test that a campaign is spread across accounts."""
+        accounts = [make_account("a@example.com"), make_account("b@example.com")]
+        pool = SenderPool(accounts)
+        contacts = [{'email': f"user{i}@example.com", 'name': f"User {i}"} for i in range(6)]
+        contacts.append({'email': 'invalid', 'name': 'Bad'})
+
+        with patch.object(accounts[0].agent, 'deliver'), patch.object(accounts[1].agent, 'deliver'):
+            results = pool.send_bulk_outreach(contacts, "Hi $name", "Hello $name")
+
+        self.assertEqual(results['sent'], 6)
+        self.assertEqual(results['skipped'], 1)
+        self.assertEqual(results['by_sender'], {'a@example.com': 3, 'b@example.com': 3})
+        self.assertEqual(len(pool.sent_log), 6)
+
+    @patch('builtins.print')
+    def test_bulk_outreach_quota_exhausted(self, mock_print):
+        """Test that contacts fail once every account is out of quota."""
+        account = make_account("a@example.com", daily_limit=2)
+        pool = SenderPool([account])
+        contacts = [{'email': f"user{i}@example.com"} for i in range(3)]
+
+        with patch.object(account.agent, 'deliver'):
+            results = pool.send_bulk_outreach(contacts, "Hi", "Hello")
+
+        self.assertEqual(results['sent'], 2)
+        self.assertEqual(results['failed'], 1)
+        self.assertIn("No sender account available", results['failed_emails'][0]['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+"""Test cases for smtp_pool module."""
+
+import smtplib
+import unittest
+from email.mime.text import MIMEText
+from unittest.mock import patch
+
+from benchmarks.smtp_sink import SMTPSink
+from src.agent import OutreachAgent
+from src.smtp_pool import SMTPConnectionPool
+
+
+def make_message(recipient: str) -> MIMEText:
+    msg = MIMEText("Hello")
+    msg['From'] = "sender@example.com"
+    msg['To'] = recipient
+    msg['Subject'] = "Test"
+    return msg
+
+
+class TestSMTPConnectionPool(unittest.TestCase):
+    """Test cases for SMTPConnectionPool against a local SMTP sink."""
+
+    def setUp(self):
+        """Start a local SMTP sink."""
+        self.sink = SMTPSink().start()
+        host, port = self.sink.address
+        self.pool = SMTPConnectionPool(host, port, "sender@example.com", "secret",
+                                       use_tls=False, size=2)
+
+    def tearDown(self):
+        """Close the pool and stop the sink."""
+        self.pool.close()
+        self.sink.stop()
+
+    def test_sessions_are_reused(self):
+        """Test that many messages share one login."""
+        for i in range(10):
+            self.pool.send_message(make_message(f"user{i}@example.com"))
+
+        self.assertEqual(self.sink.stats['messages'], 10)
+        self.assertEqual(self.sink.stats['logins'], 1)
+        self.assertEqual(self.pool.stats['connects'], 1)
+
+    def test_idle_session_is_health_checked(self):
+        """Test that idle sessions are probed with NOOP before reuse."""
+        self.pool.health_check_interval = 0
+        self.pool.send_message(make_message("a@example.com"))
+        self.pool.send_message(make_message("b@example.com"))
+
+        self.assertGreaterEqual(self.sink.stats['noops'], 1)
+        self.assertEqual(self.sink.stats['logins'], 1)
+
+    def test_dead_session_is_replaced(self):
+        """Test transparent reconnect when the server dropped the session."""
+        self.pool.send_message(make_message("a@example.com"))
+        self.pool._idle[-1].server.close()
+
+        self.pool.send_message(make_message("b@example.com"))
+
+        self.assertEqual(self.sink.stats['messages'], 2)
+        self.assertEqual(self.sink.stats['logins'], 2)
+
+    def test_sessions_recycled_after_message_cap(self):
+        """Test that sessions are reopened after max_messages_per_session."""
+        self.pool.max_messages_per_session = 3
+        for i in range(7):
+            self.pool.send_message(make_message(f"user{i}@example.com"))
+
+        self.assertEqual(self.sink.stats['logins'], 3)
+
+    def test_rejected_transaction_keeps_session(self):
+        """Test that a rejected message resets the session instead of dropping it."""
+        self.pool.sendmail("sender@example.com", ["a@example.com"], b"Subject: a\r\n\r\nHi")
+        session = self.pool._idle[-1]
+
+        with patch.object(session.server, 'sendmail',
+                          side_effect=smtplib.SMTPDataError(554, b"Rejected")):
+            with self.assertRaises(smtplib.SMTPDataError):
+                self.pool.sendmail("sender@example.com", ["b@example.com"], b"Hi")
+
+        self.assertIs(self.pool._idle[-1], session)
+        self.pool.sendmail("sender@example.com", ["c@example.com"], b"Subject: c\r\n\r\nHi")
+        self.assertEqual(self.sink.stats['messages'], 2)
+        self.assertEqual(self.sink.stats['logins'], 1)
+
+    def test_permanent_reply_resets_and_reuses_session(self):
+        """Test that a 5xx reply from the server is followed by RSET on the same connection."""
+        self.sink.error_rate, self.sink.error_code = 1.0, 550
+        with self.assertRaises(smtplib.SMTPRecipientsRefused):
+            self.pool.send_message(make_message("gone@example.com"))
+
+        self.sink.error_rate = 0.0
+        self.pool.send_message(make_message("b@example.com"))
+
+        self.assertGreaterEqual(self.sink.stats['rsets'], 1)
+        self.assertEqual(self.sink.stats['messages'], 1)
+        self.assertEqual(self.sink.stats['connections'], 1)
+        self.assertEqual(self.pool.stats['connects'], 1)
+        self.assertEqual(self.pool.stats['reconnects'], 0)
+
+    def test_size_limits_open_sessions(self):
+        """Test that acquire blocks once all sessions are checked out."""
+        first = self.pool.acquire()
+        second = self.pool.acquire()
+
+        with self.assertRaises(TimeoutError):
+            self.pool.acquire(timeout=0.05)
+
+        self.pool.release(first)
+        self.assertIs(self.pool.acquire(timeout=1), first)
+        self.pool.release(first)
+        self.pool.release(second)
+
+    def test_invalid_size(self):
+        """Test that a pool needs at least one session."""
+        with self.assertRaises(ValueError):
+            SMTPConnectionPool("localhost", 25, "u", "p", size=0)
+
+
+class TestAgentConnectionPool(unittest.TestCase):
+    """Test cases for pooled sending through OutreachAgent."""
+
+    def setUp(self):
+        """Start a local SMTP sink and an agent pointed at it."""
+        self.sink = SMTPSink().start()
+        host, port = self.sink.address
+        self.agent = OutreachAgent(
+            "sender@example.com",
+            "secret",
+            custom_smtp={'smtp_server': host, 'smtp_port': port, 'use_tls': False}
+        )
+
+    def tearDown(self):
+        """Stop the sink."""
+        self.sink.stop()
+
+    @patch('builtins.print')
+    def test_bulk_outreach_reuses_session(self, mock_print):
+        """Test that a bulk campaign logs in once."""
+        contacts = [{'email': f"user{i}@example.com", 'name': f"User {i}"} for i in range(5)]
+
+        results = self.agent.send_bulk_outreach(contacts, "Hi $name", "Hello $name", delay=0)
+
+        self.assertEqual(results['sent'], 5)
+        self.assertEqual(self.sink.stats['messages'], 5)
+        self.assertEqual(self.sink.stats['logins'], 1)
+        self.assertIsNone(self.agent._pool)
+
+    def test_nested_pools_are_shared(self):
+        """Test that nested connection_pool blocks reuse the outer pool."""
+        with self.agent.connection_pool() as outer:
+            with self.agent.connection_pool() as inner:
+                self.assertIs(outer, inner)
+            self.assertIs(self.agent._pool, outer)
+
+    def test_pool_auth_error_not_retried(self):
+        """Test that login failures inside the pool are not retried."""
+        error = smtplib.SMTPAuthenticationError(535, b"bad credentials")
+        with patch('src.smtp_pool.smtplib.SMTP.login', side_effect=error):
+            with patch('builtins.print'):
+                with self.agent.connection_pool():
+                    success, message = self.agent.send_email_with_retry(
+                        "user@example.com", "Subject", "Body")
+
+        self.assertFalse(success)
+        self.assertIn("Authentication failed", message)
+        self.assertEqual(self.sink.stats['messages'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
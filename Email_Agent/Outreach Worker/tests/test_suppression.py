@@ -0,0 +1,285 @@
+"""Test cases for suppression module."""
+
+import hashlib
+import json
+import os
+import shutil
+import socket
+import socketserver
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from src.agent import OutreachAgent
+from src.suppression import (BLOOM_HEADER, BloomSuppression, ServiceSuppression, SuppressionList,
+                             _BatchFilter, hash_email)
+
+
+def write_bloom(path, emails, bits=4096, hashes=4, epoch=1):
+    """Write a Bloom filter file in the Compliance Agent's published format."""
+    array = bytearray((bits + 7) // 8)
+    for email in emails:
+        digest = hashlib.sha256(email.strip().lower().encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[0:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        for i in range(hashes):
+            position = (h1 + i * h2) % bits
+            array[position >> 3] |= 1 << (position & 7)
+    with open(path, 'wb') as f:
+        f.write(BLOOM_HEADER.pack(b"SUPBLOOM", 1, hashes, bits, len(emails), epoch, 0.01))
+        f.write(array)
+
+
+class TestSuppressionList(unittest.TestCase):
+    """Test cases for SuppressionList class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'suppression.json')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump([
+                {'email': 'Unsub@Example.com', 'reason': 'unsubscribed'},
+                {'email_hash': hash_email('deleted@example.com'), 'reason': 'dsar_deletion'},
+            ], f)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_lookup_is_normalized(self):
+        """Test plain and hashed entries in both storage modes."""
+        for hashed in (False, True):
+            with self.subTest(hashed=hashed):
+                suppression = SuppressionList.from_json(self.path, hashed=hashed)
+
+                self.assertIn(" unsub@example.com", suppression)
+                self.assertIn("DELETED@example.com", suppression)
+                self.assertNotIn("ok@example.com", suppression)
+                self.assertEqual(len(suppression), 2)
+
+    def test_journal_records_are_included(self):
+        """Test that records appended to the Compliance journal are read too."""
+        with open(self.path, 'rb') as f:
+            base = hashlib.sha256(f.read()).hexdigest()
+        with open(os.path.join(self.temp_dir, 'suppression.journal'), 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'journal': 1, 'base': base}) + '\n')
+            f.write(json.dumps({'email': 'late@example.com', 'reason': 'unsubscribed'}) + '\n')
+            f.write('{"email": "torn')
+
+        suppression = SuppressionList.from_json(self.path)
+
+        self.assertIn("late@example.com", suppression)
+        self.assertEqual(len(suppression), 3)
+
+    def test_stale_journal_is_ignored(self):
+        """Test that a journal for an older snapshot is not replayed."""
+        with open(os.path.join(self.temp_dir, 'suppression.journal'), 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'journal': 1, 'base': '0' * 64}) + '\n')
+            f.write(json.dumps({'email': 'old@example.com'}) + '\n')
+
+        self.assertNotIn("old@example.com", SuppressionList.from_json(self.path))
+
+    def test_filter_contacts(self):
+        """Test that suppressed contacts are dropped in order, in batches."""
+        suppression = SuppressionList.from_json(self.path)
+        contacts = [{'email': f"user{i}@example.com"} for i in range(5)]
+        contacts.insert(2, {'email': 'unsub@example.com'})
+        dropped = []
+
+        kept = list(suppression.filter_contacts(contacts, on_suppressed=dropped.append, batch_size=2))
+
+        self.assertEqual([c['email'] for c in kept], [f"user{i}@example.com" for i in range(5)])
+        self.assertEqual(dropped, [{'email': 'unsub@example.com'}])
+
+    @patch('builtins.print')
+    def test_bulk_outreach_skips_suppressed(self, mock_print):
+        """Test that send_bulk_outreach never delivers to suppressed addresses."""
+        agent = OutreachAgent("me@example.com", "secret", "gmail")
+        contacts = [{'email': 'a@example.com'}, {'email': 'unsub@example.com'},
+                    {'email': 'deleted@example.com'}]
+
+        with patch.object(agent, 'connection_pool'), \
+                patch.object(agent, '_deliver') as deliver:
+            results = agent.send_bulk_outreach(contacts, "Hi", "Hello", delay=0,
+                                               suppression=SuppressionList.from_json(self.path))
+
+        self.assertEqual(results['sent'], 1)
+        self.assertEqual(results['skipped'], 2)
+        deliver.assert_called_once()
+
+
+
+class TestBloomSuppression(unittest.TestCase):
+    """Test cases for BloomSuppression class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.bloom_path = os.path.join(self.temp_dir, 'suppression.bloom')
+        self.exact_path = os.path.join(self.temp_dir, 'suppression.json')
+        self.suppressed = [f"blocked{i}@example.com" for i in range(50)]
+        with open(self.exact_path, 'w', encoding='utf-8') as f:
+            json.dump([{'email': email, 'reason': 'unsubscribed'} for email in self.suppressed], f)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_negatives_skip_the_exact_list(self):
+        """Test that addresses cleared by the filter never load the exact list."""
+        write_bloom(self.bloom_path, self.suppressed)
+        checker = BloomSuppression(self.bloom_path, exact_path=self.exact_path)
+        clean = [f"user{i}@example.org" for i in range(200)]
+        cleared = [email for email in clean if not checker.might_contain(email)]
+
+        self.assertEqual(checker.filter_eligible(cleared), cleared)
+        self.assertIsNone(checker._exact)
+        self.assertIn("Blocked3@Example.com", checker)
+        self.assertIsNotNone(checker._exact)
+        checker.close()
+
+    def test_false_positives_are_confirmed_away(self):
+        """Test that a saturated filter still gives exact answers."""
+        write_bloom(self.bloom_path, self.suppressed, bits=8, hashes=1)
+        checker = BloomSuppression(self.bloom_path, exact_path=self.exact_path)
+        emails = ["a@example.com", "blocked1@example.com", "b@example.com"]
+
+        self.assertEqual(checker.filter_eligible(emails), ["a@example.com", "b@example.com"])
+        self.assertEqual(checker.stats, {'checked': 3, 'bloom_hits': 3, 'suppressed': 1})
+        checker.close()
+
+    def test_custom_confirm_and_refresh(self):
+        """Test that a newer published epoch is picked up by refresh."""
+        write_bloom(self.bloom_path, [], epoch=1)
+        confirmed = []
+        checker = BloomSuppression(self.bloom_path,
+                                   confirm=lambda emails: confirmed.extend(emails) or set(emails))
+        self.assertNotIn("new@example.com", checker)
+        self.assertFalse(checker.refresh())
+
+        write_bloom(self.bloom_path, ["new@example.com"], epoch=2)
+        self.assertTrue(checker.refresh())
+
+        self.assertIn("new@example.com", checker)
+        self.assertEqual(confirmed, ["new@example.com"])
+        checker.close()
+
+    def test_rejects_other_files(self):
+        """Test that a file that is not a Bloom filter is refused."""
+        with open(self.bloom_path, 'wb') as f:
+            f.write(b"{}" * 64)
+
+        with self.assertRaises(ValueError):
+            BloomSuppression(self.bloom_path, exact_path=self.exact_path)
+        with self.assertRaises(ValueError):
+            BloomSuppression(self.bloom_path)
+
+
+class FakeEligibilityService(socketserver.ThreadingTCPServer):
+    """Minimal stand-in for the Compliance Agent's eligibility service."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, suppressed):
+        self.suppressed = set(suppressed)
+        self.requests = []
+
+        service = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    request = json.loads(line)
+                    service.requests.append(request)
+                    response = {'id': request['id'],
+                                'suppressed': [e for e in request['emails'] if e in service.suppressed]}
+                    self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+
+        super().__init__(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+
+class FakeClock:
+    """Settable monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestServiceSuppression(unittest.TestCase):
+    """Test cases for ServiceSuppression class."""
+
+    def setUp(self):
+        """Start a fake eligibility service."""
+        self.service = FakeEligibilityService([f"blocked{i}@example.com" for i in range(10)])
+        host, port = self.service.server_address
+        self.clock = FakeClock()
+        self.checker = ServiceSuppression(f"{host}:{port}", ttl=5.0, batch_size=4, clock=self.clock)
+
+    def tearDown(self):
+        """Stop the service."""
+        self.checker.close()
+        self.service.shutdown()
+        self.service.server_close()
+
+    def test_filter_eligible_pipelines_batches(self):
+        """Test that misses are sent in batch_size requests and answers kept in order."""
+        emails = ["Blocked1@Example.com", "ok1@example.com", "blocked2@example.com",
+                  "ok2@example.com", "ok3@example.com", "blocked9@example.com"]
+        self.assertEqual(self.checker.filter_eligible(emails),
+                         ["ok1@example.com", "ok2@example.com", "ok3@example.com"])
+        self.assertEqual(len(self.service.requests), 2)
+        self.assertEqual(self.checker.stats['suppressed'], 3)
+
+    def test_answers_cached_until_ttl(self):
+        """Test that cached answers are reused until they expire."""
+        self.assertIn("blocked1@example.com", self.checker)
+        self.assertNotIn("late@example.com", self.checker)
+        self.service.suppressed.add("late@example.com")
+
+        self.assertNotIn("late@example.com", self.checker)
+        self.assertEqual(len(self.service.requests), 2)
+        self.assertEqual(self.checker.stats['cache_hits'], 1)
+
+        self.clock.now = 6.0
+        self.assertIn("LATE@example.com", self.checker)
+        self.assertEqual(len(self.service.requests), 3)
+
+    def test_cache_is_bounded(self):
+        """Test that the oldest answers are dropped past max_cached."""
+        self.checker.max_cached = 5
+        self.checker.filter_eligible(f"user{i}@example.com" for i in range(12))
+        self.assertEqual(list(self.checker._cache), [f"user{i}@example.com" for i in range(7, 12)])
+
+    def test_reconnects_after_service_restart(self):
+        """Test that a dropped connection is reopened once instead of failing the check."""
+        self.checker.ttl = 0
+        self.assertIn("blocked1@example.com", self.checker)
+        self.checker._sock.shutdown(socket.SHUT_RDWR)
+
+        self.assertIn("blocked2@example.com", self.checker)
+        self.assertEqual(len(self.service.requests), 2)
+
+    def test_base_class_is_abstract(self):
+        """Test that a filter must implement filter_eligible."""
+        with self.assertRaises(TypeError):
+            _BatchFilter()
+
+    @patch('builtins.print')
+    def test_filter_contacts(self, mock_print):
+        """Test that suppressed contacts are dropped from a contact stream."""
+        contacts = [{'email': 'blocked3@example.com'}, {'email': 'fine@example.com'}]
+        dropped = []
+        kept = list(self.checker.filter_contacts(contacts, on_suppressed=dropped.append))
+        self.assertEqual(kept, [{'email': 'fine@example.com'}])
+        self.assertEqual(dropped, [{'email': 'blocked3@example.com'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Test cases for template_cache module."""
+
+import os
+import tempfile
+import unittest
+from string import Template
+
+from src.template_cache import (
+    CompiledTemplate,
+    compile_template,
+    load_template_file,
+    clear_template_cache
+)
+
+
+class TestCompiledTemplate(unittest.TestCase):
+    """Test cases for CompiledTemplate class."""
+
+    def test_matches_safe_substitute(self):
+        """Test that rendering matches string.Template.safe_substitute."""
+        mapping = {'name': 'John', 'company': 'Tech Corp', 'empty': '', 'none': None, 'n': 3}
+        sources = [
+            "Hello $name, welcome to $company!",
+            "Hello ${name}s at ${company}",
+            "Price: $$100 for $name",
+            "Missing $unknown and ${also_unknown}",
+            "Stray $ sign and $1 digits and ${bad",
+            "$name$company$empty$none$n",
+            "",
+            "No placeholders at all",
+            "$",
+            "ends with $name",
+        ]
+        for source in sources:
+            with self.subTest(source=source):
+                self.assertEqual(CompiledTemplate(source).render(mapping),
+                                 Template(source).safe_substitute(mapping))
+
+    def test_segments(self):
+        """Test that templates are pre-split into literals and placeholders."""
+        compiled = CompiledTemplate("Hi $name, $$5 from ${company}.")
+
+        self.assertEqual(compiled.literals, ["Hi ", ", $5 from ", "."])
+        self.assertEqual(compiled.placeholders, [('name', '$name'), ('company', '${company}')])
+
+    def test_compile_template_is_cached(self):
+        """Test that the same source is compiled once."""
+        clear_template_cache()
+        self.assertIs(compile_template("Hi $name"), compile_template("Hi $name"))
+
+
+class TestLoadTemplateFile(unittest.TestCase):
+    """Test cases for the file template cache."""
+
+    def setUp(self):
+        """Create a template file."""
+        clear_template_cache()
+        handle, self.path = tempfile.mkstemp(suffix='.html')
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            f.write("<p>Hello $name</p>")
+
+    def tearDown(self):
+        """Remove the template file."""
+        os.unlink(self.path)
+
+    def test_file_parsed_once(self):
+        """Test that unchanged files are served from the cache."""
+        first = load_template_file(self.path)
+        second = load_template_file(self.path)
+
+        self.assertIs(first, second)
+        self.assertEqual(first.render({'name': 'Ann'}), "<p>Hello Ann</p>")
+
+    def test_reloaded_when_file_changes(self):
+        """Test that a modified file is re-read."""
+        first = load_template_file(self.path)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("<p>Goodbye $name</p>")
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        second = load_template_file(self.path)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.render({'name': 'Ann'}), "<p>Goodbye Ann</p>")
+
+    def test_missing_file(self):
+        """Test that a missing file raises FileNotFoundError."""
+        with self.assertRaises(FileNotFoundError):
+            load_template_file(self.path + '.missing')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,8 +6,12 @@ import os
 import json
 import csv
 from pathlib import Path
+from unittest.mock import patch
 from src.utils import (
     load_contacts_from_csv,
+    iter_contacts_from_csv,
+    limit_contacts,
+    format_progress,
     save_contacts_to_csv,
     load_json,
     save_json,
@@ -47,6 +51,71 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(contacts[0]['name'], 'John')
         self.assertEqual(contacts[1]['email'], 'jane@test.com')
     
+    def write_contacts(self, rows):
+        csv_file = os.path.join(self.temp_dir, 'stream.csv')
+        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=['name', 'email'])
+            writer.writeheader()
+            writer.writerows(rows)
+        return csv_file
+    
+    def test_iter_contacts_is_lazy(self):
+        """Test that contacts are yielded before the file is fully read."""
+        csv_file = self.write_contacts(
+            [{'name': f'User {i}', 'email': f'user{i}@test.com'} for i in range(1000)]
+        )
+        stats = {}
+        
+        contacts = iter_contacts_from_csv(csv_file, stats=stats)
+        first = next(contacts)
+        
+        self.assertEqual(first['email'], 'user0@test.com')
+        self.assertLess(stats['rows'], 1000)
+        contacts.close()
+    
+    def test_iter_contacts_validate_and_dedupe(self):
+        """Test that invalid and repeated addresses are dropped and counted."""
+        csv_file = self.write_contacts([
+            {'name': 'John', 'email': 'john@test.com'},
+            {'name': 'Bad', 'email': 'not-an-email'},
+            {'name': 'John again', 'email': ' JOHN@test.com'},
+            {'name': 'Jane', 'email': 'jane@test.com'},
+        ])
+        stats = {}
+        
+        contacts = list(iter_contacts_from_csv(csv_file, validate=True, dedupe=True, stats=stats))
+        
+        self.assertEqual([c['name'] for c in contacts], ['John', 'Jane'])
+        self.assertEqual(stats, {'rows': 4, 'invalid': 1, 'duplicates': 1, 'yielded': 2})
+    
+    def test_iter_contacts_max_emails(self):
+        """Test that reading stops once max_emails contacts were yielded."""
+        csv_file = self.write_contacts(
+            [{'name': f'User {i}', 'email': f'user{i}@test.com'} for i in range(100)]
+        )
+        stats = {}
+        
+        contacts = list(iter_contacts_from_csv(csv_file, max_emails=5, stats=stats))
+        
+        self.assertEqual(len(contacts), 5)
+        self.assertEqual(stats['rows'], 5)
+    
+    def test_limit_contacts(self):
+        """Test limiting lists and streams without copying."""
+        contacts = [{'email': f'user{i}@test.com'} for i in range(10)]
+        
+        limited, total = limit_contacts(contacts, 3)
+        self.assertEqual(total, 3)
+        self.assertEqual(len(list(limited)), 3)
+        
+        limited, total = limit_contacts(iter(contacts), 3)
+        self.assertIsNone(total)
+        self.assertEqual(len(list(limited)), 3)
+        
+        self.assertEqual(limit_contacts(contacts)[1], 10)
+        self.assertEqual(format_progress(2, 10), '3/10')
+        self.assertEqual(format_progress(2, None), '3')
+    
     def test_save_contacts_to_csv(self):
         """Test saving contacts to CSV file."""
         csv_file = os.path.join(self.temp_dir, 'output.csv')
@@ -3,6 +3,20 @@
 import unittest
 from src.validators import EmailValidator, ContactValidator
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+BULK_EMAILS = ["  John@Example.COM ", "invalid-email", None, "bob@test.com", "", 123]
+BULK_MASK = [True, False, False, True, False, False]
+BULK_NORMALIZED = ["john@example.com", "invalid-email", "", "bob@test.com", "", ""]
+
 
 class TestEmailValidator(unittest.TestCase):
     """Test cases for EmailValidator class."""
@@ -62,6 +76,61 @@ class TestEmailValidator(unittest.TestCase):
         self.assertEqual(invalid[0]['email'], "invalid-email")
         self.assertIn('validation_error', invalid[0])
 
+    
+    def test_validate_bulk_list(self):
+        """Test bulk validation of a list of addresses."""
+        mask, normalized = EmailValidator.validate_bulk(BULK_EMAILS)
+        
+        self.assertEqual(mask, BULK_MASK)
+        self.assertEqual(normalized, BULK_NORMALIZED)
+    
+    def test_validate_bulk_matches_validate_email(self):
+        """Test that the bulk mask agrees with single-address validation."""
+        emails = ["test@example.com", "user@domain", "a.b+c@sub.example.org",
+                  "user @example.com", "@example.com", "x@y.co", "\tme@example.com\n"]
+        
+        mask, _ = EmailValidator.validate_bulk(iter(emails))
+        
+        self.assertEqual(mask, [EmailValidator.validate_email(e) for e in emails])
+    
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_validate_bulk_numpy(self):
+        """Test bulk validation of a NumPy array."""
+        mask, normalized = EmailValidator.validate_bulk(np.array(BULK_EMAILS, dtype=object))
+        
+        self.assertEqual(mask.dtype, bool)
+        self.assertEqual(mask.tolist(), BULK_MASK)
+        self.assertEqual(normalized.tolist(), BULK_NORMALIZED)
+    
+    @unittest.skipIf(pd is None, "pandas not installed")
+    def test_validate_bulk_pandas(self):
+        """Test bulk validation of a pandas Series keeps its index."""
+        series = pd.Series(BULK_EMAILS, index=range(10, 16))
+        
+        mask, normalized = EmailValidator.validate_bulk(series)
+        
+        self.assertEqual(mask.tolist(), BULK_MASK)
+        self.assertEqual(normalized.tolist(), BULK_NORMALIZED)
+        self.assertEqual(list(mask.index), list(range(10, 16)))
+    
+    def test_filter_valid(self):
+        """Test streaming filter with normalization and invalid callback."""
+        contacts = [
+            {"name": "John", "email": " John@Example.com"},
+            {"name": "Jane", "email": "invalid-email"},
+            {"name": "Bob", "email": "bob@test.com"},
+            {"name": "Nobody"}
+        ]
+        invalid = []
+        
+        valid = list(EmailValidator.filter_valid(iter(contacts), on_invalid=invalid.append,
+                                                 batch_size=2))
+        
+        self.assertEqual([c['email'] for c in valid], ["john@example.com", "bob@test.com"])
+        self.assertEqual(contacts[0]['email'], " John@Example.com")
+        self.assertIs(valid[1], contacts[2])
+        self.assertEqual([c['name'] for c in invalid], ["Jane", "Nobody"])
+
 
 class TestContactValidator(unittest.TestCase):
     """Test cases for ContactValidator class."""